@@ -0,0 +1,135 @@
+import io
+import logging
+import wave
+from collections import OrderedDict
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+# What the browser player gets (the format the ffmpeg step used to produce)
+PLAYBACK_RATE = 44100
+PLAYBACK_CHANNELS = 2
+
+# Zero crossings of the resampling filter on each side (its length in input samples is about 2x this)
+HALF_TAPS = 10
+
+
+@lru_cache(maxsize=16)
+def polyphase_filter(up: int, down: int, half_taps: int = HALF_TAPS, beta: float = 5.0) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass for resampling by up/down, split into its up phases.
+
+    Row p holds taps p, p + up, p + 2*up, ... of the filter, i.e. the taps
+    that meet real input samples for output positions of phase p. The gain
+    is up, so zero stuffing doesn't lower the level.
+    """
+    n_taps = 2 * half_taps * max(up, down) + 1
+    cutoff = 1.0 / max(up, down)
+    t = np.arange(n_taps) - (n_taps - 1) / 2
+    taps = cutoff * np.sinc(cutoff * t) * np.kaiser(n_taps, beta) * up
+    per_phase = -(-n_taps // up)
+    taps = np.concatenate([taps, np.zeros(per_phase * up - n_taps)])
+    return taps.reshape(per_phase, up).T.copy()
+
+
+def resample_poly(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Resample a mono signal by to_rate/from_rate with a polyphase FIR (float64 out).
+
+    Equivalent to zero-stuffing by up, low-pass filtering and keeping every
+    down-th sample, but only the taps that hit real samples are computed.
+    Outputs n, n + up, n + 2*up, ... share one filter phase and read input
+    windows down samples apart, so each of the up output classes is a single
+    strided matrix-vector product. The filter's group delay is compensated,
+    so output n is input time n / to_rate.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    g = gcd(from_rate, to_rate)
+    up, down = to_rate // g, from_rate // g
+    if up == down:
+        return samples.copy()
+
+    phases = polyphase_filter(up, down)
+    per_phase = phases.shape[1]
+    # Filter centre, in samples at up * from_rate
+    delay = HALF_TAPS * max(up, down)
+    padded = np.concatenate([np.zeros(per_phase), samples, np.zeros(per_phase + down)])
+    # Row i is padded[i:i + per_phase]; output taps run backwards over it
+    windows = sliding_window_view(padded, per_phase)
+    n_out = -(-len(samples) * up // down)
+    out = np.empty(n_out)
+    for first in range(min(up, n_out)):
+        position = first * down + delay
+        start = position // up + 1
+        count = len(range(first, n_out, up))
+        out[first::up] = windows[start:start + count * down:down] @ phases[position % up, ::-1]
+    return out
+
+
+def split_wav(audio: bytes) -> Tuple[bytes, Optional[int], Optional[int]]:
+    """PCM frames, rate and channels of RIFF audio; raw PCM comes back as is with None for both"""
+    if audio[:4] != b'RIFF':
+        return audio, None, None
+    with wave.open(io.BytesIO(audio), 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Expected 16-bit PCM, got {wav.getsampwidth() * 8}-bit")
+        return wav.readframes(wav.getnframes()), wav.getframerate(), wav.getnchannels()
+
+
+def wav_bytes(pcm: bytes, rate: int, channels: int) -> bytes:
+    """16-bit PCM wrapped in a WAV header, in memory"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def convert_pcm16(pcm: bytes, from_rate: int, to_rate: int, channels: int = 1, from_channels: int = 1) -> bytes:
+    """Mono (or downmixed) 16-bit PCM at from_rate → interleaved 16-bit PCM at to_rate with channels"""
+    samples = np.frombuffer(pcm, dtype='<i2')
+    if from_channels > 1:
+        samples = samples[:len(samples) // from_channels * from_channels].reshape(-1, from_channels).mean(axis=1)
+    if from_rate != to_rate:
+        samples = np.clip(np.rint(resample_poly(samples, from_rate, to_rate)), -32768, 32767)
+    samples = samples.astype('<i2', copy=False)
+    if channels > 1:
+        samples = np.repeat(samples, channels)
+    return samples.tobytes()
+
+
+def playback_wav(audio: bytes, rate: int, rate_out: int = PLAYBACK_RATE, channels: int = PLAYBACK_CHANNELS) -> bytes:
+    """Browser WAV (rate_out, channels) of synthesized audio: raw PCM at rate, or a RIFF file"""
+    pcm, wav_rate, wav_channels = split_wav(audio)
+    pcm = convert_pcm16(pcm, wav_rate or rate, rate_out, channels, wav_channels or 1)
+    return wav_bytes(pcm, rate_out, channels)
+
+
+class ClipStore:
+    """The last max_entries playback WAVs in memory, served by id instead of /tmp files"""
+
+    def __init__(self, max_entries: int = 200):
+        self.max_entries = max_entries
+        self.clips: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def put(self, clip_id: str, wav: bytes):
+        self.clips[clip_id] = wav
+        self.clips.move_to_end(clip_id)
+        while len(self.clips) > self.max_entries:
+            self.clips.popitem(last=False)
+
+    def get(self, filename: str) -> Optional[bytes]:
+        """Clip by id or by its file name (id + .wav) as used in the player URLs"""
+        clip_id = filename[:-4] if filename.endswith('.wav') else filename
+        return self.clips.get(clip_id)
+
+    def get_metrics(self) -> dict:
+        return {
+            "clips": len(self.clips),
+            "bytes": sum(len(clip) for clip in self.clips.values()),
+        }
@@ -0,0 +1,171 @@
+import logging
+import wave
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TICKS_PER_MS = 10000  # Azure offsets are in 100ns ticks
+
+
+def frame_energies_db(audio_path: Union[str, Path], frame_ms: int = 100):
+    """RMS level (dBFS) of consecutive frames of a 16-bit WAV, read block by block; returns (levels, duration_ms)"""
+    with wave.open(str(audio_path), 'rb') as wav:
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        frame_samples = rate * frame_ms // 1000
+        duration_ms = wav.getnframes() * 1000 / rate
+        levels = []
+        while True:
+            # One minute of audio per read keeps memory flat for long files
+            data = wav.readframes(frame_samples * 600)
+            if not data:
+                break
+            samples = np.frombuffer(data, dtype=np.int16)
+            if channels > 1:
+                samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+            frames = len(samples) // frame_samples
+            if frames == 0:
+                break
+            blocks = samples[:frames * frame_samples].astype(np.float32).reshape(frames, frame_samples) / 32768.0
+            rms = np.sqrt(np.mean(blocks * blocks, axis=1))
+            levels.append(20 * np.log10(np.maximum(rms, 1e-6)))
+    return (np.concatenate(levels) if levels else np.zeros(0)), duration_ms
+
+
+def plan_chunks(
+    levels_db: np.ndarray,
+    frame_ms: int,
+    duration_ms: float,
+    chunk_ms: float,
+    overlap_ms: float,
+    search_ms: float = 30000,
+    silence_ms: int = 500
+) -> List[dict]:
+    """Split a recording into chunks of about chunk_ms, cut at the quietest point near each target.
+
+    A cut lands in the middle of the quietest silence_ms stretch within
+    search_ms of the target. Chunk i owns [cut_start_ms, cut_end_ms); its
+    audio (start_ms..end_ms) reaches overlap_ms into both neighbours, so
+    speech around a cut is heard by both transcribers.
+    """
+    cuts = [0.0]
+    window = max(1, silence_ms // frame_ms)
+    smoothed = np.convolve(levels_db, np.ones(window) / window, mode='same') if len(levels_db) else levels_db
+    while duration_ms - cuts[-1] > chunk_ms * 1.5:
+        target = cuts[-1] + chunk_ms
+        low = max(cuts[-1] + chunk_ms / 2, target - search_ms)
+        high = min(duration_ms - chunk_ms / 2, target + search_ms)
+        first, last = int(low // frame_ms), int(high // frame_ms)
+        if last > first and last <= len(smoothed):
+            cut = (first + int(np.argmin(smoothed[first:last]))) * frame_ms + frame_ms / 2
+        else:
+            cut = target
+        cuts.append(cut)
+    cuts.append(duration_ms)
+
+    return [
+        {
+            "index": i,
+            "cut_start_ms": cut_start,
+            "cut_end_ms": cut_end,
+            "start_ms": max(0.0, cut_start - overlap_ms),
+            "end_ms": min(duration_ms, cut_end + overlap_ms),
+        }
+        for i, (cut_start, cut_end) in enumerate(zip(cuts, cuts[1:]))
+    ]
+
+
+def reconcile_speakers(chunks: List[dict], chunk_results: List[List[dict]]) -> List[Dict[str, str]]:
+    """Rename each chunk's speaker ids to those of the chunks before it, in place.
+
+    Diarization numbers speakers per session, so "Guest-1" of one chunk may be
+    "Guest-2" of the next. Both chunks hear the overlap around their cut: a
+    local speaker becomes the global one it overlaps longest there. Speakers
+    with no overlap evidence get new global ids. Returns each chunk's mapping.
+    """
+    known = {segment['speaker'] for segment in chunk_results[0]} if chunk_results else set()
+    mappings = [{speaker: speaker for speaker in known}]
+    for i in range(1, len(chunks)):
+        window_start = chunks[i]['start_ms']
+        window_end = chunks[i - 1]['end_ms']
+        overlap = defaultdict(float)
+        for current in chunk_results[i]:
+            for previous in chunk_results[i - 1]:
+                start = max(current['start_ms'], previous['start_ms'], window_start)
+                end = min(current['end_ms'], previous['end_ms'], window_end)
+                if end > start:
+                    overlap[(current['speaker'], previous['speaker'])] += end - start
+
+        # Greedy one-to-one matching, longest shared speech first
+        mapping = {}
+        for (local, global_id), _ in sorted(overlap.items(), key=lambda item: -item[1]):
+            if local not in mapping and global_id not in mapping.values():
+                mapping[local] = global_id
+        for segment in chunk_results[i]:
+            if segment['speaker'] not in mapping:
+                mapping[segment['speaker']] = new_speaker_id(known)
+            known.add(mapping[segment['speaker']])
+            segment['speaker'] = mapping[segment['speaker']]
+        mappings.append(mapping)
+    return mappings
+
+
+def new_speaker_id(taken: set) -> str:
+    n = len(taken) + 1
+    while f"Guest-{n}" in taken:
+        n += 1
+    return f"Guest-{n}"
+
+
+def word_start_ms(word: dict) -> float:
+    return word.get('Offset', 0) / TICKS_PER_MS
+
+
+def word_end_ms(word: dict) -> float:
+    return (word.get('Offset', 0) + word.get('Duration', 0)) / TICKS_PER_MS
+
+
+def trim_words_before(segment: dict, until_ms: float, format_time) -> bool:
+    """Drop the words of segment that were already recognized before until_ms; False if nothing is left"""
+    words = segment.get('words') or []
+    if not words:
+        # No word timings: keep the segment only if most of it is new
+        return (segment['start_ms'] + segment['end_ms']) / 2 >= until_ms
+    kept = [word for word in words if (word_start_ms(word) + word_end_ms(word)) / 2 >= until_ms]
+    if not kept:
+        return False
+    if len(kept) < len(words):
+        # Display text has no word timings: rebuild it from the words kept
+        segment['text'] = " ".join(word.get('Word', '') for word in kept)
+        segment['words'] = kept
+        segment['start_ms'] = word_start_ms(kept[0])
+        segment['duration_ms'] = segment['end_ms'] - segment['start_ms']
+        segment['start_time'] = format_time(segment['start_ms'] * TICKS_PER_MS)
+    return True
+
+
+def stitch_chunks(chunks: List[dict], chunk_results: List[List[dict]], format_time) -> List[dict]:
+    """One transcript from per-chunk results whose times are already file-global.
+
+    A chunk contributes the segments that end after its cut and are centred
+    before the next one, so speech across a cut is taken from both sides;
+    words the previous chunks already produced (by word timestamps) are then
+    dropped from the later chunk's segments.
+    """
+    stitched = []
+    previous_end_ms = 0.0
+    for chunk, results in zip(chunks, chunk_results):
+        chunk_end_ms = previous_end_ms
+        for segment in sorted(results, key=lambda segment: segment['start_ms']):
+            if segment['end_ms'] <= chunk['cut_start_ms'] or (segment['start_ms'] + segment['end_ms']) / 2 >= chunk['cut_end_ms']:
+                continue
+            if segment['start_ms'] < previous_end_ms and not trim_words_before(segment, previous_end_ms, format_time):
+                continue
+            stitched.append(segment)
+            chunk_end_ms = max(chunk_end_ms, segment['end_ms'])
+        previous_end_ms = chunk_end_ms
+    return stitched
@@ -0,0 +1,109 @@
+import logging
+import re
+from collections import deque
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_CYRILLIC = re.compile(r"[а-я]")
+
+# Common Russian inflection endings, longest first. Stripping them is a crude
+# stand-in for lemmatization: "телеграме", "телеграма" and "телеграм" share a stem.
+_ENDINGS = (
+    "ами", "ями", "ого", "его", "ому", "ему", "ыми", "ими",
+    "ах", "ях", "ов", "ев", "ом", "ем", "ой", "ей", "ую", "юю", "ая", "яя", "ые", "ие", "ый", "ий",
+    "а", "я", "ы", "и", "у", "ю", "е", "о",
+)
+_MIN_STEM = 3
+
+
+def stem(word: str) -> str:
+    """Normalized, roughly uninflected form of a word"""
+    word = word.casefold().replace("ё", "е")
+    if _CYRILLIC.search(word):
+        for ending in _ENDINGS:
+            if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+                return word[:-len(ending)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Word stems of a text; hyphens and punctuation separate words"""
+    return [stem(word) for word in _WORD.findall(text)]
+
+
+class GlossaryMatcher:
+    """Finds which glossary terms occur in a text.
+
+    All terms and their alternatives are compiled once into an Aho-Corasick
+    automaton over word stems, so a lookup is a single pass over the text no
+    matter how large the glossary grows. Only whole words match: "ай" finds
+    "эй ай" but not "майский".
+    """
+
+    def __init__(self, glossary: Dict[str, dict]):
+        self.terms: Dict[str, dict] = {}
+        # Node 0 is the root; goto[node] maps a stem to the next node
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[str]] = [[]]
+        self.patterns = 0
+
+        for term, data in glossary.items():
+            # Skip comment entries
+            if term.startswith('_comment') or not isinstance(data, dict):
+                continue
+            self.terms[term] = data
+            for variant in [term, data.get('en', '')] + data.get('alternatives', []):
+                words = tokenize(variant)
+                if words:
+                    self.add_pattern(words, term)
+
+        self.build_failure_links()
+        logger.info(f"📚 Glossary matcher: {len(self.terms)} terms, {self.patterns} patterns")
+
+    def add_pattern(self, words: List[str], term: str):
+        node = 0
+        for word in words:
+            next_node = self.goto[node].get(word)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][word] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+        if term not in self.outputs[node]:
+            self.outputs[node].append(term)
+            self.patterns += 1
+
+    def build_failure_links(self):
+        """Breadth-first pass linking every node to its longest proper suffix in the trie"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                self.outputs[child] = self.outputs[child] + [
+                    term for term in self.outputs[self.fail[child]] if term not in self.outputs[child]
+                ]
+
+    def find(self, text: str) -> List[str]:
+        """Glossary terms occurring in text, in order of first occurrence"""
+        found = {}
+        node = 0
+        for word in tokenize(text):
+            while node and word not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(word, 0)
+            for term in self.outputs[node]:
+                found.setdefault(term, None)
+        return list(found)
+
+    def __len__(self):
+        return len(self.terms)
@@ -0,0 +1,134 @@
+import logging
+import os
+import subprocess
+import threading
+import wave
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+
+def probe_duration_ms(path: Union[str, Path]) -> Optional[float]:
+    """Duration of a media file: from the header for WAV, from ffprobe otherwise (None if unknown)"""
+    if Path(path).suffix.lower() == '.wav':
+        with wave.open(str(path), 'rb') as wav:
+            return wav.getnframes() * 1000 / wav.getframerate()
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', str(path)],
+            capture_output=True, text=True, check=True
+        )
+        return float(result.stdout.strip()) * 1000
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        logger.warning(f"⚠️ Could not probe duration of {path}: {e}")
+        return None
+
+
+class FfmpegPcmSource:
+    """16 kHz mono 16-bit PCM of any media ffmpeg can read, decoded to its stdout.
+
+    blocks() yields fixed-size blocks as ffmpeg produces them, so a consumer
+    starts within seconds instead of after a full extraction pass. With
+    tee_path the same PCM is also written to a WAV (via a .part file that is
+    only renamed into place once ffmpeg finished cleanly), so the extracted
+    audio can still be cached for later runs.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        start_ms: float = 0,
+        end_ms: Optional[float] = None,
+        block_ms: int = 100,
+        tee_path: Optional[Union[str, Path]] = None
+    ):
+        self.path = Path(path)
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.block_bytes = SAMPLE_RATE * block_ms // 1000 * BYTES_PER_SAMPLE
+        self.tee_path = Path(tee_path) if tee_path else None
+        self.process: Optional[subprocess.Popen] = None
+
+        # Metrics
+        self.bytes_read = 0
+
+    def command(self) -> list:
+        command = ['ffmpeg', '-nostdin', '-loglevel', 'error']
+        if self.start_ms:
+            # Input seeking: fast, and exact enough for audio
+            command += ['-ss', f"{self.start_ms / 1000:.3f}"]
+        command += ['-i', str(self.path)]
+        if self.end_ms is not None:
+            command += ['-t', f"{(self.end_ms - self.start_ms) / 1000:.3f}"]
+        return command + ['-vn', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-ac', '1', '-f', 's16le', 'pipe:1']
+
+    def blocks(self) -> Iterator[bytes]:
+        self.process = subprocess.Popen(self.command(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        tee = None
+        if self.tee_path:
+            part = self.tee_path.with_name(self.tee_path.name + '.part')
+            tee = wave.open(str(part), 'wb')
+            tee.setnchannels(1)
+            tee.setsampwidth(BYTES_PER_SAMPLE)
+            tee.setframerate(SAMPLE_RATE)
+        completed = False
+        try:
+            while True:
+                block = self.process.stdout.read(self.block_bytes)
+                if not block:
+                    break
+                self.bytes_read += len(block)
+                if tee:
+                    tee.writeframes(block)
+                yield block
+            # stderr is only read once stdout is drained; -loglevel error keeps it short
+            errors = self.process.stderr.read().decode('utf-8', errors='replace').strip()
+            if self.process.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with code {self.process.returncode}: {errors}")
+            completed = True
+        finally:
+            self.close()
+            if tee:
+                tee.close()
+                if completed:
+                    os.replace(part, self.tee_path)
+                    logger.info(f"💾 Audio cached: {self.tee_path}")
+                else:
+                    part.unlink(missing_ok=True)
+
+    def close(self):
+        if self.process and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    @property
+    def decoded_ms(self) -> float:
+        return self.bytes_read / BYTES_PER_SAMPLE * 1000 / SAMPLE_RATE
+
+
+class PcmFeeder(threading.Thread):
+    """Writes PCM blocks into a push stream (anything with write() and close()) from its own thread.
+
+    The stream is closed when the blocks run out, which ends the recognition
+    session; an error of the source is kept in .error for the caller to check.
+    """
+
+    def __init__(self, blocks: Iterable[bytes], stream):
+        super().__init__(daemon=True)
+        self.blocks = blocks
+        self.stream = stream
+        self.error: Optional[Exception] = None
+
+    def run(self):
+        try:
+            for block in self.blocks:
+                self.stream.write(block)
+        except Exception as e:
+            self.error = e
+            logger.error(f"❌ Audio feed failed: {e}")
+        finally:
+            self.stream.close()
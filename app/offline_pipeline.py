@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Union
+
+from app.run_journal import fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """One offline step: a CLI script that turns its input artifacts into one output artifact.
+
+    The script is called with the paths of its inputs (then args) and must
+    write the output to the path the naming convention gives it. params are
+    the environment variables whose values change the output (model
+    deployment, voice, ...), files are any other files it reads (the glossary).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        script: Union[str, Path],
+        inputs: Sequence[str],
+        output: str,
+        params: Sequence[str] = (),
+        files: Sequence[Union[str, Path]] = (),
+        args: Sequence[str] = ()
+    ):
+        self.name = name
+        self.script = Path(script)
+        self.inputs = list(inputs)
+        self.output = output
+        self.params = list(params)
+        self.files = [Path(path) for path in files]
+        self.args = list(args)
+
+    def key(self, paths: Dict[str, Path]) -> str:
+        """Content hash of everything the output depends on, the script's own code included"""
+        return fingerprint(
+            self.script,
+            *(paths[name] for name in self.inputs),
+            *(path if path.exists() else f"missing:{path}" for path in self.files),
+            *(f"{param}={os.getenv(param, '')}" for param in self.params),
+            *self.args
+        )
+
+    @staticmethod
+    def unfinished(output: Path) -> List[Path]:
+        """Resume state a stage leaves next to a partial output: its RunJournal, or its parts directory"""
+        candidates = [output.with_suffix('.journal.jsonl'), output.with_name(output.stem + '_parts')]
+        return [path for path in candidates if path.exists()]
+
+
+class ArtifactStore:
+    """Content-addressed store of stage outputs: root/<stage>/<key><suffix>.
+
+    Outputs are hard-linked between the store and the working directory when
+    the filesystem allows it, so keeping every variant (e.g. one dub per
+    voice) costs no extra copy of the current one. Restoring an earlier
+    variant is a link, not a rerun. A directory output (a segment store) is
+    copied as a tree of linked files.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def path(self, stage: str, key: str, suffix: str) -> Path:
+        return self.root / stage / f"{key}{suffix}"
+
+    def restore(self, stage: str, key: str, destination: Path) -> bool:
+        """Put the stored output for key at destination; False if there is none"""
+        stored = self.path(stage, key, destination.suffix)
+        if not stored.exists():
+            return False
+        if destination.exists():
+            if destination.samefile(stored):
+                return True
+            self.remove(destination)
+        self.link(stored, destination)
+        return True
+
+    def save(self, stage: str, key: str, output: Path):
+        stored = self.path(stage, key, output.suffix)
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        if stored.exists():
+            self.remove(stored)
+        self.link(output, stored)
+
+    @staticmethod
+    def remove(path: Path):
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+    @staticmethod
+    def link(source: Path, destination: Path):
+        if os.path.isdir(source):
+            shutil.copytree(source, destination, copy_function=ArtifactStore.link)
+            return
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+
+class OfflinePipeline:
+    """Runs a DAG of stages, recomputing only those whose key changed.
+
+    A stage's key hashes the contents of its inputs, so when a rerun upstream
+    produces the same bytes as before, everything downstream is still reused.
+    """
+
+    def __init__(self, stages: Sequence[Stage], paths: Dict[str, Path], store: ArtifactStore):
+        self.stages = {stage.name: stage for stage in stages}
+        self.producers = {stage.output: stage for stage in stages}
+        self.paths = paths
+        self.store = store
+
+        # Metrics
+        self.ran: List[str] = []
+        self.reused: List[str] = []
+
+    def plan(self, targets: Optional[Sequence[str]] = None) -> List[Stage]:
+        """Stages needed for targets (all stages by default), dependencies first"""
+        ordered: List[Stage] = []
+        visiting = set()
+
+        def visit(stage: Stage):
+            if stage in ordered:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Dependency cycle at stage {stage.name}")
+            visiting.add(stage.name)
+            for name in stage.inputs:
+                if name in self.producers:
+                    visit(self.producers[name])
+            visiting.discard(stage.name)
+            ordered.append(stage)
+
+        for name in targets or list(self.stages):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            visit(self.stages[name])
+        return ordered
+
+    def run(self, targets: Optional[Sequence[str]] = None, force: Sequence[str] = ()) -> bool:
+        for stage in self.plan(targets):
+            missing = [name for name in stage.inputs if not self.paths[name].exists()]
+            if missing:
+                logger.error(f"❌ {stage.name}: missing input {', '.join(missing)}")
+                return False
+
+            output = self.paths[stage.output]
+            key = stage.key(self.paths)
+            if stage.name not in force and self.store.restore(stage.name, key, output):
+                logger.info(f"♻️ {stage.name}: up to date ({key})")
+                self.reused.append(stage.name)
+                continue
+
+            logger.info(f"▶️ {stage.name}: running {stage.script.name} ({key})")
+            # The stored copy may be a hard link to the old output: never write through it
+            if output.exists():
+                self.store.remove(output)
+            command = [sys.executable, str(stage.script)] + [str(self.paths[name]) for name in stage.inputs] + stage.args
+            result = subprocess.run(command)
+            if result.returncode != 0 or not output.exists():
+                logger.error(f"❌ {stage.name} failed (exit code {result.returncode})")
+                return False
+            # A partial output must not become the up-to-date one: the next run has to resume it
+            leftovers = stage.unfinished(output)
+            if leftovers:
+                logger.error(f"❌ {stage.name}: unfinished ({', '.join(path.name for path in leftovers)} left), not stored")
+                return False
+            self.store.save(stage.name, key, output)
+            self.ran.append(stage.name)
+        return True
+
+
+class StreamBuffer:
+    """Bounded queue between two stages of a streaming run.
+
+    The upstream async iterator is drained by its own task, so both stages
+    work at the same time; when the downstream stage falls behind, the full
+    queue makes the upstream one wait (backpressure) instead of piling up
+    results in memory. Upstream errors are re-raised to the consumer.
+    """
+
+    _END = object()
+
+    def __init__(self, name: str, source: AsyncIterator, maxsize: int = 32):
+        self.name = name
+        self.source = source
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.error: Optional[BaseException] = None
+        self.started = time.monotonic()
+
+        # Metrics
+        self.items = 0
+        self.max_depth = 0
+        self.finished_s: Optional[float] = None
+
+    async def fill(self):
+        try:
+            async for item in self.source:
+                await self.queue.put(item)
+                self.items += 1
+                self.max_depth = max(self.max_depth, self.queue.qsize())
+        except Exception as e:
+            self.error = e
+        self.finished_s = time.monotonic() - self.started
+        await self.queue.put(self._END)
+
+    async def __aiter__(self):
+        producer = asyncio.ensure_future(self.fill())
+        try:
+            while True:
+                item = await self.queue.get()
+                if item is self._END:
+                    break
+                yield item
+            if self.error:
+                raise self.error
+        finally:
+            producer.cancel()
+
+    def get_metrics(self) -> dict:
+        return {
+            "stage": self.name,
+            "items": self.items,
+            "max_queue_depth": self.max_depth,
+            "maxsize": self.queue.maxsize,
+            "finished_s": round(self.finished_s, 1) if self.finished_s is not None else None,
+        }
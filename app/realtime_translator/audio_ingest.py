@@ -0,0 +1,215 @@
+import asyncio
+import binascii
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Recall sends 16kHz, 16-bit, mono PCM
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+
+def frame_size_bytes(frame_ms: int, sample_rate: int = SAMPLE_RATE) -> int:
+    """Size in bytes of a frame_ms long mono 16-bit PCM frame"""
+    return sample_rate * frame_ms // 1000 * BYTES_PER_SAMPLE
+
+
+class PCMRingBuffer:
+    """Preallocated ring buffer that hands out fixed-size, contiguous frames.
+
+    The capacity is a whole number of frames and frames are only ever read
+    from frame-aligned positions, so every frame is a single memoryview slice
+    of the buffer - no reassembly across the wrap-around point.
+    """
+
+    def __init__(self, frame_bytes: int, frames: int = 8):
+        self.frame_bytes = frame_bytes
+        self.capacity = frame_bytes * frames
+        self.buffer = bytearray(self.capacity)
+        self.view = memoryview(self.buffer)
+        self.read_pos = 0
+        self.write_pos = 0
+        self.size = 0
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.size
+
+    def write(self, data) -> int:
+        """Copy as much of data as fits; returns the number of bytes written"""
+        n = min(len(data), self.capacity - self.size)
+        if n == 0:
+            return 0
+
+        pos = self.write_pos
+        end = pos + n
+        if end <= self.capacity:
+            self.view[pos:end] = data if n == len(data) else data[:n]
+            self.write_pos = end % self.capacity
+        else:
+            first = self.capacity - pos
+            self.view[pos:] = data[:first]
+            self.view[:n - first] = data[first:n]
+            self.write_pos = n - first
+
+        self.size += n
+        return n
+
+    def has_frame(self) -> bool:
+        return self.size >= self.frame_bytes
+
+    def read_frame(self) -> memoryview:
+        """Return the next full frame as a view (valid until the next write)"""
+        start = self.read_pos
+        self.read_pos = (self.read_pos + self.frame_bytes) % self.capacity
+        self.size -= self.frame_bytes
+        return self.view[start:start + self.frame_bytes]
+
+    def read_remaining(self) -> bytes:
+        """Drain a partial frame (always contiguous, since reads are frame-aligned)"""
+        start = self.read_pos
+        data = bytes(self.view[start:start + self.size])
+        # The ring is empty: restart at 0 so reads stay frame-aligned
+        # (write_pos is mid-frame after a partial frame)
+        self.read_pos = self.write_pos = 0
+        self.size = 0
+        return data
+
+
+class AudioIngest:
+    """Decodes Recall audio messages into per-participant ring buffers and
+    emits fixed-size frames (frame_ms long) to on_frame(participant_id, frame).
+
+    Compared to decoding and pushing every WebSocket message on its own, this
+    issues one SDK write per frame instead of one per message and keeps the
+    per-participant buffering in a single preallocated bytearray.
+    """
+
+    def __init__(
+        self,
+        on_frame: Callable[[str, bytes], None],
+        frame_ms: int = 100,
+        ring_frames: int = 8,
+        max_partial_wait_ms: Optional[int] = None
+    ):
+        self.on_frame = on_frame
+        self.frame_ms = frame_ms
+        self.frame_bytes = frame_size_bytes(frame_ms)
+        self.ring_frames = ring_frames
+        # How long an incomplete frame may wait for more audio before it is flushed
+        self.max_partial_wait_ms = max_partial_wait_ms if max_partial_wait_ms is not None else frame_ms * 2
+
+        # base64 decoder; binascii accepts the ASCII str directly (no .encode() copy)
+        self.decode = binascii.a2b_base64
+
+        self.rings: Dict[str, PCMRingBuffer] = {}
+        self.last_feed_at: Dict[str, float] = {}
+        self.flusher_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.messages_in = 0
+        self.bytes_in = 0
+        self.frames_out = 0
+        self.partial_flushes = 0
+        self.decode_errors = 0
+
+    def start(self):
+        """Start flushing stale partial frames (must be called from the event loop thread)"""
+        if not self.flusher_task:
+            self.flusher_task = asyncio.get_running_loop().create_task(self.flush_stale())
+
+    def feed_base64(self, participant_id: Optional[str], audio_base64: str):
+        """Decode one base64 audio message and emit every complete frame"""
+        try:
+            raw_audio = self.decode(audio_base64)
+        except (binascii.Error, ValueError) as e:
+            self.decode_errors += 1
+            logger.warning(f"⚠️ Invalid audio payload from {participant_id}: {e}")
+            return
+        self.feed(participant_id, raw_audio)
+
+    def feed(self, participant_id: Optional[str], audio_data):
+        """Buffer raw PCM for a participant and emit every complete frame"""
+        # Same ids as the demux, so remove() finds them
+        participant_id = str(participant_id) if participant_id is not None else "unknown"
+
+        ring = self.rings.get(participant_id)
+        if ring is None:
+            ring = self.rings[participant_id] = PCMRingBuffer(self.frame_bytes, self.ring_frames)
+
+        self.messages_in += 1
+        self.bytes_in += len(audio_data)
+        self.last_feed_at[participant_id] = time.monotonic()
+
+        if len(audio_data) <= ring.free:
+            # Common case: the message fits next to the buffered partial frame
+            ring.write(audio_data)
+            self.emit_frames(participant_id, ring)
+            return
+
+        data = memoryview(audio_data)
+        while data:
+            written = ring.write(data)
+            data = data[written:]
+            self.emit_frames(participant_id, ring)
+
+    def emit_frames(self, participant_id: str, ring: PCMRingBuffer):
+        """Hand every complete frame in the ring to on_frame"""
+        while ring.size >= ring.frame_bytes:
+            # The SDK copies the buffer, so one bytes object per frame
+            self.on_frame(participant_id, bytes(ring.read_frame()))
+            self.frames_out += 1
+
+    def flush(self, participant_id: str):
+        """Emit a participant's incomplete frame, if any"""
+        ring = self.rings.get(participant_id)
+        if ring and ring.size:
+            self.on_frame(participant_id, ring.read_remaining())
+            self.partial_flushes += 1
+
+    async def flush_stale(self):
+        """Flush partial frames of participants who stopped sending audio"""
+        interval = self.frame_ms / 1000
+        max_wait = self.max_partial_wait_ms / 1000
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for participant_id, fed_at in list(self.last_feed_at.items()):
+                if now - fed_at > max_wait:
+                    self.flush(participant_id)
+                    # flush() may have led to remove() of this very participant
+                    self.last_feed_at.pop(participant_id, None)
+
+    def remove(self, participant_id: str):
+        """Forget a participant who left (their ring is allocated again if they come back)"""
+        ring = self.rings.pop(participant_id, None)
+        self.last_feed_at.pop(participant_id, None)
+        if ring and ring.size:
+            logger.debug(f"Dropped {ring.size} buffered bytes of {participant_id}")
+
+    def get_metrics(self) -> dict:
+        """Ingest throughput counters"""
+        return {
+            "frame_ms": self.frame_ms,
+            "participants": len(self.rings),
+            "messages_in": self.messages_in,
+            "bytes_in": self.bytes_in,
+            "frames_out": self.frames_out,
+            "partial_flushes": self.partial_flushes,
+            "decode_errors": self.decode_errors,
+        }
+
+    async def stop(self):
+        """Stop the flusher and emit every remaining partial frame"""
+        if self.flusher_task:
+            self.flusher_task.cancel()
+            try:
+                await self.flusher_task
+            except asyncio.CancelledError:
+                pass
+            self.flusher_task = None
+
+        for participant_id in list(self.rings):
+            self.flush(participant_id)
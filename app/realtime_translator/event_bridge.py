@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechEventBridge:
+    """Thread-safe bridge from Azure Speech SDK callbacks into the asyncio event loop.
+
+    SDK callbacks run on the SDK's own thread, where there is no running loop.
+    They call post(), which hands the event to the loop via call_soon_threadsafe.
+    A single consumer task per meeting then awaits the callbacks in arrival order.
+    """
+
+    def __init__(
+        self,
+        name: str = "meeting",
+        maxsize: int = 256,
+        dwell_warning_ms: float = 2000,
+        coalesce_partials: bool = False
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.dwell_warning_ms = dwell_warning_ms
+        # Keep only the newest queued partial result per speaker
+        self.coalesce_partials = coalesce_partials
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.items = deque()  # (kind, callback, kwargs, enqueued_at)
+        self.wakeup: Optional[asyncio.Event] = None
+        self.consumer_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.enqueued = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.last_dwell_ms = 0.0
+        self.max_dwell_ms = 0.0
+        self.total_dwell_ms = 0.0
+
+    def start(self):
+        """Start the consumer task (must be called from the event loop thread)"""
+        if self.consumer_task:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        self.consumer_task = self.loop.create_task(self.consume())
+        logger.info(f"🌉 Speech event bridge started ({self.name}, maxsize={self.maxsize})")
+
+    def post(self, kind: str, callback: Callable[..., Awaitable], **kwargs):
+        """Post an event from any thread (SDK callbacks included)"""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            logger.warning(f"⚠️ Event bridge not running, dropping {kind} event")
+            return
+        try:
+            loop.call_soon_threadsafe(self.enqueue, kind, callback, kwargs, time.monotonic())
+        except RuntimeError:
+            # Loop was closed between the check and the call
+            logger.warning(f"⚠️ Event loop closed, dropping {kind} event")
+
+    def enqueue(self, kind: str, callback, kwargs: dict, enqueued_at: float):
+        """Add an event to the queue (runs on the loop thread)"""
+        if kind == "recognizing" and self.coalesce_partials:
+            self.drop_stale_partial(callback, kwargs.get("speaker_id"))
+
+        if len(self.items) >= self.maxsize:
+            if kind == "recognizing":
+                # Partial hypotheses are superseded by the next one anyway
+                self.dropped += 1
+                return
+            if not self.evict_oldest_partial():
+                self.dropped += 1
+                logger.error(f"❌ Event bridge full ({self.maxsize}), dropping {kind} event")
+                return
+
+        self.items.append((kind, callback, kwargs, enqueued_at))
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self.items))
+        self.wakeup.set()
+
+    def drop_stale_partial(self, callback, speaker_id):
+        """Remove a queued partial of the same speaker; the new one supersedes it"""
+        for item in self.items:
+            if item[0] == "recognizing" and item[1] is callback and item[2].get("speaker_id") == speaker_id:
+                self.items.remove(item)
+                self.coalesced += 1
+                return
+
+    def evict_oldest_partial(self) -> bool:
+        """Remove the oldest queued partial event to make room for a final one"""
+        for item in self.items:
+            if item[0] == "recognizing":
+                self.items.remove(item)
+                self.dropped += 1
+                return True
+        return False
+
+    async def consume(self):
+        """Dispatch queued events one by one, in order"""
+        while True:
+            if not self.items:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            kind, callback, kwargs, enqueued_at = self.items.popleft()
+
+            dwell_ms = (time.monotonic() - enqueued_at) * 1000
+            self.last_dwell_ms = dwell_ms
+            self.max_dwell_ms = max(self.max_dwell_ms, dwell_ms)
+            self.total_dwell_ms += dwell_ms
+            if dwell_ms > self.dwell_warning_ms:
+                logger.warning(f"⚠️ {kind} event waited {dwell_ms:.0f} ms in queue (depth {len(self.items)})")
+
+            try:
+                await callback(**kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error dispatching {kind} event: {e}", exc_info=True)
+            finally:
+                self.dispatched += 1
+
+    def get_metrics(self) -> dict:
+        """Queue depth and dwell-time metrics"""
+        return {
+            "name": self.name,
+            "queue_depth": len(self.items),
+            "max_queue_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "enqueued": self.enqueued,
+            "dispatched": self.dispatched,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "last_dwell_ms": round(self.last_dwell_ms, 1),
+            "max_dwell_ms": round(self.max_dwell_ms, 1),
+            "avg_dwell_ms": round(self.total_dwell_ms / self.dispatched, 1) if self.dispatched else 0.0,
+        }
+
+    async def stop(self):
+        """Stop the consumer task, dropping whatever is still queued"""
+        if self.consumer_task:
+            self.consumer_task.cancel()
+            try:
+                await self.consumer_task
+            except asyncio.CancelledError:
+                pass
+            self.consumer_task = None
+
+        if self.items:
+            logger.warning(f"⚠️ Event bridge stopped with {len(self.items)} pending events")
+            self.items.clear()
+
+        self.loop = None
+        logger.info(f"🌉 Speech event bridge stopped ({self.name})")
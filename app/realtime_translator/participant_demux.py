@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ParticipantStream:
+    """One participant's recognizer plus the audio received while it is starting"""
+
+    def __init__(self, participant_id: str, transcriber):
+        self.participant_id = participant_id
+        self.transcriber = transcriber
+        self.ready = False
+        self.closed = False
+        self.pending = []  # audio chunks buffered until the recognizer has started
+        self.created_at = time.monotonic()
+        self.last_audio_at = self.created_at
+        self.bytes_written = 0
+
+
+class ParticipantAudioDemux:
+    """Routes per-participant audio into a dedicated recognizer per active speaker.
+
+    Recognizers are created lazily on a participant's first audio chunk, torn down
+    after idle_timeout seconds without audio, and capped at max_recognizers.
+    The transcriber factory must return an object with start(), write_audio(bytes)
+    and stop(); start/stop are blocking SDK calls and run in the default executor.
+    on_close(participant_id) is called when a stream is reaped or evicted, so
+    the stages in front of the demux can drop that participant's state too.
+    """
+
+    def __init__(
+        self,
+        create_transcriber: Callable[[str], object],
+        max_recognizers: int = 4,
+        idle_timeout: float = 30.0,
+        min_idle_for_eviction: float = 2.0,
+        on_close: Optional[Callable[[str], None]] = None
+    ):
+        self.create_transcriber = create_transcriber
+        self.on_close = on_close
+        self.max_recognizers = max_recognizers
+        self.idle_timeout = idle_timeout
+        self.min_idle_for_eviction = min_idle_for_eviction
+
+        self.streams: Dict[str, ParticipantStream] = {}
+        self.reaper_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.recognizers_created = 0
+        self.recognizers_closed = 0
+        self.evictions = 0
+        self.rejected_chunks = 0
+
+    def start(self):
+        """Start the idle reaper (must be called from the event loop thread)"""
+        if not self.reaper_task:
+            self.reaper_task = asyncio.get_running_loop().create_task(self.reap_idle())
+        logger.info(
+            f"👥 Participant demux started (max {self.max_recognizers} recognizers, "
+            f"idle timeout {self.idle_timeout:.0f}s)"
+        )
+
+    def write_audio(self, participant_id: Optional[str], audio_data: bytes):
+        """Write a participant's audio chunk to their own recognizer"""
+        participant_id = str(participant_id) if participant_id is not None else "unknown"
+
+        stream = self.streams.get(participant_id)
+        if stream is None:
+            stream = self.open_stream(participant_id)
+            if stream is None:
+                self.rejected_chunks += 1
+                return
+
+        stream.last_audio_at = time.monotonic()
+        stream.bytes_written += len(audio_data)
+
+        if stream.ready:
+            stream.transcriber.write_audio(audio_data)
+        else:
+            stream.pending.append(audio_data)
+
+    def open_stream(self, participant_id: str) -> Optional[ParticipantStream]:
+        """Create a recognizer for a new participant, evicting an idle one if at the cap"""
+        if len(self.streams) >= self.max_recognizers and not self.evict_least_recent():
+            logger.warning(
+                f"⚠️ Recognizer cap reached ({self.max_recognizers}), "
+                f"ignoring audio from participant {participant_id}"
+            )
+            return None
+
+        stream = ParticipantStream(participant_id, self.create_transcriber(participant_id))
+        self.streams[participant_id] = stream
+        self.recognizers_created += 1
+        asyncio.get_running_loop().create_task(self.start_stream(stream))
+        logger.info(f"🎙️ New recognizer for participant {participant_id} ({len(self.streams)} active)")
+        return stream
+
+    async def start_stream(self, stream: ParticipantStream):
+        """Start the recognizer off-loop, then flush audio buffered meanwhile"""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, stream.transcriber.start)
+        except Exception as e:
+            logger.error(f"❌ Failed to start recognizer for {stream.participant_id}: {e}")
+            if self.streams.get(stream.participant_id) is stream:
+                del self.streams[stream.participant_id]
+            return
+
+        if stream.closed:
+            # Evicted while starting
+            await loop.run_in_executor(None, stream.transcriber.stop)
+            return
+
+        for chunk in stream.pending:
+            stream.transcriber.write_audio(chunk)
+        stream.pending = []
+        stream.ready = True
+
+    def evict_least_recent(self) -> bool:
+        """Close the least recently active stream if it has been quiet long enough"""
+        if not self.streams:
+            return False
+
+        stream = min(self.streams.values(), key=lambda s: s.last_audio_at)
+        if time.monotonic() - stream.last_audio_at < self.min_idle_for_eviction:
+            return False
+
+        self.evictions += 1
+        self.close_stream(stream.participant_id)
+        return True
+
+    def close_stream(self, participant_id: str):
+        """Remove a participant's stream and stop its recognizer in the background"""
+        stream = self.streams.pop(participant_id, None)
+        if not stream:
+            return
+
+        stream.closed = True
+        self.recognizers_closed += 1
+        logger.info(f"👋 Closing recognizer for participant {participant_id} ({len(self.streams)} active)")
+
+        if stream.ready:
+            asyncio.get_running_loop().run_in_executor(None, stream.transcriber.stop)
+        if self.on_close:
+            self.on_close(participant_id)
+
+    async def reap_idle(self):
+        """Periodically tear down recognizers of participants who stopped talking"""
+        interval = max(1.0, self.idle_timeout / 4)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for participant_id, stream in list(self.streams.items()):
+                if now - stream.last_audio_at > self.idle_timeout:
+                    self.close_stream(participant_id)
+
+    def get_metrics(self) -> dict:
+        """Active recognizers and lifecycle counters"""
+        now = time.monotonic()
+        return {
+            "active_recognizers": len(self.streams),
+            "max_recognizers": self.max_recognizers,
+            "recognizers_created": self.recognizers_created,
+            "recognizers_closed": self.recognizers_closed,
+            "evictions": self.evictions,
+            "rejected_chunks": self.rejected_chunks,
+            "participants": {
+                participant_id: {
+                    "ready": stream.ready,
+                    "bytes_written": stream.bytes_written,
+                    "idle_s": round(now - stream.last_audio_at, 1),
+                }
+                for participant_id, stream in self.streams.items()
+            },
+        }
+
+    async def stop(self):
+        """Stop the reaper and every recognizer"""
+        if self.reaper_task:
+            self.reaper_task.cancel()
+            try:
+                await self.reaper_task
+            except asyncio.CancelledError:
+                pass
+            self.reaper_task = None
+
+        loop = asyncio.get_running_loop()
+        streams = list(self.streams.values())
+        self.streams.clear()
+        for stream in streams:
+            stream.closed = True
+        await asyncio.gather(
+            *(loop.run_in_executor(None, s.transcriber.stop) for s in streams if s.ready),
+            return_exceptions=True
+        )
+        self.recognizers_closed += len(streams)
+        logger.info("👥 Participant demux stopped")
@@ -0,0 +1,362 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from app.realtime_translator.settings import validate_update
+
+logger = logging.getLogger(__name__)
+
+
+class PipelinePolicy:
+    """Latency budget and overflow policy for one meeting's realtime pipeline"""
+
+    OVERFLOW_POLICIES = ("merge", "drop_oldest", "drop_newest")
+
+    FIELDS = (
+        "max_latency_s",
+        "queue_size",
+        "overflow",
+        "merge_max_chars",
+        "skip_late_tts",
+        "fast_model_after_s",
+        "drop_stale_partials",
+        "stream_sentences",
+    )
+
+    def __init__(
+        self,
+        max_latency_s: float = 8.0,
+        queue_size: int = 4,
+        overflow: str = "merge",
+        merge_max_chars: int = 600,
+        skip_late_tts: bool = True,
+        fast_model_after_s: float = 3.0,
+        drop_stale_partials: bool = True,
+        stream_sentences: bool = True
+    ):
+        # End-to-end budget: recognized by Azure -> audio sent to Zoom
+        self.max_latency_s = max_latency_s
+        # Bound of every stage queue (translate, synthesize, output)
+        self.queue_size = queue_size
+        # What to do when a new utterance arrives while translations are queued:
+        # "merge" appends it to a queued utterance of the same speaker, then
+        # falls back to dropping the oldest; "drop_oldest"/"drop_newest" shed only
+        self.overflow = overflow
+        self.merge_max_chars = merge_max_chars
+        # Don't synthesize/send lines that are already over the latency budget
+        self.skip_late_tts = skip_late_tts
+        # Translate with the fast deployment once an utterance has waited this long (0 = never)
+        self.fast_model_after_s = fast_model_after_s
+        # Only the newest queued partial result per speaker is broadcast
+        self.drop_stale_partials = drop_stale_partials
+        # Synthesize each translated sentence as soon as it is complete
+        # (only when the pipeline has a streaming translate handler)
+        self.stream_sentences = stream_sentences
+
+    def update(self, **values):
+        """Update policy from a dict (e.g. a JSON request body); nothing changes if a value is invalid"""
+        validated = validate_update(self, values, "pipeline")
+        if "overflow" in validated and validated["overflow"] not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {validated['overflow']}")
+        for key, value in validated.items():
+            setattr(self, key, value)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+
+class Utterance:
+    """One recognized phrase travelling through the pipeline"""
+
+    ids = itertools.count(1)
+
+    def __init__(self, text: str, speaker_id: str, gender: str, recognized_at: Optional[float] = None):
+        self.id = next(self.ids)
+        self.text = text
+        self.speaker_id = speaker_id
+        self.gender = gender
+        self.recognized_at = recognized_at or time.monotonic()
+        self.parts = 1
+        # Translation tasks already started for this text (speculative translation)
+        self.translation_tasks = []
+        self.model = None
+        self.translation = None
+        self.audio = None
+        # Set on the sentences of a streamed translation
+        self.parent: Optional["Utterance"] = None
+        self.first_audio_at: Optional[float] = None
+
+    def sentence(self, translation: str) -> "Utterance":
+        """A translated sentence of this utterance, synthesized on its own"""
+        child = Utterance(self.text, self.speaker_id, self.gender, self.recognized_at)
+        child.model = self.model
+        child.translation = translation
+        child.parent = self
+        return child
+
+    @property
+    def age(self) -> float:
+        """Seconds since Azure recognized the (first part of the) utterance"""
+        return time.monotonic() - self.recognized_at
+
+
+class PipelineStage:
+    """Bounded queue plus a single worker, so utterances keep their order"""
+
+    def __init__(self, name: str, handler: Callable[[Utterance], Awaitable[bool]], maxsize: int):
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.items = deque()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.drained: Optional[asyncio.Event] = None
+        self.worker_task: Optional[asyncio.Task] = None
+        self.next_stage: Optional["PipelineStage"] = None
+        self.on_overflow: Optional[Callable[["PipelineStage", Utterance], bool]] = None
+
+        # Metrics
+        self.processed = 0
+        self.shed = 0
+        self.errors = 0
+        self.max_depth = 0
+
+    def start(self):
+        self.wakeup = asyncio.Event()
+        self.drained = asyncio.Event()
+        self.worker_task = asyncio.get_running_loop().create_task(self.work())
+
+    def offer(self, utterance: Utterance):
+        """Queue an utterance without waiting; applies the overflow policy when full"""
+        if self.on_overflow and self.on_overflow(self, utterance):
+            return
+        self.items.append(utterance)
+        self.max_depth = max(self.max_depth, len(self.items))
+        self.wakeup.set()
+
+    async def put(self, utterance: Utterance):
+        """Queue an utterance, waiting for room instead of shedding"""
+        while len(self.items) >= self.maxsize:
+            self.drained.clear()
+            await self.drained.wait()
+        self.items.append(utterance)
+        self.max_depth = max(self.max_depth, len(self.items))
+        self.wakeup.set()
+
+    async def work(self):
+        while True:
+            if not self.items:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            utterance = self.items.popleft()
+            self.drained.set()
+            try:
+                keep = await self.handler(utterance)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error in {self.name} stage: {e}", exc_info=True)
+                continue
+
+            self.processed += 1
+            if keep and self.next_stage:
+                self.next_stage.offer(utterance)
+
+    async def stop(self):
+        if self.worker_task:
+            self.worker_task.cancel()
+            try:
+                await self.worker_task
+            except asyncio.CancelledError:
+                pass
+            self.worker_task = None
+        self.items.clear()
+
+    def get_metrics(self) -> dict:
+        return {
+            "queue_depth": len(self.items),
+            "max_queue_depth": self.max_depth,
+            "processed": self.processed,
+            "shed": self.shed,
+            "errors": self.errors,
+        }
+
+
+class RealtimePipeline:
+    """Bounded STT result -> translate -> synthesize -> output pipeline.
+
+    Each stage has its own bounded queue and worker, so a slow GPT or TTS call
+    delays only the stages behind it instead of piling up concurrent coroutines.
+    Handlers fill in the utterance: translate(utterance, model) returns the
+    translation, synthesize(utterance) returns audio bytes (or None), and
+    output(utterance) delivers the audio.
+
+    With a translate_stream(utterance, model) handler, which yields the
+    translation sentence by sentence, each sentence is synthesized and sent
+    while the next one is still being generated. Sentences wait for room in
+    the synthesize queue rather than being shed, so a long utterance is never
+    cut in the middle; the translate queue absorbs the backpressure.
+    """
+
+    def __init__(
+        self,
+        translate: Callable[[Utterance, Optional[str]], Awaitable[str]],
+        synthesize: Callable[[Utterance], Awaitable[Optional[bytes]]],
+        output: Callable[[Utterance], Awaitable[None]],
+        policy: Optional[PipelinePolicy] = None,
+        fast_model: Optional[str] = None,
+        translate_stream: Optional[Callable[[Utterance, Optional[str]], AsyncIterator[str]]] = None
+    ):
+        self.translate = translate
+        self.translate_stream = translate_stream
+        self.synthesize = synthesize
+        self.output = output
+        self.policy = policy or PipelinePolicy()
+        self.fast_model = fast_model
+
+        size = self.policy.queue_size
+        self.translate_stage = PipelineStage("translate", self.run_translate, size)
+        self.synthesize_stage = PipelineStage("synthesize", self.run_synthesize, size)
+        self.output_stage = PipelineStage("output", self.run_output, size)
+        self.translate_stage.next_stage = self.synthesize_stage
+        self.synthesize_stage.next_stage = self.output_stage
+
+        self.translate_stage.on_overflow = self.handle_translate_overflow
+        self.synthesize_stage.on_overflow = self.handle_overflow
+        self.output_stage.on_overflow = self.handle_overflow
+
+        # Metrics
+        self.submitted = 0
+        self.merged = 0
+        self.fast_model_used = 0
+        self.late_tts_skipped = 0
+        self.late_output_dropped = 0
+        self.delivered = 0
+        self.total_latency_s = 0.0
+        self.max_latency_seen_s = 0.0
+        self.sentences_streamed = 0
+        self.first_audio_count = 0
+        self.total_first_audio_s = 0.0
+        self.max_first_audio_s = 0.0
+
+    @property
+    def stages(self):
+        return (self.translate_stage, self.synthesize_stage, self.output_stage)
+
+    def start(self):
+        """Start the stage workers (must be called from the event loop thread)"""
+        for stage in self.stages:
+            stage.maxsize = self.policy.queue_size
+            stage.start()
+        logger.info(f"🚦 Realtime pipeline started (latency budget {self.policy.max_latency_s:.1f}s)")
+
+    def submit(self, utterance: Utterance):
+        """Hand a final STT result to the pipeline (never blocks)"""
+        self.submitted += 1
+        self.translate_stage.offer(utterance)
+
+    def handle_translate_overflow(self, stage: PipelineStage, utterance: Utterance) -> bool:
+        """Merge into a queued utterance of the same speaker, else shed when full"""
+        if self.policy.overflow == "merge" and stage.items:
+            last = stage.items[-1]
+            if (last.speaker_id == utterance.speaker_id
+                    and bool(last.translation_tasks) == bool(utterance.translation_tasks)
+                    and len(last.text) + len(utterance.text) < self.policy.merge_max_chars):
+                last.text = f"{last.text} {utterance.text}"
+                last.parts += 1
+                last.translation_tasks.extend(utterance.translation_tasks)
+                self.merged += 1
+                return True
+        return self.handle_overflow(stage, utterance)
+
+    def handle_overflow(self, stage: PipelineStage, utterance: Utterance) -> bool:
+        """Shed load when a stage queue is full; returns True if the utterance was consumed"""
+        stage.maxsize = self.policy.queue_size
+        if len(stage.items) < stage.maxsize:
+            return False
+
+        stage.shed += 1
+        if self.policy.overflow == "drop_newest":
+            logger.warning(f"⚠️ {stage.name} queue full, dropping new utterance from {utterance.speaker_id}")
+            return True
+
+        dropped = stage.items.popleft()
+        logger.warning(
+            f"⚠️ {stage.name} queue full, dropping oldest utterance from {dropped.speaker_id} "
+            f"({dropped.age:.1f}s old)"
+        )
+        return False
+
+    async def run_translate(self, utterance: Utterance) -> bool:
+        model = None
+        if self.fast_model and 0 < self.policy.fast_model_after_s <= utterance.age:
+            model = self.fast_model
+            self.fast_model_used += 1
+        utterance.model = model
+
+        if self.translate_stream and self.policy.stream_sentences:
+            async for sentence in self.translate_stream(utterance, model):
+                await self.synthesize_stage.put(utterance.sentence(sentence))
+                self.sentences_streamed += 1
+            # The sentences are already on their way
+            return False
+
+        utterance.translation = await self.translate(utterance, model)
+        return bool(utterance.translation)
+
+    async def run_synthesize(self, utterance: Utterance) -> bool:
+        if self.policy.skip_late_tts and utterance.age > self.policy.max_latency_s:
+            self.late_tts_skipped += 1
+            logger.warning(f"⏭️ Skipping TTS, line is {utterance.age:.1f}s late: {utterance.translation[:60]}")
+            return False
+        utterance.audio = await self.synthesize(utterance)
+        return utterance.audio is not None
+
+    async def run_output(self, utterance: Utterance) -> bool:
+        latency = utterance.age
+        if self.policy.skip_late_tts and latency > self.policy.max_latency_s:
+            self.late_output_dropped += 1
+            logger.warning(f"⏭️ Dropping audio, line is {latency:.1f}s late")
+            return False
+
+        await self.output(utterance)
+        self.delivered += 1
+        latency = utterance.age
+        self.total_latency_s += latency
+        self.max_latency_seen_s = max(self.max_latency_seen_s, latency)
+
+        root = utterance.parent or utterance
+        if root.first_audio_at is None:
+            root.first_audio_at = time.monotonic()
+            self.first_audio_count += 1
+            self.total_first_audio_s += latency
+            self.max_first_audio_s = max(self.max_first_audio_s, latency)
+        return True
+
+    def get_metrics(self) -> dict:
+        return {
+            "policy": self.policy.to_dict(),
+            "submitted": self.submitted,
+            "merged": self.merged,
+            "fast_model_used": self.fast_model_used,
+            "late_tts_skipped": self.late_tts_skipped,
+            "late_output_dropped": self.late_output_dropped,
+            "delivered": self.delivered,
+            "avg_latency_s": round(self.total_latency_s / self.delivered, 2) if self.delivered else 0.0,
+            "max_latency_s": round(self.max_latency_seen_s, 2),
+            "sentences_streamed": self.sentences_streamed,
+            "avg_time_to_first_audio_s": round(self.total_first_audio_s / self.first_audio_count, 2)
+            if self.first_audio_count else 0.0,
+            "max_time_to_first_audio_s": round(self.max_first_audio_s, 2),
+            "stages": {stage.name: stage.get_metrics() for stage in self.stages},
+        }
+
+    async def stop(self):
+        for stage in self.stages:
+            await stage.stop()
+        logger.info("🚦 Realtime pipeline stopped")
@@ -0,0 +1,31 @@
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def parse_bool(value) -> bool:
+    """A JSON/form flag as a bool; anything but a clear yes or no is rejected"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+    raise ValueError(f"Expected true or false, got {value!r}")
+
+
+def validate_update(settings, values: dict, kind: str) -> dict:
+    """values cast to the types of settings' current fields; raises before anything is assigned"""
+    validated = {}
+    for key, value in values.items():
+        if key not in settings.FIELDS:
+            raise ValueError(f"Unknown {kind} setting: {key}")
+        current = getattr(settings, key)
+        try:
+            validated[key] = parse_bool(value) if isinstance(current, bool) else type(current)(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid {kind} setting {key}={value!r}: {e}")
+    return validated
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import re
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase, drop punctuation, ё -> е (partials come without punctuation/casing)"""
+    return _PUNCTUATION.sub("", word.lower().replace("ё", "е"))
+
+
+def normalize_words(text: str) -> List[str]:
+    return [w for w in (normalize_word(t) for t in text.split()) if w]
+
+
+def common_prefix_length(hypotheses) -> int:
+    """Number of leading words all hypotheses agree on"""
+    hypotheses = list(hypotheses)
+    length = min(len(h) for h in hypotheses)
+    for i in range(length):
+        word = hypotheses[0][i]
+        if any(h[i] != word for h in hypotheses[1:]):
+            return i
+    return length
+
+
+class SpeculationPolicy:
+    """When stable prefixes of partial results are translated ahead of the final result"""
+
+    def __init__(self, enabled: bool = False, stability_count: int = 3, min_chunk_words: int = 6):
+        self.enabled = enabled
+        # A word is stable once this many successive partials agree on it
+        self.stability_count = stability_count
+        # Don't start a speculative request for fewer new stable words than this
+        self.min_chunk_words = min_chunk_words
+
+
+class SpeculativeChunk:
+    """A stable run of source words whose translation was started early"""
+
+    def __init__(self, words: List[str], task: asyncio.Task):
+        self.words = words
+        self.task = task
+
+
+class SpeakerSpeculation:
+    """Partial-result history and speculative chunks of the current phrase"""
+
+    def __init__(self, stability_count: int):
+        self.history = deque(maxlen=stability_count)
+        self.chunks: List[SpeculativeChunk] = []
+        self.speculated_words = 0
+
+
+class SpeculativeTranslator:
+    """Translates stable prefixes of partial (recognizing) hypotheses early.
+
+    A prefix is stable when the last stability_count partials agree on it
+    word for word. Each new stable run of at least min_chunk_words is
+    translated right away. When the final result arrives, chunks whose words
+    match the start of the final text are reused (hits) and only the
+    remaining tail is translated; mismatched chunks are wasted.
+
+    translate(text) must return (translation, total_tokens).
+    """
+
+    def __init__(
+        self,
+        translate: Callable[[str], Awaitable[Tuple[str, int]]],
+        policy: Optional[SpeculationPolicy] = None
+    ):
+        self.translate = translate
+        self.policy = policy or SpeculationPolicy()
+        self.speakers: Dict[str, SpeakerSpeculation] = {}
+
+        # Metrics
+        self.partials_seen = 0
+        self.chunks_started = 0
+        self.chunks_confirmed = 0
+        self.chunks_wasted = 0
+        self.confirmed_tokens = 0
+        self.wasted_tokens = 0
+        self.finals = 0
+        self.finals_fully_speculated = 0
+
+    def on_partial(self, speaker_id: str, text: str):
+        """Feed a partial hypothesis; may start a speculative translation"""
+        if not self.policy.enabled:
+            return
+        self.partials_seen += 1
+
+        state = self.speakers.get(speaker_id)
+        if state is None:
+            state = self.speakers[speaker_id] = SpeakerSpeculation(self.policy.stability_count)
+
+        words = normalize_words(text)
+        state.history.append(words)
+        if len(state.history) < self.policy.stability_count:
+            return
+
+        stable = common_prefix_length(state.history)
+        if stable - state.speculated_words < self.policy.min_chunk_words:
+            return
+
+        chunk_words = words[state.speculated_words:stable]
+        task = asyncio.get_running_loop().create_task(self.translate(" ".join(chunk_words)))
+        state.chunks.append(SpeculativeChunk(chunk_words, task))
+        state.speculated_words = stable
+        self.chunks_started += 1
+        logger.debug(f"🔮 Speculating on {len(chunk_words)} stable words from {speaker_id}")
+
+    def finalize(self, speaker_id: str, final_text: str) -> asyncio.Task:
+        """Start resolving the final text; the task returns its full translation"""
+        state = self.speakers.pop(speaker_id, None)
+        chunks = state.chunks if state else []
+        return asyncio.get_running_loop().create_task(self.resolve(chunks, final_text))
+
+    async def resolve(self, chunks: List[SpeculativeChunk], final_text: str) -> str:
+        """Reuse chunks confirmed by the final text, translate only the unstable tail"""
+        self.finals += 1
+        tokens = final_text.split()
+        norms = [normalize_word(t) for t in tokens]
+
+        # Walk the final text, matching chunk words in order (skipping pure punctuation)
+        position = 0
+        confirmed = []
+        for chunk in chunks:
+            matched, end = self.match_chunk(chunk.words, norms, position)
+            if not matched:
+                break
+            confirmed.append(chunk)
+            position = end
+
+        for chunk in chunks[len(confirmed):]:
+            chunk.task.add_done_callback(self.count_wasted)
+        self.chunks_wasted += len(chunks) - len(confirmed)
+
+        parts = []
+        for chunk in confirmed:
+            translation, used = await chunk.task
+            self.chunks_confirmed += 1
+            self.confirmed_tokens += used
+            parts.append(translation)
+
+        tail = " ".join(tokens[position:]).strip()
+        if tail and any(norms[position:]):
+            translation, _ = await self.translate(tail)
+            parts.append(translation)
+        elif confirmed:
+            self.finals_fully_speculated += 1
+
+        return " ".join(parts)
+
+    @staticmethod
+    def match_chunk(words: List[str], norms: List[str], position: int):
+        """Match chunk words against the final's normalized tokens from position"""
+        i = position
+        for word in words:
+            while i < len(norms) and not norms[i]:
+                i += 1
+            if i >= len(norms) or norms[i] != word:
+                return False, position
+            i += 1
+        return True, i
+
+    def count_wasted(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is None:
+            self.wasted_tokens += task.result()[1]
+
+    def get_metrics(self) -> dict:
+        resolved = self.chunks_confirmed + self.chunks_wasted
+        return {
+            "enabled": self.policy.enabled,
+            "partials_seen": self.partials_seen,
+            "chunks_started": self.chunks_started,
+            "chunks_confirmed": self.chunks_confirmed,
+            "chunks_wasted": self.chunks_wasted,
+            "hit_rate": round(self.chunks_confirmed / resolved, 3) if resolved else 0.0,
+            "confirmed_tokens": self.confirmed_tokens,
+            "wasted_tokens": self.wasted_tokens,
+            "finals": self.finals,
+            "finals_fully_speculated": self.finals_fully_speculated,
+        }
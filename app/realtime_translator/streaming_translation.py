@@ -0,0 +1,76 @@
+import logging
+from typing import AsyncIterator, List
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_ENDINGS = ".!?…"
+
+# Lowercased words ending with a period that don't end a sentence
+ABBREVIATIONS = {"e.g.", "i.e.", "etc.", "vs.", "mr.", "mrs.", "ms.", "dr.", "st.", "no.", "approx."}
+
+
+async def iter_completion_text(stream) -> AsyncIterator[str]:
+    """Text deltas of a streamed chat completion (chunks without content are skipped)"""
+    async for chunk in stream:
+        # Azure sends a first chunk with content filter results and no choices
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+class SentenceSplitter:
+    """Cuts a stream of text deltas into complete sentences.
+
+    A sentence ends at one of SENTENCE_ENDINGS followed by whitespace, so
+    "3.5" or "v1.2" are not cut, and known abbreviations are skipped. Sentences
+    shorter than min_chars are joined with the next one to avoid TTS requests
+    for a lone "Yes.".
+    """
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self.buffer = ""
+        # Buffer position up to which sentence ends were already searched
+        self.scanned = 0
+
+    def feed(self, delta: str) -> List[str]:
+        """Add a text delta; returns the sentences it completed"""
+        self.buffer += delta
+        sentences = []
+        start = 0
+        # The last character can't be checked until the next one arrives
+        for i in range(max(self.scanned, 1), len(self.buffer)):
+            if not self.buffer[i].isspace() or self.buffer[i - 1] not in SENTENCE_ENDINGS:
+                continue
+            candidate = self.buffer[start:i].strip()
+            if len(candidate) < self.min_chars or self.ends_with_abbreviation(candidate):
+                continue
+            sentences.append(candidate)
+            start = i + 1
+
+        self.buffer = self.buffer[start:]
+        self.scanned = len(self.buffer)
+        return sentences
+
+    def flush(self) -> str:
+        """Return whatever is left once the stream has ended"""
+        tail = self.buffer.strip()
+        self.buffer = ""
+        self.scanned = 0
+        return tail
+
+    @staticmethod
+    def ends_with_abbreviation(text: str) -> bool:
+        return text.rsplit(None, 1)[-1].lower() in ABBREVIATIONS
+
+    @classmethod
+    def split(cls, text: str, min_chars: int = 20) -> List[str]:
+        """Split a complete text into sentences"""
+        splitter = cls(min_chars)
+        sentences = splitter.feed(text + " ")
+        tail = splitter.flush()
+        if tail:
+            sentences.append(tail)
+        return sentences
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from app.realtime_translator.pipeline import Utterance
+from app.realtime_translator.settings import validate_update
+
+logger = logging.getLogger(__name__)
+
+# Words that open a fragment continuing the previous sentence, even when the
+# recognizer closed that one with a period
+CONTINUATION_WORDS = frozenset("""
+и а но или что чтобы который которая которые которое потому поэтому если когда где как
+так то тоже также либо ни да же ли в во на с со к ко по за из от до для про о об при без
+and but or so that which who whom whose because if when where while than as to of for
+with in on at by from about into then also
+""".split())
+
+
+def is_continuation(text: str) -> bool:
+    """Whether a fragment reads as the rest of the previous sentence"""
+    words = text.split()
+    if not words:
+        return False
+    first = words[0].strip('",«»()—-–')
+    return bool(first) and (first[0].islower() or first.lower() in CONTINUATION_WORDS)
+
+
+class AggregationPolicy:
+    """When consecutive recognized fragments of one speaker are merged"""
+
+    FIELDS = (
+        "enabled",
+        "pause_ms",
+        "max_wait_ms",
+        "max_chars",
+        "sentence_endings",
+    )
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        pause_ms: int = 700,
+        max_wait_ms: int = 1500,
+        max_chars: int = 300,
+        sentence_endings: str = ".!?…"
+    ):
+        self.enabled = enabled
+        # A merged utterance is flushed when no fragment followed for pause_ms,
+        self.pause_ms = pause_ms
+        # at the latest max_wait_ms after its first fragment,
+        self.max_wait_ms = max_wait_ms
+        # or as soon as it reaches max_chars
+        self.max_chars = max_chars
+        # Recognizers end almost every final result with one of these, so a
+        # sentence ending only counts when the next fragment doesn't continue it
+        self.sentence_endings = sentence_endings
+
+    def update(self, **values):
+        """Update policy from a dict (e.g. a JSON request body); nothing changes if a value is invalid"""
+        for key, value in validate_update(self, values, "aggregation").items():
+            setattr(self, key, value)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+
+class PendingUtterance:
+    """Fragments of one speaker waiting to be merged"""
+
+    def __init__(self, utterance: Utterance):
+        self.utterance = utterance
+        self.arrivals = [time.monotonic()]
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.pause_timer: Optional[asyncio.TimerHandle] = None
+
+    def cancel_timers(self):
+        for timer in (self.timer, self.pause_timer):
+            if timer:
+                timer.cancel()
+
+
+class UtteranceAggregator:
+    """Merges short recognized fragments of the same speaker before translation.
+
+    Fragments are buffered per speaker and emitted to on_utterance as one
+    utterance when the speaker pauses for pause_ms, the text reaches max_chars,
+    or max_wait_ms has passed since the first fragment. A fragment that starts
+    a new sentence after one that ended a sentence flushes the buffer first;
+    one that continues it ("...на рынке. И в Европе") is merged. The merged
+    utterance keeps the first fragment's recognized_at, so the pipeline latency
+    budget includes the time spent here.
+    """
+
+    def __init__(self, on_utterance: Callable[[Utterance], None], policy: Optional[AggregationPolicy] = None):
+        self.on_utterance = on_utterance
+        self.policy = policy or AggregationPolicy()
+        self.pending: Dict[str, PendingUtterance] = {}
+
+        # Metrics
+        self.fragments_in = 0
+        self.fragments_out = 0
+        self.utterances_out = 0
+        self.total_added_latency_s = 0.0
+        self.max_added_latency_s = 0.0
+
+    def add(self, utterance: Utterance):
+        """Add a recognized fragment (called on the event loop)"""
+        self.fragments_in += 1
+
+        if not self.policy.enabled:
+            self.emit(PendingUtterance(utterance))
+            return
+
+        speaker_id = utterance.speaker_id
+        pending = self.pending.get(speaker_id)
+        if pending and bool(pending.utterance.translation_tasks) != bool(utterance.translation_tasks):
+            # Don't mix pre-translated and untranslated fragments
+            self.flush(speaker_id)
+            pending = None
+        if pending and self.ends_sentence(pending.utterance.text) and not is_continuation(utterance.text):
+            # The sentence really ended there
+            self.flush(speaker_id)
+            pending = None
+
+        loop = asyncio.get_running_loop()
+        if pending:
+            pending.utterance.text = f"{pending.utterance.text} {utterance.text}"
+            pending.utterance.parts += utterance.parts
+            pending.utterance.translation_tasks.extend(utterance.translation_tasks)
+            pending.arrivals.append(time.monotonic())
+            pending.pause_timer.cancel()
+        else:
+            pending = self.pending[speaker_id] = PendingUtterance(utterance)
+            pending.timer = loop.call_later(self.policy.max_wait_ms / 1000, self.flush, speaker_id)
+        pending.pause_timer = loop.call_later(self.policy.pause_ms / 1000, self.flush, speaker_id)
+
+        if len(pending.utterance.text.rstrip()) >= self.policy.max_chars:
+            self.flush(speaker_id)
+
+    def ends_sentence(self, text: str) -> bool:
+        return text.rstrip().endswith(tuple(self.policy.sentence_endings))
+
+    def flush(self, speaker_id: str):
+        """Emit whatever a speaker has buffered"""
+        pending = self.pending.pop(speaker_id, None)
+        if pending:
+            pending.cancel_timers()
+            self.emit(pending)
+
+    def emit(self, pending: PendingUtterance):
+        now = time.monotonic()
+        added = [now - arrival for arrival in pending.arrivals]
+        self.total_added_latency_s += sum(added)
+        self.max_added_latency_s = max(self.max_added_latency_s, max(added))
+        self.fragments_out += len(added)
+        self.utterances_out += 1
+
+        if len(pending.arrivals) > 1:
+            logger.info(
+                f"🧩 Merged {len(pending.arrivals)} fragments from {pending.utterance.speaker_id} "
+                f"(+{max(added) * 1000:.0f} ms)"
+            )
+        self.on_utterance(pending.utterance)
+
+    def get_metrics(self) -> dict:
+        """Requests saved by merging next to the latency it added"""
+        return {
+            "policy": self.policy.to_dict(),
+            "fragments_in": self.fragments_in,
+            "utterances_out": self.utterances_out,
+            "requests_saved": self.fragments_out - self.utterances_out,
+            "avg_added_latency_ms": round(1000 * self.total_added_latency_s / self.fragments_out, 1)
+            if self.fragments_out else 0.0,
+            "max_added_latency_ms": round(1000 * self.max_added_latency_s, 1),
+            "pending_speakers": len(self.pending),
+        }
+
+    def stop(self):
+        """Flush every speaker's buffered fragments"""
+        for speaker_id in list(self.pending):
+            self.flush(speaker_id)
@@ -0,0 +1,210 @@
+import logging
+from collections import deque
+from typing import Callable, Dict
+
+import numpy as np
+
+from app.realtime_translator.settings import validate_update
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+class VADSettings:
+    """Voice activity thresholds for one meeting session"""
+
+    FIELDS = (
+        "energy_threshold_db",
+        "loud_threshold_db",
+        "max_zero_crossing_rate",
+        "use_spectral_flatness",
+        "max_spectral_flatness",
+        "window_ms",
+        "min_speech_ratio",
+        "preroll_ms",
+        "hangover_ms",
+    )
+
+    def __init__(
+        self,
+        energy_threshold_db: float = -45.0,
+        loud_threshold_db: float = -30.0,
+        max_zero_crossing_rate: float = 0.25,
+        use_spectral_flatness: bool = False,
+        max_spectral_flatness: float = 0.5,
+        window_ms: int = 20,
+        min_speech_ratio: float = 0.2,
+        preroll_ms: int = 300,
+        hangover_ms: int = 800
+    ):
+        # A window is speech if it is above energy_threshold_db and looks voiced
+        # (low zero-crossing rate, and low spectral flatness when enabled), or if
+        # it is simply louder than loud_threshold_db
+        self.energy_threshold_db = energy_threshold_db
+        self.loud_threshold_db = loud_threshold_db
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.use_spectral_flatness = use_spectral_flatness
+        self.max_spectral_flatness = max_spectral_flatness
+        self.window_ms = window_ms
+        # A frame is speech if at least this share of its windows is speech
+        self.min_speech_ratio = min_speech_ratio
+        # Audio kept before speech onset and after the last speech frame. The
+        # hangover should exceed the recognizer's segmentation silence timeout,
+        # so Azure still sees the trailing silence that ends a phrase.
+        self.preroll_ms = preroll_ms
+        self.hangover_ms = hangover_ms
+
+    def update(self, **values):
+        """Update thresholds from a dict (e.g. a JSON request body); nothing changes if a value is invalid"""
+        for key, value in validate_update(self, values, "VAD").items():
+            setattr(self, key, value)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+
+def classify_windows(samples: np.ndarray, settings: VADSettings) -> np.ndarray:
+    """Vectorized speech/non-speech decision for every window of an int16 frame"""
+    window = SAMPLE_RATE * settings.window_ms // 1000
+    count = len(samples) // window
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+
+    x = samples[:count * window].reshape(count, window).astype(np.float32) / 32768.0
+
+    # Energy (dBFS)
+    power = np.mean(x * x, axis=1)
+    energy_db = 10.0 * np.log10(power + 1e-10)
+
+    # Zero-crossing rate
+    signs = np.signbit(x)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (window - 1)
+
+    voiced = (energy_db > settings.energy_threshold_db) & (zcr < settings.max_zero_crossing_rate)
+
+    if settings.use_spectral_flatness:
+        spectrum = np.abs(np.fft.rfft(x, axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(spectrum), axis=1)) / np.mean(spectrum, axis=1)
+        voiced &= flatness < settings.max_spectral_flatness
+
+    return voiced | (energy_db > settings.loud_threshold_db)
+
+
+class VoiceActivityGate:
+    """Stops forwarding long silences of one audio stream.
+
+    Frames are held in a pre-roll buffer while there is no speech; on speech
+    onset the pre-roll is released first, and forwarding continues for
+    hangover_ms after the last speech frame so words are not clipped.
+    """
+
+    def __init__(self, settings: VADSettings):
+        self.settings = settings
+        self.preroll = deque()
+        self.preroll_bytes = 0
+        self.hangover_left_ms = 0.0
+        self.in_speech = False
+
+        # Stats
+        self.total_ms = 0.0
+        self.forwarded_ms = 0.0
+
+    def process(self, frame: bytes) -> list:
+        """Return the frames that should be forwarded to the recognizer"""
+        samples = np.frombuffer(frame, dtype='<i2', count=len(frame) // 2)
+        frame_ms = len(samples) * 1000 / SAMPLE_RATE
+        self.total_ms += frame_ms
+
+        windows = classify_windows(samples, self.settings)
+        if len(windows):
+            is_speech = windows.mean() >= self.settings.min_speech_ratio
+        else:
+            # Too short to classify (flushed tail): keep the current state
+            is_speech = self.in_speech
+
+        if is_speech:
+            self.hangover_left_ms = self.settings.hangover_ms
+            out = list(self.preroll)
+            self.forwarded_ms += self.preroll_bytes * 1000 / (SAMPLE_RATE * 2)
+            self.preroll.clear()
+            self.preroll_bytes = 0
+            out.append(frame)
+            self.forwarded_ms += frame_ms
+            self.in_speech = True
+            return out
+
+        if self.hangover_left_ms > 0:
+            self.hangover_left_ms -= frame_ms
+            self.forwarded_ms += frame_ms
+            return [frame]
+
+        # Silence: keep the most recent preroll_ms only
+        self.in_speech = False
+        self.preroll.append(frame)
+        self.preroll_bytes += len(frame)
+        max_bytes = SAMPLE_RATE * 2 * self.settings.preroll_ms // 1000
+        while self.preroll and self.preroll_bytes - len(self.preroll[0]) >= max_bytes:
+            self.preroll_bytes -= len(self.preroll.popleft())
+        return []
+
+    @property
+    def suppressed_ms(self) -> float:
+        # Frames still waiting in the pre-roll are not counted as suppressed yet
+        pending_ms = self.preroll_bytes * 1000 / (SAMPLE_RATE * 2)
+        return max(0.0, self.total_ms - self.forwarded_ms - pending_ms)
+
+
+class SessionVoiceGate:
+    """Per-participant voice activity gates sharing one session's thresholds.
+
+    Takes frames via write_audio(participant_id, frame) and forwards only the
+    speech (plus pre-roll and hangover) to on_audio(participant_id, frame).
+    """
+
+    def __init__(self, on_audio: Callable[[str, bytes], None], settings: VADSettings = None, enabled: bool = True):
+        self.on_audio = on_audio
+        self.settings = settings or VADSettings()
+        self.enabled = enabled
+        self.gates: Dict[str, VoiceActivityGate] = {}
+        # Audio of participants whose gates were removed, for the meeting totals
+        self.removed_total_ms = 0.0
+        self.removed_suppressed_ms = 0.0
+
+    def write_audio(self, participant_id: str, frame: bytes):
+        if not self.enabled:
+            self.on_audio(participant_id, frame)
+            return
+
+        gate = self.gates.get(participant_id)
+        if gate is None:
+            gate = self.gates[participant_id] = VoiceActivityGate(self.settings)
+
+        for chunk in gate.process(frame):
+            self.on_audio(participant_id, chunk)
+
+    def remove(self, participant_id: str):
+        """Forget a participant's gate, keeping their audio in the meeting totals"""
+        gate = self.gates.pop(participant_id, None)
+        if gate:
+            self.removed_total_ms += gate.total_ms
+            self.removed_suppressed_ms += gate.suppressed_ms
+
+    def get_metrics(self) -> dict:
+        """Suppressed audio per participant and for the whole meeting"""
+        total_ms = self.removed_total_ms + sum(g.total_ms for g in self.gates.values())
+        suppressed_ms = self.removed_suppressed_ms + sum(g.suppressed_ms for g in self.gates.values())
+        return {
+            "enabled": self.enabled,
+            "settings": self.settings.to_dict(),
+            "audio_s": round(total_ms / 1000, 1),
+            "suppressed_s": round(suppressed_ms / 1000, 1),
+            "suppressed_percent": round(100 * suppressed_ms / total_ms, 1) if total_ms else 0.0,
+            "participants": {
+                participant_id: {
+                    "in_speech": gate.in_speech,
+                    "suppressed_percent": round(100 * gate.suppressed_ms / gate.total_ms, 1) if gate.total_ms else 0.0,
+                }
+                for participant_id, gate in self.gates.items()
+            },
+        }
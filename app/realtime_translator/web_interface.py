@@ -271,11 +271,12 @@ class WebInterface:
             ws.onmessage = (e) => {
                 const data = JSON.parse(e.data);
                 if (data.type === 'translation') addTranslation(data);
+                else if (data.type === 'translation_delta') addDelta(data);
                 else if (data.type === 'system') addSystem(data.message);
             };
         }
         
-        function addTranslation(data) {
+        function createMessage(data, translation) {
             const empty = content.querySelector('.empty');
             if (empty) empty.remove();
             
@@ -287,9 +288,31 @@ class WebInterface:
                     <span class="timestamp">${new Date().toLocaleTimeString()}</span>
                 </div>
                 <div class="original">🇷🇺 ${esc(data.original)}</div>
-                <div class="translation">🇬🇧 ${esc(data.translation)}</div>
+                <div class="translation">🇬🇧 <span class="translation-text">${esc(translation)}</span></div>
             `;
             content.appendChild(div);
+            return div;
+        }
+        
+        function addDelta(data) {
+            // Streamed translation: grow the message until the final one arrives
+            let div = document.getElementById('utterance-' + data.utterance_id);
+            if (!div) {
+                div = createMessage(data, '');
+                div.id = 'utterance-' + data.utterance_id;
+            }
+            div.querySelector('.translation-text').textContent += data.delta;
+            content.scrollTop = content.scrollHeight;
+        }
+        
+        function addTranslation(data) {
+            const streamed = document.getElementById('utterance-' + data.utterance_id);
+            if (streamed) {
+                streamed.querySelector('.translation-text').textContent = data.translation;
+                streamed.removeAttribute('id');
+            } else {
+                createMessage(data, data.translation);
+            }
             content.scrollTop = content.scrollHeight;
             
             if (audioEnabled && 'speechSynthesis' in window) {
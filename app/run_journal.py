@@ -0,0 +1,120 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*parts: Union[str, Path, bytes, None]) -> str:
+    """Hash of a stage's inputs: file contents for existing paths, the values themselves otherwise.
+
+    A directory (e.g. a segment store) is hashed by the names and contents of its files.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (str, Path)) and str(part) and os.path.isfile(part):
+            with open(part, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        elif isinstance(part, (str, Path)) and str(part) and os.path.isdir(part):
+            for path in sorted(Path(part).rglob('*')):
+                if path.is_file():
+                    digest.update(path.relative_to(part).as_posix().encode('utf-8') + b'\0')
+                    digest.update(fingerprint(path).encode('ascii'))
+        elif isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+class RunJournal:
+    """Append-only JSONL journal of the units a long offline stage has finished.
+
+    Every record() is one line, flushed and fsynced before it returns, so a
+    crash loses at most the unit in flight and the file can be read (or tailed)
+    while the job is still running. The first line holds a fingerprint of the
+    stage's inputs; a journal written for other inputs is set aside instead of
+    being resumed. A torn last line from a crash is ignored.
+    """
+
+    def __init__(self, path: Union[str, Path], fingerprint: str = ""):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Any] = {}
+        self.resumed = 0
+
+        if self.path.exists():
+            self.load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not self.path.exists()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if fresh:
+            self.write({"_journal": 1, "fingerprint": self.fingerprint})
+
+    def load(self):
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                # Drop the torn line so the next record starts on a line of its own
+                data = data[:data.rfind(b"\n") + 1]
+                f.truncate(len(data))
+        lines = data.decode('utf-8').splitlines()
+
+        header = self.parse(lines[0]) if lines else None
+        if not header or header.get("fingerprint") != self.fingerprint:
+            stale = self.path.with_name(self.path.name + '.stale')
+            os.replace(self.path, stale)
+            logger.warning(f"📓 {self.path.name} was written for other inputs, moved to {stale.name}")
+            return
+
+        for line in lines[1:]:
+            record = self.parse(line)
+            if record and "key" in record:
+                self.entries[record["key"]] = record.get("value")
+        self.resumed = len(self.entries)
+        if self.resumed:
+            logger.info(f"📓 Resuming from {self.path.name}: {self.resumed} units already done")
+
+    @staticmethod
+    def parse(line: str) -> Optional[dict]:
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def write(self, record: dict):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def record(self, key, value: Any = None):
+        """Mark a unit done (keys are stored as strings)"""
+        key = str(key)
+        self.entries[key] = value
+        self.write({"key": key, "value": value})
+
+    def get(self, key, default: Any = None) -> Any:
+        return self.entries.get(str(key), default)
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def values(self) -> Iterable[Any]:
+        return self.entries.values()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def finish(self):
+        """The stage's output is written: the journal is no longer needed"""
+        self.close()
+        self.path.unlink(missing_ok=True)
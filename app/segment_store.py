@@ -0,0 +1,325 @@
+import json
+import logging
+import os
+import shutil
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORE_SUFFIX = '.segments'
+
+# Numeric per-word fields of Azure's detailed results the word table can hold;
+# words with any other field (or a mix of fields) become a plain JSON column
+WORD_FIELDS = {'Offset': '<i8', 'Duration': '<i8', 'Confidence': '<f8'}
+
+# Repetitive string columns (speaker, gender) with at most this many distinct values are dictionary-encoded
+MAX_CATEGORIES = 256
+
+
+def is_segment_store(path: Union[str, Path]) -> bool:
+    return (Path(path) / 'meta.json').is_file()
+
+
+def load_transcript(path: Union[str, Path]) -> dict:
+    """Contents of a transcription/translation file, JSON or segment store alike.
+
+    For a store the segments are a SegmentStore: a sequence of read-only
+    SegmentView mappings whose fields are read from the columns on access.
+    """
+    if is_segment_store(path):
+        return SegmentStore(path).data()
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_transcript(path: Union[str, Path], data: dict):
+    """Write a transcription/translation file: a segment store if path ends with STORE_SUFFIX, JSON otherwise.
+
+    What is at path is replaced, never written through (it may be a hard link
+    into the artifact store).
+    """
+    path = Path(path)
+    if path.suffix == STORE_SUFFIX:
+        SegmentStore.write(path, data)
+        return
+    path.unlink(missing_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+class TextColumn:
+    """Strings as one memory-mapped UTF-8 blob plus an offsets array"""
+
+    def __init__(self, root: Path, name: str):
+        self.offsets = np.load(root / f"{name}.offsets.npy", mmap_mode='r')
+        blob = root / f"{name}.utf8"
+        # np.memmap can't map an empty file
+        self.blob = np.memmap(blob, dtype=np.uint8, mode='r') if blob.stat().st_size else np.zeros(0, np.uint8)
+
+    def __getitem__(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    @staticmethod
+    def write(root: Path, name: str, values: Sequence[str]):
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        np.save(root / f"{name}.offsets.npy", offsets)
+        with open(root / f"{name}.utf8", 'wb') as f:
+            f.write(b''.join(encoded))
+
+
+class SegmentView(Mapping):
+    """One segment of a SegmentStore, read lazily from its columns (dict(view) copies it)"""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: 'SegmentStore', index: int):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self.store.value(key, self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self.store.keys if self.store.has(key, self.index))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"SegmentView({self.index}, {dict(self)!r})"
+
+
+class SegmentStore:
+    """Columnar on-disk form of a transcript's segments (a directory, conventionally *.segments).
+
+    Timing and confidence are numeric arrays, speaker and gender small
+    dictionary-encoded codes, texts UTF-8 blobs with offsets, and all words
+    of all segments one memory-mapped table indexed by segment. Opening a
+    store reads meta.json only; columns are mapped and decoded on access,
+    so a multi-hour transcript loads in milliseconds and only the pages a
+    stage touches count towards its memory.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.root = Path(path)
+        with open(self.root / 'meta.json', 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.count = self.meta['count']
+        self.columns = {column['name']: column for column in self.meta['columns']}
+        self.keys = self.meta['keys']
+        self._loaded: Dict[str, Any] = {}
+
+    def column(self, name: str):
+        """Mapped data of a column (loaded on first use)"""
+        if name not in self._loaded:
+            kind = self.columns[name]['kind']
+            file_name = self.columns[name]['file']
+            if kind in ('text', 'json'):
+                self._loaded[name] = TextColumn(self.root, file_name)
+            elif kind == 'words':
+                self._loaded[name] = (
+                    np.load(self.root / f"{file_name}.npy", mmap_mode='r'),
+                    np.load(self.root / f"{file_name}.index.npy", mmap_mode='r'),
+                    TextColumn(self.root, file_name),
+                )
+            else:
+                self._loaded[name] = np.load(self.root / f"{file_name}.npy", mmap_mode='r')
+            if self.columns[name].get('optional'):
+                self._loaded[name + '/present'] = np.load(self.root / f"{file_name}.present.npy", mmap_mode='r')
+        return self._loaded[name]
+
+    def has(self, key: str, index: int) -> bool:
+        if not self.columns[key].get('optional'):
+            return True
+        self.column(key)
+        return bool(self._loaded[key + '/present'][index])
+
+    def value(self, key: str, index: int) -> Any:
+        if key not in self.columns or not self.has(key, index):
+            raise KeyError(key)
+        column = self.columns[key]
+        data = self.column(key)
+        kind = column['kind']
+        if kind == 'int':
+            return int(data[index])
+        if kind == 'float':
+            return float(data[index])
+        if kind == 'bool':
+            return bool(data[index])
+        if kind == 'category':
+            return column['categories'][data[index]]
+        if kind == 'text':
+            return data[index]
+        if kind == 'json':
+            return json.loads(data[index])
+        words, index_array, text = data
+        first, last = int(index_array[index]), int(index_array[index + 1])
+        fields = column['fields']
+        rows = words[first:last].tolist()
+        return [
+            {field: (text[first + i] if field == 'Word' else row[words.dtype.names.index(field)]) for field in fields}
+            for i, row in enumerate(rows)
+        ]
+
+    def array(self, key: str) -> np.ndarray:
+        """Whole numeric column at once (e.g. all start_ms), without building views"""
+        if self.columns[key]['kind'] not in ('int', 'float', 'bool'):
+            raise TypeError(f"{key} is not a numeric column")
+        return self.column(key)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [SegmentView(self, i) for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return SegmentView(self, index)
+
+    def __iter__(self) -> Iterator[SegmentView]:
+        return (SegmentView(self, i) for i in range(self.count))
+
+    def data(self) -> dict:
+        """The transcript's top-level fields with this store as its segments"""
+        return dict(self.meta['data'], segments=self)
+
+    def to_json(self) -> dict:
+        """Plain JSON form of the transcript (the inverse of write())"""
+        return dict(self.meta['data'], segments=[dict(segment) for segment in self])
+
+    @classmethod
+    def write(cls, path: Union[str, Path], data: dict) -> 'SegmentStore':
+        """Store a transcript dict ({..., "segments": [...]}) at path, replacing what was there"""
+        root = Path(path)
+        building = root.with_name(root.name + '.tmp')
+        shutil.rmtree(building, ignore_errors=True)
+        building.mkdir(parents=True)
+
+        segments = data.get('segments', [])
+        keys: List[str] = []
+        for segment in segments:
+            keys.extend(key for key in segment if key not in keys)
+
+        columns = []
+        for number, key in enumerate(keys):
+            file_name = f"c{number}"
+            present = np.array([key in segment for segment in segments], dtype=bool)
+            values = [segment.get(key) for segment in segments]
+            column = {"name": key, "file": file_name}
+            column.update(cls._write_column(building, file_name, key, values, present))
+            if not present.all():
+                column["optional"] = True
+                np.save(building / f"{file_name}.present.npy", present)
+            columns.append(column)
+
+        meta = {
+            "format": "segment-store",
+            "version": 1,
+            "count": len(segments),
+            "keys": keys,
+            "columns": columns,
+            "data": {key: value for key, value in data.items() if key != 'segments'},
+        }
+        with open(building / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        shutil.rmtree(root, ignore_errors=True)
+        os.replace(building, root)
+        return cls(root)
+
+    @staticmethod
+    def _write_column(root: Path, file_name: str, key: str, values: list, present: np.ndarray) -> dict:
+        """Write one column in the most compact form its values allow; returns its kind (and schema)"""
+        values_present = [value for value, here in zip(values, present) if here]
+        if values_present and all(isinstance(value, bool) for value in values_present):
+            np.save(root / f"{file_name}.npy", np.array([bool(value) for value in values], dtype=bool))
+            return {"kind": 'bool'}
+        if values_present and all(isinstance(value, int) and not isinstance(value, bool) for value in values_present):
+            np.save(root / f"{file_name}.npy", np.array([value or 0 for value in values], dtype=np.int64))
+            return {"kind": 'int'}
+        if values_present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values_present):
+            np.save(root / f"{file_name}.npy", np.array([value or 0.0 for value in values], dtype=np.float64))
+            return {"kind": 'float'}
+        if all(isinstance(value, str) for value in values_present):
+            categories = sorted(set(values_present))
+            if len(categories) <= MAX_CATEGORIES and len(categories) * 2 <= len(values_present):
+                codes = {category: code for code, category in enumerate(categories)}
+                np.save(root / f"{file_name}.npy", np.array([codes.get(value, 0) for value in values], dtype=np.uint8))
+                return {"kind": 'category', "categories": categories}
+            TextColumn.write(root, file_name, [value or '' for value in values])
+            return {"kind": 'text'}
+        fields = word_table_fields(values_present) if key == 'words' else None
+        if fields:
+            words = [word for value in values for word in (value or [])]
+            numeric = [field for field in fields if field != 'Word']
+            table = np.zeros(len(words), dtype=[(field, WORD_FIELDS[field]) for field in numeric])
+            for field in numeric:
+                table[field] = [word[field] for word in words]
+            index = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum([len(value or []) for value in values], out=index[1:])
+            np.save(root / f"{file_name}.npy", table)
+            np.save(root / f"{file_name}.index.npy", index)
+            TextColumn.write(root, file_name, [word['Word'] for word in words])
+            return {"kind": 'words', "fields": fields}
+        TextColumn.write(root, file_name, [json.dumps(value, ensure_ascii=False) for value in values])
+        return {"kind": 'json'}
+
+
+def word_table_fields(values: list):
+    """Field order of the words if every word of every segment has the same table-friendly fields"""
+    fields = None
+    for value in values:
+        if not isinstance(value, list):
+            return None
+        for word in value:
+            if not isinstance(word, dict):
+                return None
+            if fields is None:
+                fields = list(word)
+                if 'Word' not in fields or not set(fields) - {'Word'} <= set(WORD_FIELDS):
+                    return None
+            if list(word) != fields or not isinstance(word['Word'], str) or not all(
+                isinstance(word[field], int if WORD_FIELDS[field] == '<i8' else (int, float))
+                for field in fields if field != 'Word'
+            ):
+                return None
+    return fields
+
+
+def export_json(store_path: Union[str, Path], json_path: Union[str, Path]):
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(SegmentStore(store_path).to_json(), f, ensure_ascii=False, indent=2)
+
+
+def import_json(json_path: Union[str, Path], store_path: Union[str, Path]) -> SegmentStore:
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return SegmentStore.write(store_path, json.load(f))
+
+
+if __name__ == "__main__":
+    usage = (
+        "Usage: python -m app.segment_store import <transcript.json> [store.segments]\n"
+        "       python -m app.segment_store export <store.segments> [transcript.json]"
+    )
+    if len(sys.argv) < 3 or sys.argv[1] not in ('import', 'export'):
+        print(usage)
+        sys.exit(1)
+    source = Path(sys.argv[2])
+    if sys.argv[1] == 'import':
+        target = Path(sys.argv[3]) if len(sys.argv) > 3 else source.with_suffix(STORE_SUFFIX)
+        store = import_json(source, target)
+        print(f"✅ {len(store)} segments → {target}")
+    else:
+        target = Path(sys.argv[3]) if len(sys.argv) > 3 else source.with_suffix('.json')
+        export_json(source, target)
+        print(f"✅ {source} → {target}")
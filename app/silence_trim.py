@@ -0,0 +1,110 @@
+import logging
+import wave
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.chunked_transcription import frame_energies_db
+
+logger = logging.getLogger(__name__)
+
+
+def overall_dbfs(levels_db: np.ndarray) -> float:
+    """Level of the whole file from its frame levels (mean power), like pydub's AudioSegment.dBFS"""
+    if not len(levels_db):
+        return -120.0
+    return float(10 * np.log10(np.mean(np.power(10.0, levels_db.astype(np.float64) / 10))))
+
+
+def find_pauses(levels_db: np.ndarray, frame_ms: int, min_pause_ms: int, threshold_db: float) -> List[Tuple[int, int]]:
+    """Silent stretches of at least min_pause_ms, as (start_ms, end_ms).
+
+    Same rule as pydub's detect_silence, at frame resolution: a window of
+    min_pause_ms is silent when its RMS is under the threshold (so a click
+    inside a long pause doesn't break it), and the pauses are the union of
+    silent windows. Power, window means and the union are cumulative sums;
+    the runs come out of a run-length encoding of the silent mask.
+    """
+    window = max(1, -(-min_pause_ms // frame_ms))
+    if len(levels_db) < window:
+        return []
+    power = np.concatenate(([0.0], np.cumsum(np.power(10.0, levels_db.astype(np.float64) / 10))))
+    window_db = 10 * np.log10(np.maximum((power[window:] - power[:-window]) / window, 1e-12))
+    starts = np.flatnonzero(window_db < threshold_db)
+    if not len(starts):
+        return []
+
+    # Frames covered by any silent window
+    coverage = np.zeros(len(levels_db) + 1, dtype=np.int32)
+    np.add.at(coverage, starts, 1)
+    np.add.at(coverage, starts + window, -1)
+    silent = np.cumsum(coverage[:-1]) > 0
+
+    # Run-length encoding: edges of the silent runs
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], silent, [False])).astype(np.int8)))
+    return [(int(start) * frame_ms, int(end) * frame_ms) for start, end in zip(edges[::2], edges[1::2])]
+
+
+def kept_regions(pauses: List[Tuple[int, int]], duration_ms: float, min_pause_ms: int, keep_silence_ms: int) -> List[Tuple[float, float]]:
+    """Parts of the audio to keep: everything but the pauses, each shortened to its last keep_silence_ms"""
+    regions = []
+    cursor = 0.0
+    for start, end in pauses:
+        if end - start > min_pause_ms:
+            cut_end = max(start, end - keep_silence_ms)
+            if start > cursor:
+                regions.append((cursor, float(start)))
+            cursor = float(cut_end)
+    if duration_ms > cursor:
+        regions.append((cursor, duration_ms))
+    return regions
+
+
+def write_regions(source: Union[str, Path], output: Union[str, Path], regions_ms: List[Tuple[float, float]],
+                  block_frames: int = 1 << 16) -> float:
+    """Copy the regions of a WAV to a new WAV in one streaming pass; returns the output duration in ms"""
+    written = 0
+    with wave.open(str(source), 'rb') as reader, wave.open(str(output), 'wb') as writer:
+        writer.setparams(reader.getparams())
+        rate = reader.getframerate()
+        total = reader.getnframes()
+        for start_ms, end_ms in regions_ms:
+            position = min(total, int(round(start_ms * rate / 1000)))
+            end = min(total, int(round(end_ms * rate / 1000)))
+            reader.setpos(position)
+            while position < end:
+                frames = reader.readframes(min(block_frames, end - position))
+                if not frames:
+                    break
+                writer.writeframes(frames)
+                position += len(frames) // (reader.getsampwidth() * reader.getnchannels())
+                written += len(frames) // (reader.getsampwidth() * reader.getnchannels())
+        return written * 1000 / rate
+
+
+def trim_pauses_numpy(
+    audio_path: Union[str, Path],
+    output_path: Union[str, Path],
+    min_pause_ms: int = 2000,
+    keep_silence_ms: int = 250,
+    silence_threshold_db: Optional[float] = None,
+    frame_ms: int = 10
+) -> dict:
+    """Trim pauses of a 16-bit WAV without loading it: blockwise frame levels, then one copy pass.
+
+    Output matches the pydub implementation (same threshold rule and keep
+    logic) up to frame_ms. Returns what was done, for logging.
+    """
+    levels, duration_ms = frame_energies_db(audio_path, frame_ms)
+    thresh = silence_threshold_db or overall_dbfs(levels) - 18
+    pauses = find_pauses(levels, frame_ms, min_pause_ms, thresh)
+    regions = kept_regions(pauses, duration_ms, min_pause_ms, keep_silence_ms)
+    output_ms = write_regions(audio_path, output_path, regions)
+    logger.info(f"✂️ {len(pauses)} pauses, {duration_ms / 1000:.1f}s → {output_ms / 1000:.1f}s (threshold {thresh:.1f} dBFS)")
+    return {
+        "threshold_db": thresh,
+        "pauses": len(pauses),
+        "input_ms": duration_ms,
+        "output_ms": output_ms,
+    }
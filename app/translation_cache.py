@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a source phrase: case, ё/е, whitespace and final period don't matter"""
+    text = _WHITESPACE.sub(" ", text.casefold().replace("ё", "е")).strip()
+    return text.rstrip(".… ")
+
+
+def prompt_hash(prompt: str) -> str:
+    """Short hash of the system prompt (instructions plus glossary terms)"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class TranslationCache:
+    """Two-tier translation cache: in-process LRU in front of an optional SQLite store.
+
+    Keys combine the normalized source text, the language pair, the model
+    deployment and a hash of the system prompt. The glossary is part of the
+    prompt, so after a glossary edit every old entry simply stops matching:
+    stale translations are never served, whether they are still in memory or
+    on disk. Only successful translations should be put().
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        db_path: Optional[Union[str, Path]] = None,
+        source_language: str = "ru",
+        target_language: str = "en"
+    ):
+        self.max_entries = max_entries
+        self.source_language = source_language
+        self.target_language = target_language
+        self.entries: "OrderedDict[str, str]" = OrderedDict()
+
+        self.db: Optional[sqlite3.Connection] = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, translation TEXT NOT NULL, prompt_hash TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self.db.commit()
+            logger.info(f"🗄️ Translation cache database: {db_path}")
+
+        # Metrics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str, model: Optional[str], prompt: str) -> str:
+        parts = [normalize_text(text), self.source_language, self.target_language, model or "", prompt_hash(prompt)]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, text: str, model: Optional[str], prompt: str) -> Optional[str]:
+        """Cached translation of text, or None"""
+        key = self.key(text, model, prompt)
+
+        translation = self.entries.get(key)
+        if translation is not None:
+            self.entries.move_to_end(key)
+            self.memory_hits += 1
+            return translation
+
+        if self.db:
+            row = self.db.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.remember(key, row[0])
+                self.disk_hits += 1
+                return row[0]
+
+        self.misses += 1
+        return None
+
+    def put(self, text: str, model: Optional[str], prompt: str, translation: str):
+        """Store a successful translation in both tiers"""
+        key = self.key(text, model, prompt)
+        self.remember(key, translation)
+        if self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO translations (key, translation, prompt_hash, created_at) VALUES (?, ?, ?, ?)",
+                (key, translation, prompt_hash(prompt), time.time())
+            )
+            self.db.commit()
+
+    def remember(self, key: str, translation: str):
+        self.entries[key] = translation
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_metrics(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "persistent": self.db is not None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        if self.db:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Seconds to wait if error is an HTTP 429: 0.0 if the server didn't say, None if it isn't a 429"""
+    if getattr(error, "status_code", None) != 429:
+        return None
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        value = headers.get(header)
+        if value:
+            try:
+                return float(value) / scale
+            except ValueError:
+                # HTTP-date form: fall back to our own backoff
+                pass
+    return 0.0
+
+
+class TokenBucket:
+    """Refills continuously at rate_per_minute; holds at most capacity units.
+
+    A request larger than capacity waits for a full bucket and leaves it in
+    debt, which the refill repays before the next request goes out.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or max(1.0, rate_per_minute / 60)
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        # Effective share of the nominal rate (lowered after 429s)
+        self.scale = 1.0
+
+    def refill(self):
+        now = time.monotonic()
+        rate = self.rate_per_minute * self.scale / 60
+        self.available = min(self.capacity, self.available + (now - self.updated) * rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> float:
+        """Wait until amount units are available and take them; returns seconds waited"""
+        needed = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            self.refill()
+            if self.available >= needed:
+                self.available -= amount
+                return waited
+            delay = (needed - self.available) / (self.rate_per_minute * self.scale / 60)
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits of one model deployment.
+
+    After a 429 every caller pauses for the Retry-After delay and the refill
+    rate is cut (multiplicative decrease); each success restores a little of it
+    (additive increase), so the engine settles just below the real quota.
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None, burst_s: float = 1.0):
+        # Azure counts quotas over 10-second windows: a burst of a whole window
+        # on top of the steady refill would send twice the window's quota
+        self.requests = TokenBucket(rpm, max(1.0, rpm * burst_s / 60)) if rpm else None
+        self.tokens = TokenBucket(tpm, tpm * burst_s / 60) if tpm else None
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+        self.min_scale = 0.1
+        self.decrease = 0.7
+        self.increase = 0.02
+
+        # Metrics
+        self.wait_s = 0.0
+        self.throttled = 0
+
+    @property
+    def buckets(self):
+        return [bucket for bucket in (self.requests, self.tokens) if bucket]
+
+    async def acquire(self, tokens: int):
+        """Wait for a request slot and the estimated tokens (callers are served in order)"""
+        async with self.lock:
+            delay = self.blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                self.wait_s += delay
+            if self.requests:
+                self.wait_s += await self.requests.acquire(1)
+            if self.tokens:
+                self.wait_s += await self.tokens.acquire(tokens)
+
+    def throttle(self, delay: float):
+        """Pause everyone for delay seconds and lower the rate"""
+        self.throttled += 1
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        for bucket in self.buckets:
+            bucket.scale = max(self.min_scale, bucket.scale * self.decrease)
+            bucket.available = min(bucket.available, 0.0)
+
+    def recover(self):
+        for bucket in self.buckets:
+            bucket.scale = min(1.0, bucket.scale + self.increase)
+
+    @property
+    def scale(self) -> float:
+        return min((bucket.scale for bucket in self.buckets), default=1.0)
+
+
+class BatchTranslationEngine(Generic[T, R]):
+    """Runs translate(item) over many items with bounded concurrency and rate limits.
+
+    Results come back in input order whatever order the requests finish in.
+    HTTP 429 errors are retried after Retry-After (or exponential backoff with
+    jitter when the header is missing); other exceptions, and 429s past
+    max_retries, go to fallback(item, error) if given, else propagate.
+    """
+
+    def __init__(
+        self,
+        translate: Callable[[T], Awaitable[R]],
+        limiter: Optional[RateLimiter] = None,
+        concurrency: int = 8,
+        max_retries: int = 6,
+        base_backoff_s: float = 1.0,
+        max_backoff_s: float = 60.0,
+        fallback: Optional[Callable[[T, Exception], R]] = None
+    ):
+        self.translate = translate
+        self.limiter = limiter or RateLimiter()
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_backoff_s = base_backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.fallback = fallback
+
+        # Metrics
+        self.requests = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.completed = 0
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff_s, self.base_backoff_s * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run(
+        self,
+        items: List[T],
+        estimate_tokens: Callable[[T], int] = lambda item: 0,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[R]:
+        """Translate all items; returns results in the same order"""
+        results: List[Optional[R]] = [None] * len(items)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def work(index: int, item: T):
+            async with semaphore:
+                results[index] = await self.run_one(item, estimate_tokens(item))
+            self.completed += 1
+            if on_progress:
+                on_progress(self.completed, len(items))
+
+        await asyncio.gather(*(work(i, item) for i, item in enumerate(items)))
+        return results
+
+    async def run_one(self, item: T, tokens: int) -> R:
+        attempt = 0
+        while True:
+            await self.limiter.acquire(tokens)
+            self.requests += 1
+            try:
+                result = await self.translate(item)
+                self.limiter.recover()
+                return result
+            except Exception as e:
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None and attempt < self.max_retries:
+                    self.rate_limited += 1
+                    delay = retry_after or self.backoff(attempt)
+                    logger.warning(f"⏳ Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                    self.limiter.throttle(delay)
+                    attempt += 1
+                    continue
+                self.failed += 1
+                if self.fallback is None:
+                    raise
+                return self.fallback(item, e)
+
+    def get_metrics(self) -> dict:
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+            "limiter_wait_s": round(self.limiter.wait_s, 1),
+            "rate_scale": round(self.limiter.scale, 2),
+        }
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCache:
+    """Content-addressed cache of synthesized audio on disk, bounded by size (LRU).
+
+    Keys hash everything the audio depends on: voice, SSML (or text), prosody
+    rate and output format, so a changed voice or rate never serves old audio.
+    Audio bytes are files under root (written to a temp name, then renamed),
+    and a SQLite index next to them records size and last use. Several
+    processes (step4, the realtime bot) can share one directory: the index is
+    the shared truth, the in-memory copy only avoids a query per lookup.
+    """
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 1 << 30):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(str(self.root / 'index.sqlite'), timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS audio ("
+            "key TEXT PRIMARY KEY, size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.commit()
+        self.index: "OrderedDict[str, int]" = OrderedDict(
+            self.db.execute("SELECT key, size FROM audio ORDER BY last_used").fetchall()
+        )
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(voice: str, content: str, rate: str, output_format: str) -> str:
+        parts = [voice, content, rate, output_format]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.audio"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio for key, or None"""
+        with self.lock:
+            known = key in self.index
+            if not known:
+                # Another process may have added it since we loaded the index
+                row = self.db.execute("SELECT size FROM audio WHERE key = ?", (key,)).fetchone()
+                known = row is not None
+                if known:
+                    self.index[key] = row[0]
+            if known:
+                try:
+                    audio = self.path(key).read_bytes()
+                except OSError:
+                    # Evicted by another process
+                    self.forget(key)
+                    audio = None
+                if audio:
+                    self.index.move_to_end(key)
+                    self.db.execute("UPDATE audio SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self.db.commit()
+                    self.hits += 1
+                    return audio
+            self.misses += 1
+            return None
+
+    def put(self, key: str, audio: bytes):
+        """Store successfully synthesized audio, evicting the least recently used beyond max_bytes"""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp.write_bytes(audio)
+        os.replace(temp, path)
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO audio (key, size, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, len(audio), now, now)
+            )
+            self.db.commit()
+            self.index[key] = len(audio)
+            self.index.move_to_end(key)
+            self.evict()
+
+    def evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM audio").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM audio ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.path(key).unlink(missing_ok=True)
+            self.forget(key)
+            total -= size
+            self.evictions += 1
+
+    def forget(self, key: str):
+        self.db.execute("DELETE FROM audio WHERE key = ?", (key,))
+        self.db.commit()
+        self.index.pop(key, None)
+
+    def get_metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.index),
+            "bytes": sum(self.index.values()),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self.lock:
+            if self.db:
+                self.db.close()
+                self.db = None
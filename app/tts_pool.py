@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SynthesizerPool:
+    """Pre-warmed speech synthesizers per voice, called from dedicated threads.
+
+    create(voice) must return a synthesizer for that voice, ready to speak
+    (connection opened). warm() creates per_voice of them for every voice up
+    front, so no call pays for connection setup. Each synthesizer serves one
+    call at a time, which makes per_voice the concurrency limit of a voice.
+    A synthesizer whose call raised is dropped (dispose(synthesizer) releases
+    its connection) and recreated on its next use.
+
+    run() blocks the calling thread; run_async() waits for a free synthesizer
+    on the event loop and runs the blocking SDK call on the voice's own
+    per_voice threads, so TTS never stalls the loop (and the audio ingest of
+    other meetings), and one busy voice can't take the threads of the others,
+    including voices first used after the pool was created. executor runs
+    the rest (warm-up, cache I/O).
+    """
+
+    def __init__(self, create: Callable[[str], object], voices: Iterable[str] = (), per_voice: int = 2,
+                 dispose: Optional[Callable[[object], None]] = None):
+        self.create = create
+        self.dispose = dispose
+        self.per_voice = per_voice
+        self.idle: Dict[str, queue.Queue] = {}
+        self.executors: Dict[str, ThreadPoolExecutor] = {}
+        self.limits: Dict[str, asyncio.Semaphore] = {}
+        self.lock = threading.Lock()
+        for voice in voices:
+            self.slots(voice)
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts")
+
+        # Metrics
+        self.created = 0
+        self.calls = 0
+        self.waited = 0
+        self.failures = 0
+
+    def slots(self, voice: str) -> queue.Queue:
+        """Queue of the voice's synthesizers; None marks one not created yet"""
+        with self.lock:
+            if voice not in self.idle:
+                self.idle[voice] = queue.Queue()
+                for _ in range(self.per_voice):
+                    self.idle[voice].put(None)
+                self.executors[voice] = ThreadPoolExecutor(
+                    max_workers=self.per_voice,
+                    thread_name_prefix=f"tts-{voice}"
+                )
+            return self.idle[voice]
+
+    def warm(self):
+        """Create (and connect) every synthesizer now instead of on first use (blocking).
+
+        If a creation fails, the slots are left as they were, so the rest are
+        created on first use.
+        """
+        started = time.monotonic()
+        for voice in list(self.idle):
+            slots = self.slots(voice)
+            taken = [slots.get() for _ in range(self.per_voice)]
+            try:
+                for i, synthesizer in enumerate(taken):
+                    if synthesizer is None:
+                        taken[i] = self.new_synthesizer(voice)
+            finally:
+                for synthesizer in taken:
+                    slots.put(synthesizer)
+        logger.info(
+            f"🔊 TTS pool warm: {self.created} synthesizers for {len(self.idle)} voices "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+
+    async def start(self):
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.warm)
+
+    def new_synthesizer(self, voice: str):
+        synthesizer = self.create(voice)
+        self.created += 1
+        return synthesizer
+
+    @contextmanager
+    def lease(self, voice: str):
+        """Exclusive use of one synthesizer of voice (blocks while all of them are busy)"""
+        slots = self.slots(voice)
+        try:
+            synthesizer = slots.get_nowait()
+        except queue.Empty:
+            self.waited += 1
+            synthesizer = slots.get()
+        try:
+            if synthesizer is None:
+                synthesizer = self.new_synthesizer(voice)
+            yield synthesizer
+        except Exception:
+            # The connection may be broken: recreate it on next use
+            self.failures += 1
+            if synthesizer is not None and self.dispose:
+                try:
+                    self.dispose(synthesizer)
+                except Exception as e:
+                    logger.warning(f"Failed to release a dropped synthesizer of {voice}: {e}")
+            synthesizer = None
+            raise
+        finally:
+            slots.put(synthesizer)
+
+    def run(self, voice: str, call: Callable[[object], T]) -> T:
+        """call(synthesizer) with a synthesizer of voice, in the calling thread"""
+        self.calls += 1
+        with self.lease(voice) as synthesizer:
+            return call(synthesizer)
+
+    async def run_async(self, voice: str, call: Callable[[object], T]) -> T:
+        """call(synthesizer) on the voice's threads, at most per_voice at a time per voice"""
+        self.slots(voice)
+        if voice not in self.limits:
+            self.limits[voice] = asyncio.Semaphore(self.per_voice)
+        async with self.limits[voice]:
+            return await asyncio.get_running_loop().run_in_executor(self.executors[voice], self.run, voice, call)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        for executor in self.executors.values():
+            executor.shutdown(wait=False)
+
+    def get_metrics(self) -> dict:
+        return {
+            "voices": len(self.idle),
+            "synthesizers": self.created,
+            "calls": self.calls,
+            "waited": self.waited,
+            "failures": self.failures,
+        }
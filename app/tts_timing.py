@@ -0,0 +1,218 @@
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Priors until a voice has enough observations (English neural voices at rate 0)
+DEFAULT_OFFSET_MS = 300.0
+DEFAULT_MS_PER_CHAR = 62.0
+MIN_OBSERVATIONS = 20
+
+
+def parse_rate(rate: Union[str, float, None]) -> float:
+    """SSML prosody rate as a percentage: "-10%" → -10.0, "" or "default" → 0.0"""
+    if isinstance(rate, (int, float)):
+        return float(rate)
+    rate = (rate or "").strip()
+    if not rate or rate == "default":
+        return 0.0
+    return float(rate.rstrip('%'))
+
+
+def format_rate(percent: float) -> str:
+    return f"{int(round(percent)):+d}%"
+
+
+class DurationModel:
+    """Predicts how long a voice takes to say a text, learned from synthesized audio.
+
+    Per voice, duration at rate 0 is offset + ms_per_char * characters (a
+    least-squares fit of every observation, each scaled back to rate 0 by
+    (1 + rate/100)); a prosody rate of r% divides it by (1 + r/100).
+    Observations are stored in SQLite next to the TTS cache, so the model
+    keeps improving from cache hits and new synthesis alike; until a voice
+    has MIN_OBSERVATIONS it falls back to the pooled fit, then to priors.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path) if path else ':memory:', timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS durations ("
+            "voice TEXT NOT NULL, text_hash TEXT NOT NULL, rate REAL NOT NULL, "
+            "chars INTEGER NOT NULL, duration_ms REAL NOT NULL, PRIMARY KEY (voice, text_hash, rate))"
+        )
+        self.db.commit()
+        self.fits: Dict[Optional[str], Tuple[float, float, int]] = {}
+
+    def observe(self, voice: str, text: str, rate: Union[str, float], duration_ms: float):
+        text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO durations (voice, text_hash, rate, chars, duration_ms) VALUES (?, ?, ?, ?, ?)",
+                (voice, text_hash, parse_rate(rate), len(text), duration_ms)
+            )
+            self.db.commit()
+            self.fits.pop(voice, None)
+            self.fits.pop(None, None)
+
+    def fit(self, voice: Optional[str] = None) -> Tuple[float, float, int]:
+        """(offset_ms, ms_per_char, observations) of a voice, or of all voices with None"""
+        with self.lock:
+            if voice not in self.fits:
+                query = "SELECT chars, rate, duration_ms FROM durations"
+                rows = self.db.execute(query + " WHERE voice = ?", (voice,)).fetchall() if voice else \
+                    self.db.execute(query).fetchall()
+                self.fits[voice] = self.solve(rows)
+            return self.fits[voice]
+
+    @staticmethod
+    def solve(rows: list) -> Tuple[float, float, int]:
+        if len(rows) < MIN_OBSERVATIONS:
+            return DEFAULT_OFFSET_MS, DEFAULT_MS_PER_CHAR, len(rows)
+        chars, rate, duration = np.asarray(rows, dtype=np.float64).T
+        if np.ptp(chars) == 0:
+            return DEFAULT_OFFSET_MS, DEFAULT_MS_PER_CHAR, len(rows)
+        ms_per_char, offset = np.polyfit(chars, duration * (1 + rate / 100), 1)
+        if ms_per_char <= 0:
+            return DEFAULT_OFFSET_MS, DEFAULT_MS_PER_CHAR, len(rows)
+        return max(0.0, float(offset)), float(ms_per_char), len(rows)
+
+    def coefficients(self, voice: Optional[str]) -> Tuple[float, float]:
+        offset, ms_per_char, count = self.fit(voice)
+        if count < MIN_OBSERVATIONS and voice is not None:
+            offset, ms_per_char, _ = self.fit(None)
+        return offset, ms_per_char
+
+    def predict_ms(self, voice: Optional[str], text: str, rate: Union[str, float] = 0.0) -> float:
+        offset, ms_per_char = self.coefficients(voice)
+        return (offset + ms_per_char * len(text)) / (1 + parse_rate(rate) / 100)
+
+    def rate_for(self, voice: Optional[str], text: str, target_ms: float) -> float:
+        """Prosody rate (percent, unbounded) at which the text would take target_ms"""
+        return (self.predict_ms(voice, text) / max(target_ms, 1.0) - 1) * 100
+
+    def get_metrics(self) -> dict:
+        with self.lock:
+            counts = dict(self.db.execute("SELECT voice, COUNT(*) FROM durations GROUP BY voice").fetchall())
+        return {voice: {"observations": count, "fit": self.fit(voice)[:2]} for voice, count in counts.items()}
+
+    def close(self):
+        with self.lock:
+            if self.db:
+                self.db.close()
+                self.db = None
+
+
+class TimingPlanner:
+    """Chooses a start time and a prosody rate per segment so the dub keeps the original timing.
+
+    A segment that fits its slot (end_ms - start) at the preferred rate keeps
+    it (or slows down to fill the slot, no slower than slowest); one that
+    doesn't is sped up just enough, up to fastest. What still doesn't fit is
+    spread over the neighbouring pauses: the segment may start up to
+    max_lead_ms early into the pause before it, and run on into the pause
+    after it, leaving min_gap_ms before the next segment. Only then is the
+    next segment pushed back, and that drift shrinks its slot, so it speeds
+    up to catch up.
+    """
+
+    def __init__(
+        self,
+        model: DurationModel,
+        rate: Union[str, float] = "-10%",
+        fastest: Union[str, float] = "+25%",
+        slowest: Union[str, float, None] = None,
+        min_gap_ms: float = 150,
+        max_lead_ms: float = 500
+    ):
+        self.model = model
+        self.rate = parse_rate(rate)
+        self.fastest = parse_rate(fastest)
+        self.slowest = parse_rate(slowest) if slowest is not None else self.rate
+        self.min_gap_ms = min_gap_ms
+        self.max_lead_ms = max_lead_ms
+        # Predicted end of the last placed segment
+        self.position: Optional[float] = None
+
+    def choose_rate(self, voice: str, text: str, slot_ms: float) -> float:
+        needed = self.model.rate_for(voice, text, slot_ms)
+        if needed > self.rate:
+            # Whole percent up, so the segment fits and the cache key repeats on reruns
+            return min(self.fastest, float(math.ceil(needed)))
+        return max(self.slowest, min(self.rate, float(math.ceil(needed))))
+
+    def plan(self, items: List[dict]) -> List[dict]:
+        """Timing of segments given as dicts with start_ms, end_ms, text and voice (in order).
+
+        Returns one dict per item: start_ms, rate (SSML string), predicted_ms
+        and drift_ms (predicted end minus the original end; positive = late).
+        """
+        self.position = None
+        plans = []
+        for i, item in enumerate(items):
+            next_start = items[i + 1]['start_ms'] if i + 1 < len(items) else None
+            plans.append(self.place(item, next_start))
+        return plans
+
+    def place(self, item: dict, next_start_ms: Optional[float] = None) -> dict:
+        """Timing of the segment after the ones placed so far (a streaming run's plan()).
+
+        Only the next segment's start is needed (None for the last one), so a
+        stream can plan each segment as soon as the next one arrives.
+        """
+        start_ms, end_ms = float(item['start_ms']), float(item['end_ms'])
+        earliest = max(0.0, start_ms - self.max_lead_ms)
+        if self.position is not None:
+            earliest = max(earliest, self.position + self.min_gap_ms)
+        start = max(start_ms, earliest)
+
+        rate = self.choose_rate(item['voice'], item['text'], end_ms - start)
+        predicted = self.model.predict_ms(item['voice'], item['text'], rate)
+
+        # Overflow: borrow from the pause before, then run into the pause after
+        next_start = float(next_start_ms) if next_start_ms is not None else end_ms
+        deadline = max(end_ms, next_start - self.min_gap_ms)
+        if start + predicted > deadline:
+            start = max(earliest, min(start, deadline - predicted))
+
+        self.position = start + predicted
+        return {
+            "start_ms": round(start),
+            "rate": format_rate(rate),
+            "predicted_ms": round(predicted),
+            "drift_ms": round(self.position - end_ms),
+        }
+
+
+class DriftStats:
+    """How far the dubbed segments end from the original ones (positive = late)"""
+
+    def __init__(self):
+        self.drifts: List[float] = []
+
+    def record(self, end_ms: float, actual_end_ms: float):
+        self.drifts.append(actual_end_ms - end_ms)
+
+    def summary(self) -> dict:
+        if not self.drifts:
+            return {"segments": 0}
+        drifts = np.asarray(self.drifts)
+        late = np.abs(drifts)
+        return {
+            "segments": len(drifts),
+            "mean_ms": float(drifts.mean()),
+            "median_abs_ms": float(np.median(late)),
+            "p95_abs_ms": float(np.percentile(late, 95)),
+            "max_late_ms": float(drifts.max()),
+            "final_ms": float(drifts[-1]),
+            "over_1s": int((drifts > 1000).sum()),
+        }
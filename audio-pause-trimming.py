@@ -3,14 +3,16 @@
 Trim pauses longer than N seconds in a video's audio track.
 
 Dependencies:
-  pip install pydub moviepy ffmpeg-python
+  pip install numpy  (default engine)
+  pip install pydub moviepy ffmpeg-python  (--engine pydub)
 
 Requires ffmpeg executable in PATH.
 """
 import argparse
 import subprocess
 from pathlib import Path
-from pydub import AudioSegment, silence
+
+from app.silence_trim import trim_pauses_numpy
 
 def extract_audio(video_path: Path, audio_path: Path) -> None:
     subprocess.run(
@@ -26,7 +28,23 @@ def trim_pauses(
     min_pause_ms: int = 2000,
     keep_silence_ms: int = 250,
     silence_threshold_db: float | None = None,
+    engine: str = "numpy",
 ) -> None:
+    # The NumPy engine streams WAV to WAV; other formats go through pydub
+    if engine == "numpy" and output_path.suffix.lower() == ".wav":
+        trim_pauses_numpy(audio_path, output_path, min_pause_ms, keep_silence_ms, silence_threshold_db)
+    else:
+        trim_pauses_pydub(audio_path, output_path, min_pause_ms, keep_silence_ms, silence_threshold_db)
+
+def trim_pauses_pydub(
+    audio_path: Path,
+    output_path: Path,
+    min_pause_ms: int = 2000,
+    keep_silence_ms: int = 250,
+    silence_threshold_db: float | None = None,
+) -> None:
+    from pydub import AudioSegment, silence
+
     audio = AudioSegment.from_file(audio_path)
     thresh = silence_threshold_db or audio.dBFS - 18
 
@@ -87,6 +105,7 @@ def main():
     parser.add_argument("--min-pause", type=float, default=2.0, help="Minimum pause (seconds) to trim")
     parser.add_argument("--keep", type=float, default=0.25, help="Silence to leave after trimming (seconds)")
     parser.add_argument("--silence-thresh", type=float, default=None, help="Silence threshold in dBFS (override auto)")
+    parser.add_argument("--engine", choices=["numpy", "pydub"], default="numpy", help="Silence detection engine")
     parser.add_argument("--tmp-dir", type=Path, default=Path("tmp"), help="Temporary directory")
     parser.add_argument("--output", type=Path, help="Output video file (default: input_basename_trimmed.mp4)")
     args = parser.parse_args()
@@ -105,6 +124,7 @@ def main():
         min_pause_ms=int(args.min_pause * 1000),
         keep_silence_ms=int(args.keep * 1000),
         silence_threshold_db=args.silence_thresh,
+        engine=args.engine,
     )
     mux_video_with_audio(args.video, audio_trimmed, output_video)
 
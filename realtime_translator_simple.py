@@ -9,9 +9,18 @@ import json
 import azure.cognitiveservices.speech as speechsdk
 import base64
 from datetime import datetime
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.translation_cache import TranslationCache
 
 load_dotenv()
 
+AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY')
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB')
+
 # Glossary
 glossary_path = Path("config/translation_glossary.json")
 glossary = {}
@@ -42,19 +51,28 @@ app = FastAPI()
 
 # Store translations for web display
 translations = []
+translation_cache = TranslationCache(max_entries=TRANSLATION_CACHE_SIZE, db_path=TRANSLATION_CACHE_DB)
 
 async def translate(text: str) -> str:
     glossary_prompt = build_glossary_prompt()
+    system_prompt = f"Translate Russian to English. Remove filler words.\n\n{glossary_prompt}"
+
+    cached = translation_cache.get(text, AZURE_OPENAI_DEPLOYMENT, system_prompt)
+    if cached is not None:
+        return cached
+
     response = await openai_client.chat.completions.create(
-        model=os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY'),
+        model=AZURE_OPENAI_DEPLOYMENT,
         messages=[
-            {"role": "system", "content": f"Translate Russian to English. Remove filler words.\n\n{glossary_prompt}"},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": text}
         ],
         temperature=0.3,
         max_tokens=1000
     )
-    return response.choices[0].message.content.strip()
+    translation = response.choices[0].message.content.strip()
+    translation_cache.put(text, AZURE_OPENAI_DEPLOYMENT, system_prompt, translation)
+    return translation
 
 def synthesize_audio(text: str) -> bytes:
     synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
@@ -3,14 +3,24 @@
 Анализ длительности сегментов: сравнение оригинала и TTS
 """
 
-import json
+import os
 import sys
+from pathlib import Path
 
-def analyze_segment_durations(json_path):
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.segment_store import load_transcript
+from app.tts_timing import DurationModel
+
+def analyze_segment_durations(json_path, tts_cache_dir=None):
     """Analyze which segments are longer/shorter"""
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_transcript(json_path)
+    
+    # Durations learned from synthesized audio in the TTS cache (priors without one)
+    cache_dir = Path(tts_cache_dir or os.getenv('TTS_CACHE_DIR') or Path(json_path).parent / '.tts_cache')
+    model = DurationModel(cache_dir / 'durations.sqlite' if (cache_dir / 'durations.sqlite').exists() else None)
+    rate = os.getenv('TTS_RATE', '-10%')
     
     segments = data.get('segments', [])
     
@@ -25,12 +35,9 @@ def analyze_segment_durations(json_path):
     for seg in segments:
         original_duration = seg['duration_ms']
         
-        # Estimate TTS duration based on word count
+        # Estimate TTS duration at the preferred rate (all voices pooled)
         text = seg['translation']
-        words = len(text.split())
-        
-        # Average speaking rate: ~150 words per minute = 2.5 words/sec = 400ms/word
-        estimated_tts_duration = words * 400
+        estimated_tts_duration = model.predict_ms(None, text, rate)
         
         total_original_ms += original_duration
         total_expected_ms += estimated_tts_duration
@@ -88,7 +95,7 @@ def analyze_segment_durations(json_path):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python analyze_durations.py <translation_json>")
+        print("Usage: python analyze_durations.py <translation_json | translation.segments> [tts_cache_dir]")
         sys.exit(1)
     
-    analyze_segment_durations(sys.argv[1])
+    analyze_segment_durations(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: Recall audio ingest, per-message push vs. ring-buffer frame coalescing
+
+Simulates a meeting with several participants sending 20 ms PCM chunks over the
+Recall WebSocket and reports, for both ingest paths:
+- messages/sec processed
+- SDK write calls per second of audio
+- bytes allocated per second of audio (payload buffers created on the hot path)
+
+The SDK sink is a no-op by default; --sdk-write-us adds a fixed busy-wait per
+push_stream.write call to model the native call overhead of the real SDK.
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.realtime_translator.audio_ingest import AudioIngest, SAMPLE_RATE, BYTES_PER_SAMPLE
+
+
+def build_messages(participants: int, seconds: int, chunk_ms: int):
+    """Build Recall-style JSON audio messages, participants interleaved"""
+    chunk_bytes = SAMPLE_RATE * chunk_ms // 1000 * BYTES_PER_SAMPLE
+    chunks_per_participant = seconds * 1000 // chunk_ms
+    messages = []
+    for i in range(chunks_per_participant):
+        for p in range(participants):
+            payload = base64.b64encode(os.urandom(chunk_bytes)).decode('ascii')
+            messages.append(json.dumps({
+                "event": "audio",
+                "data": {"audio": payload, "participant_id": f"p{p}"}
+            }))
+    return messages
+
+
+def sdk_write_cost(seconds: float):
+    """Busy-wait to model the cost of one SDK write call"""
+    if seconds:
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+
+def run_baseline(messages, sdk_write_s: float = 0.0):
+    """json.loads -> base64.b64decode -> one SDK write per message"""
+    stats = {"writes": 0, "allocated": 0}
+
+    def write(participant_id, data):
+        stats["writes"] += 1
+        sdk_write_cost(sdk_write_s)
+
+    start = time.perf_counter()
+    for message in messages:
+        data = json.loads(message)['data']
+        audio_base64 = data['audio']
+        # b64decode encodes the str to ASCII bytes first, then decodes
+        stats["allocated"] += len(audio_base64)
+        raw_audio = base64.b64decode(audio_base64)
+        stats["allocated"] += len(raw_audio)
+        write(data['participant_id'], raw_audio)
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def run_ingest(messages, frame_ms: int, sdk_write_s: float = 0.0):
+    """json.loads -> AudioIngest ring buffer -> one SDK write per frame"""
+    stats = {"writes": 0, "allocated": 0}
+
+    def write(participant_id, frame):
+        stats["writes"] += 1
+        stats["allocated"] += len(frame)
+        sdk_write_cost(sdk_write_s)
+
+    ingest = AudioIngest(on_frame=write, frame_ms=frame_ms)
+    decode = ingest.decode
+
+    def counting_decode(audio_base64):
+        raw_audio = decode(audio_base64)
+        stats["allocated"] += len(raw_audio)
+        return raw_audio
+
+    ingest.decode = counting_decode
+
+    start = time.perf_counter()
+    for message in messages:
+        data = json.loads(message)['data']
+        ingest.feed_base64(data['participant_id'], data['audio'])
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def measure_peak(fn, *args):
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def report(name, stats, messages, audio_seconds, peak):
+    print(f"\n📊 {name}")
+    print(f"   Messages/sec:            {len(messages) / stats['elapsed']:,.0f}")
+    print(f"   SDK writes per audio-s:  {stats['writes'] / audio_seconds:,.1f}")
+    print(f"   Bytes alloc per audio-s: {stats['allocated'] / audio_seconds:,.0f}")
+    print(f"   Peak traced memory:      {peak / 1024:,.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Recall audio ingest paths")
+    parser.add_argument("--participants", type=int, default=8)
+    parser.add_argument("--seconds", type=int, default=60, help="Audio seconds per participant")
+    parser.add_argument("--chunk-ms", type=int, default=20, help="Duration of one Recall audio message")
+    parser.add_argument("--frame-ms", type=int, default=100, help="Ingest frame size")
+    parser.add_argument("--sdk-write-us", type=float, default=0.0, help="Modelled cost of one SDK write call")
+    args = parser.parse_args()
+    sdk_write_s = args.sdk_write_us / 1e6
+
+    print(f"🔧 Building {args.participants} x {args.seconds}s of {args.chunk_ms} ms messages...")
+    messages = build_messages(args.participants, args.seconds, args.chunk_ms)
+    audio_seconds = args.participants * args.seconds
+
+    baseline = run_baseline(messages, sdk_write_s)
+    ingest = run_ingest(messages, args.frame_ms, sdk_write_s)
+
+    report("Per-message decode + write", baseline, messages, audio_seconds,
+           measure_peak(run_baseline, messages))
+    report(f"Ring buffer, {args.frame_ms} ms frames", ingest, messages, audio_seconds,
+           measure_peak(run_ingest, messages, args.frame_ms))
+
+    print(f"\n⚡ Speedup: {baseline['elapsed'] / ingest['elapsed']:.2f}x, "
+          f"SDK calls: {baseline['writes'] / max(ingest['writes'], 1):.1f}x fewer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pretty-printed transcript JSON vs. columnar segment store
+
+Builds a synthetic translated transcript (default: 3 hours, one segment per
+~4 s of speech with word timings), saves it both ways and reports, for each
+format, in a fresh process:
+- load time (open the file / store)
+- time of a typical stage pass (durations and translations of every segment,
+  as analyze_durations.py and step4 read them)
+- peak RSS of the process
+
+Usage:
+    python bench_segment_store.py [--hours 3] [--keep DIR]
+"""
+
+import argparse
+import json
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.segment_store import SegmentStore
+
+WORDS = ("сегодня мы поговорим о том как устроен конвейер перевода и почему задержка "
+         "зависит от размера пакета запросов и скорости синтеза речи").split()
+
+
+def format_time(ms: float) -> str:
+    seconds = int(ms // 1000)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.{int(ms % 1000):03d}"
+
+
+def build_transcript(hours: float, seed: int = 1) -> dict:
+    """Translated transcript shaped like step3's output"""
+    rng = random.Random(seed)
+    segments = []
+    position_ms = 0.0
+    while position_ms < hours * 3600 * 1000:
+        word_count = rng.randint(4, 30)
+        words = []
+        offset = int(position_ms * 10000)
+        for _ in range(word_count):
+            duration = rng.randint(1500000, 4500000)
+            words.append({"Word": rng.choice(WORDS), "Offset": offset, "Duration": duration})
+            offset += duration + rng.randint(0, 800000)
+        end_ms = offset / 10000
+        text = " ".join(word["Word"] for word in words).capitalize() + "."
+        speaker = f"Guest-{rng.randint(1, 4)}"
+        segments.append({
+            "segment_id": len(segments) + 1,
+            "speaker": speaker,
+            "gender": "female" if speaker in ("Guest-1", "Guest-3") else "male",
+            "start_time": format_time(position_ms),
+            "end_time": format_time(end_ms),
+            "start_ms": position_ms,
+            "end_ms": end_ms,
+            "duration_ms": end_ms - position_ms,
+            "confidence": rng.random(),
+            "original": text,
+            "translation": "Today we will talk about " + " ".join(rng.choice(WORDS) for _ in range(word_count // 2)),
+            "words": words,
+        })
+        position_ms = end_ms + rng.randint(200, 3000)
+    return {
+        "audio_file": "webinar_audio.wav",
+        "language": "ru-RU",
+        "total_segments": len(segments),
+        "segments": segments,
+    }
+
+
+def measure(path: str, fmt: str) -> dict:
+    """Load and scan in this process; run in a child so RSS is per format"""
+    start = time.perf_counter()
+    if fmt == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        data = SegmentStore(path).data()
+    loaded = time.perf_counter()
+
+    total_ms = 0.0
+    characters = 0
+    for segment in data['segments']:
+        total_ms += segment['duration_ms']
+        characters += len(segment['translation'])
+    scanned = time.perf_counter()
+
+    return {
+        "load_s": loaded - start,
+        "scan_s": scanned - loaded,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "checksum": round(total_ms) + characters,
+    }
+
+
+def size_mb(path: Path) -> float:
+    if path.is_dir():
+        return sum(file.stat().st_size for file in path.iterdir()) / 1e6
+    return path.stat().st_size / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=3.0, help="Length of the synthetic recording")
+    parser.add_argument("--keep", help="Write the files to this directory and keep them")
+    parser.add_argument("--measure", nargs=2, metavar=("PATH", "FORMAT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    workdir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="segment_store_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    try:
+        transcript = build_transcript(args.hours)
+        json_path = workdir / "webinar_translated.json"
+        store_path = workdir / "webinar_translated.segments"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(transcript, f, ensure_ascii=False, indent=2)
+        SegmentStore.write(store_path, transcript)
+        words = sum(len(segment["words"]) for segment in transcript["segments"])
+        print(f"{args.hours:g} h synthetic transcript: {transcript['total_segments']} segments, {words} words\n")
+
+        results = {}
+        for fmt, path in (("json", json_path), ("store", store_path)):
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", str(path), fmt],
+                capture_output=True, text=True, check=True
+            ).stdout
+            results[fmt] = dict(json.loads(output), size_mb=size_mb(path))
+        assert results["json"]["checksum"] == results["store"]["checksum"], "formats disagree"
+
+        print(f"{'':<8}{'size MB':>10}{'load s':>10}{'scan s':>10}{'peak RSS MB':>14}")
+        for fmt, result in results.items():
+            print(f"{fmt:<8}{result['size_mb']:>10.1f}{result['load_s']:>10.3f}"
+                  f"{result['scan_s']:>10.3f}{result['peak_rss_mb']:>14.1f}")
+        json_total = results["json"]["load_s"] + results["json"]["scan_s"]
+        store_total = results["store"]["load_s"] + results["store"]["scan_s"]
+        print(f"\nload + scan: {json_total / store_total:.1f}x faster, "
+              f"peak RSS {results['json']['peak_rss_mb'] - results['store']['peak_rss_mb']:.1f} MB lower")
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
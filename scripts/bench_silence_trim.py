@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pause trimming in audio-pause-trimming.py, pydub vs. NumPy engine
+
+Writes a synthetic 16 kHz mono WAV (noise bursts as speech, pauses of
+0.3-6 s, a few clicks inside long pauses) and trims it with both engines,
+each in a fresh process, reporting:
+- wall time and time per hour of audio
+- peak RSS of the process
+- output duration (the engines should agree to within a frame per pause)
+
+pydub's detect_silence scans a min-pause window at every millisecond, so it
+runs on a shorter file by default (--pydub-minutes) and its time is also
+given per hour of audio.
+
+Usage:
+    python bench_silence_trim.py [--hours 2] [--pydub-minutes 10]
+"""
+
+import argparse
+import importlib.util
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+RATE = 16000
+
+
+def write_synthetic_wav(path: Path, seconds: float, seed: int = 1):
+    """Speech-like bursts separated by pauses, written block by block"""
+    rng = np.random.default_rng(seed)
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        written = 0
+        total = int(seconds * RATE)
+        while written < total:
+            speech = int(rng.uniform(1.0, 12.0) * RATE)
+            pause = int(rng.choice([0.3, 0.8, 1.5, 2.5, 4.0, 6.0]) * RATE)
+            burst = rng.normal(0, 3000, speech) * np.sin(np.linspace(0, np.pi * rng.uniform(5, 30), speech)) ** 2
+            gap = rng.normal(0, 30, pause)
+            if pause > 2 * RATE:
+                click = int(rng.integers(0, pause - 80))
+                gap[click:click + 80] += 8000
+            block = np.clip(np.concatenate([burst, gap]), -32768, 32767).astype('<i2')[:total - written]
+            wav.writeframes(block.tobytes())
+            written += len(block)
+
+
+def load_trimmer():
+    spec = importlib.util.spec_from_file_location("audio_pause_trimming", ROOT / 'audio-pause-trimming.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(source: str, engine: str) -> dict:
+    trimmer = load_trimmer()
+    output = Path(source).with_name(f"trimmed_{engine}.wav")
+    start = time.perf_counter()
+    trimmer.trim_pauses(Path(source), output, engine=engine)
+    elapsed = time.perf_counter() - start
+    with wave.open(str(source), 'rb') as wav:
+        input_s = wav.getnframes() / wav.getframerate()
+    with wave.open(str(output), 'rb') as wav:
+        output_s = wav.getnframes() / wav.getframerate()
+    return {
+        "elapsed_s": elapsed,
+        "per_hour_s": elapsed / input_s * 3600,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "input_s": input_s,
+        "output_s": output_s,
+    }
+
+
+def run(source: Path, engine: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", str(source), engine],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=2.0, help="Length of the file for the NumPy engine")
+    parser.add_argument("--pydub-minutes", type=float, default=10.0,
+                        help="Length of the file for pydub (0: use the full --hours file)")
+    parser.add_argument("--measure", nargs=2, metavar=("WAV", "ENGINE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    workdir = Path(tempfile.mkdtemp(prefix="silence_trim_"))
+    try:
+        long_wav = workdir / "long.wav"
+        write_synthetic_wav(long_wav, args.hours * 3600)
+        short_wav = long_wav
+        if args.pydub_minutes:
+            short_wav = workdir / "short.wav"
+            write_synthetic_wav(short_wav, args.pydub_minutes * 60)
+
+        results = [
+            ("numpy", long_wav, run(long_wav, "numpy")),
+            ("numpy", short_wav, run(short_wav, "numpy")),
+            ("pydub", short_wav, run(short_wav, "pydub")),
+        ]
+        if short_wav == long_wav:
+            results.pop(1)
+
+        print(f"{'engine':<8}{'audio':>10}{'time s':>10}{'s / h':>10}{'peak RSS MB':>14}{'output s':>11}")
+        for engine, _, result in results:
+            print(f"{engine:<8}{result['input_s'] / 60:>8.0f}min{result['elapsed_s']:>10.2f}"
+                  f"{result['per_hour_s']:>10.1f}{result['peak_rss_mb']:>14.1f}{result['output_s']:>11.1f}")
+        numpy_short, pydub_short = results[-2][2], results[-1][2]
+        print(f"\nspeedup on the same file: {pydub_short['elapsed_s'] / numpy_short['elapsed_s']:.0f}x, "
+              f"output differs by {abs(pydub_short['output_s'] - numpy_short['output_s']):.2f}s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark: step3 translation, serial loop vs. concurrent rate-limited engine
+
+Starts a local stub of the Azure OpenAI chat completions endpoint, which
+answers after a fixed latency and returns 429 with Retry-After-ms once its
+requests-per-minute quota (enforced per 10-second window, like Azure) is used
+up. JSON-mode batch requests are answered per segment, and usage is reported
+at ~3 characters per token. Then it translates the same transcript three times:
+- serial: one request at a time with the old time.sleep(0.1) between them
+- engine: translate_jobs() with bounded concurrency and the RPM/TPM limiter
+- batched: the same, packing consecutive segments into one request
+
+Usage:
+    python bench_step3_translate.py [transcription.json] [--segments 200] [--latency-ms 800] [--rpm 300]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from openai import AzureOpenAI
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Chat completions stub: fixed latency, per-10s-window request quota"""
+
+    latency_s = 0.8
+    window_quota = 50
+    window_started = 0.0
+    window_requests = 0
+    throttled = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        cls = type(self)
+
+        with cls.lock:
+            now = time.monotonic()
+            if now - cls.window_started >= 10:
+                cls.window_started = now
+                cls.window_requests = 0
+            cls.window_requests += 1
+            over_quota = cls.window_requests > cls.window_quota
+            retry_after_ms = int((cls.window_started + 10 - now) * 1000)
+            if over_quota:
+                cls.throttled += 1
+
+        if over_quota:
+            self.reply(429, {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                       {"Retry-After-ms": str(retry_after_ms), "Retry-After": str(retry_after_ms // 1000 + 1)})
+            return
+
+        time.sleep(cls.latency_s)
+        prompt = body["messages"][-1]["content"]
+        if body.get("response_format"):
+            segments = json.loads(prompt)["segments"]
+            content = json.dumps({"translations": [
+                {"id": segment["id"], "translation": f"EN: {segment['text']}"} for segment in segments
+            ]}, ensure_ascii=False)
+        else:
+            content = f"EN: {prompt}"
+        prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 3
+        completion_tokens = len(content) // 3
+        self.reply(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    @classmethod
+    def new_window(cls):
+        """Start each measured run on a fresh quota window, as a separate job would"""
+        with cls.lock:
+            cls.window_started = time.monotonic()
+            cls.window_requests = 0
+            cls.throttled = 0
+
+    def reply(self, status: int, payload: dict, headers: dict = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    # The engine opens a connection per concurrent request
+    request_queue_size = 128
+
+
+def translate_serial(client, step3, text: str, glossary_context: str) -> str:
+    """The previous step3 request: synchronous, one segment at a time"""
+    try:
+        response = client.chat.completions.create(
+            model=step3.AZURE_OPENAI_DEPLOYMENT,
+            messages=[
+                {"role": "system", "content": step3.build_system_prompt(glossary_context)},
+                {"role": "user", "content": text}
+            ],
+            temperature=0.3,
+            max_tokens=step3.MAX_TOKENS
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        if "content_filter" in str(e) or "ResponsibleAIPolicyViolation" in str(e):
+            return "[CONTENT_FILTERED]"
+        print(f"❌ Translation error: {e}")
+        return "[Translation error]"
+
+
+def load_segments(path: str, count: int):
+    """Segments of a recorded transcript, or synthetic ones"""
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('segments', [])[:count]
+    return [
+        {
+            "speaker": f"Speaker_{i % 2 + 1}",
+            "text": f"Фраза номер {i}: сегодня мы обсуждаем телеграм мини аппс и вебинар.",
+            "end_ms": (i + 1) * 6000
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("transcription", nargs="?", help="Recorded *_transcription.json (default: synthetic)")
+    parser.add_argument("--segments", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--rpm", type=int, default=300, help="Quota enforced by the stub")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=10)
+    args = parser.parse_args()
+
+    StubOpenAIHandler.latency_s = args.latency_ms / 1000
+    StubOpenAIHandler.window_quota = max(1, args.rpm // 6)
+    server = StubServer(("127.0.0.1", 0), StubOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # step3 reads its configuration at import time
+    os.environ.update({
+        "AZURE_OPENAI_KEY": "stub",
+        "AZURE_OPENAI_ENDPOINT": f"http://127.0.0.1:{server.server_port}",
+        "AZURE_OPENAI_DEPLOYMENT_QUALITY": "stub",
+        "AZURE_OPENAI_RPM": str(args.rpm),
+        "TRANSLATION_CACHE_DB": "",
+    })
+    sys.path.insert(0, str(Path(__file__).parent))
+    import step3_translate as step3
+
+    segments = load_segments(args.transcription, args.segments)
+    matcher = step3.GlossaryMatcher(step3.load_glossary())
+    jobs = []
+    for i, segment in enumerate(segments):
+        if segment.get("text"):
+            terms = matcher.find(segment["text"])
+            jobs.append({
+                "index": i,
+                "segment": segment,
+                "text": segment["text"],
+                "terms": terms,
+                "system_prompt": step3.build_system_prompt(step3.build_glossary_context(matcher, terms))
+            })
+    hours = max(segment.get("end_ms", 0) for segment in segments) / 3_600_000
+    print(f"Segments: {len(jobs)}, stub latency {args.latency_ms:.0f} ms, quota {args.rpm} RPM\n")
+
+    # Serial: the previous step3 loop
+    client = AzureOpenAI(
+        api_key="stub",
+        api_version=step3.AZURE_OPENAI_API_VERSION,
+        azure_endpoint=os.environ["AZURE_OPENAI_ENDPOINT"]
+    )
+    StubOpenAIHandler.new_window()
+    started = time.monotonic()
+    serial = []
+    for job in jobs:
+        glossary_context = step3.build_glossary_context(matcher, job["terms"])
+        serial.append(translate_serial(client, step3, job["text"], glossary_context))
+        time.sleep(0.1)
+    serial_s = time.monotonic() - started
+    serial_throttled = StubOpenAIHandler.throttled
+
+    # Concurrent engine, one request per segment, then batched
+    runs = {}
+    for name, batch_size in (("engine", 1), ("batched", args.batch_size)):
+        StubOpenAIHandler.new_window()
+        usage = {}
+        started = time.monotonic()
+        translations = asyncio.run(step3.translate_jobs(
+            jobs, step3.TranslationCache(), matcher,
+            concurrency=args.concurrency, batch_size=batch_size, usage=usage
+        ))
+        runs[name] = (time.monotonic() - started, usage, StubOpenAIHandler.throttled)
+        assert translations == serial, f"{name} output differs from the serial path"
+
+    print(f"\n{'path':<10}{'wall clock':>12}{'requests':>10}{'prompt tokens':>15}")
+    print(f"{'serial':<10}{serial_s:>11.1f}s{len(jobs):>10}{'':>15}   ({serial_throttled} requests got 429)")
+    for name, (seconds, usage, throttled) in runs.items():
+        print(f"{name:<10}{seconds:>11.1f}s{usage['requests']:>10}{usage['prompt_tokens']:>15}"
+              f"   ({throttled} requests got 429)")
+
+    engine_s, single_usage, _ = runs["engine"]
+    _, batched_usage, _ = runs["batched"]
+    saved = single_usage["prompt_tokens"] - batched_usage["prompt_tokens"]
+    print(f"\nSpeedup: {serial_s / engine_s:.1f}x, output order identical")
+    print(f"Batching saved {saved} prompt tokens ({100 * saved / single_usage['prompt_tokens']:.0f}%), "
+          f"~{saved / hours:,.0f} per hour of content")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
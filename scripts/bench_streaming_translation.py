@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-to-first-audio, whole-response vs. streamed sentence-level translation
+
+Runs long utterances through the realtime pipeline against a stubbed chat
+completions endpoint (fixed time to first token, then a steady token rate)
+and a stubbed TTS (fixed overhead plus time per character). Reports, for both
+modes:
+- time from the final STT result to the first audio sent to Zoom
+- time to the last audio of the utterance
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.realtime_translator.pipeline import PipelinePolicy, RealtimePipeline, Utterance
+from app.realtime_translator.streaming_translation import SentenceSplitter, iter_completion_text
+
+TRANSLATION = (
+    "Today we will look at the quarterly results of the sales department. "
+    "Revenue grew by twelve percent compared to the previous quarter. "
+    "The main driver was the new enterprise contract in the northern region. "
+    "At the same time, operating costs increased because of additional hiring. "
+    "Next, I would like to discuss the plan for the second half of the year."
+)
+
+
+class StubChatCompletions:
+    """Chat completions endpoint stub: first-token latency, then a steady token rate"""
+
+    def __init__(self, first_token_ms: float, token_ms: float):
+        self.first_token_ms = first_token_ms
+        self.token_ms = token_ms
+
+    @staticmethod
+    def tokens(text: str):
+        # Roughly one token per word, with the leading space as GPT emits it
+        words = text.split(" ")
+        return [words[0]] + [" " + w for w in words[1:]]
+
+    async def create(self, model=None, messages=None, stream=False, **kwargs):
+        tokens = self.tokens(TRANSLATION)
+        if not stream:
+            await asyncio.sleep((self.first_token_ms + self.token_ms * len(tokens)) / 1000)
+            message = SimpleNamespace(content=TRANSLATION)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+        return self.stream(tokens)
+
+    async def stream(self, tokens):
+        # Azure's first chunk carries only content filter results
+        yield SimpleNamespace(choices=[])
+        await asyncio.sleep(self.first_token_ms / 1000)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self.token_ms / 1000)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+
+async def run(streaming: bool, args) -> dict:
+    completions = StubChatCompletions(args.first_token_ms, args.token_ms)
+    first_audio = {}
+    last_audio = {}
+
+    async def translate(utterance, model):
+        response = await completions.create(messages=[], stream=False)
+        return response.choices[0].message.content
+
+    async def translate_stream(utterance, model):
+        splitter = SentenceSplitter()
+        stream = await completions.create(messages=[], stream=True)
+        async for delta in iter_completion_text(stream):
+            for sentence in splitter.feed(delta):
+                yield sentence
+        tail = splitter.flush()
+        if tail:
+            yield tail
+
+    async def synthesize(utterance):
+        text = utterance.translation
+        await asyncio.sleep((args.tts_base_ms + args.tts_ms_per_char * len(text)) / 1000)
+        return b"\0" * len(text)
+
+    async def output(utterance):
+        root = utterance.parent or utterance
+        first_audio.setdefault(root.id, root.age)
+        last_audio[root.id] = root.age
+
+    pipeline = RealtimePipeline(
+        translate=translate,
+        synthesize=synthesize,
+        output=output,
+        policy=PipelinePolicy(max_latency_s=60, stream_sentences=streaming),
+        translate_stream=translate_stream
+    )
+
+    def done():
+        translated = pipeline.translate_stage.processed
+        synthesized = pipeline.synthesize_stage.processed
+        expected = pipeline.sentences_streamed if streaming else translated
+        return (translated == pipeline.submitted and synthesized == expected
+                and pipeline.output_stage.processed == synthesized)
+
+    pipeline.start()
+    for _ in range(args.utterances):
+        pipeline.submit(Utterance("...", "Speaker_1", "female", recognized_at=time.monotonic()))
+        # One utterance at a time, so queueing doesn't skew the numbers
+        while not done():
+            await asyncio.sleep(0.005)
+    await pipeline.stop()
+
+    return {
+        "first_audio_s": sum(first_audio.values()) / len(first_audio),
+        "last_audio_s": sum(last_audio.values()) / len(last_audio),
+        "sentences": pipeline.sentences_streamed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=5)
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    parser.add_argument("--token-ms", type=float, default=25)
+    parser.add_argument("--tts-base-ms", type=float, default=150)
+    parser.add_argument("--tts-ms-per-char", type=float, default=3)
+    args = parser.parse_args()
+
+    print(f"Translation: {len(TRANSLATION)} chars, {len(StubChatCompletions.tokens(TRANSLATION))} tokens")
+    print(f"Stub GPT: {args.first_token_ms:.0f} ms to first token, {args.token_ms:.0f} ms/token")
+    print(f"Stub TTS: {args.tts_base_ms:.0f} ms + {args.tts_ms_per_char:.0f} ms/char\n")
+
+    whole = asyncio.run(run(False, args))
+    streamed = asyncio.run(run(True, args))
+
+    print(f"{'mode':<12}{'first audio':>14}{'last audio':>14}")
+    print(f"{'whole':<12}{whole['first_audio_s']:>13.2f}s{whole['last_audio_s']:>13.2f}s")
+    print(f"{'streamed':<12}{streamed['first_audio_s']:>13.2f}s{streamed['last_audio_s']:>13.2f}s")
+    print(f"\nSentences synthesized separately: {streamed['sentences'] // args.utterances} per utterance")
+    print(f"Time-to-first-audio: {whole['first_audio_s'] / streamed['first_audio_s']:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-utterance conversion of TTS audio for the browser player
+
+The realtime bots used to write each synthesized utterance to /tmp and run
+ffmpeg on it (44.1 kHz stereo WAV). Now the synthesizer returns raw 44.1 kHz
+PCM and app.audio_convert builds the WAV in memory. For a few utterance
+lengths this reports, per utterance:
+- ffmpeg path: temp file + ffmpeg subprocess + reading the result back
+  (skipped when ffmpeg is not installed)
+- in-process from 44.1 kHz raw PCM (the requested format: stereo copy only),
+  and how many times faster than the ffmpeg path that is
+- in-process from 16 kHz / 24 kHz RIFF (polyphase resampling), with the
+  SNR of a 440 Hz tone against the exact tone at 44.1 kHz
+
+Usage:
+    python bench_tts_convert.py [--seconds 2 5 10] [--repeat 20] [--ffmpeg /path/to/ffmpeg]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.audio_convert import PLAYBACK_RATE, playback_wav, split_wav, wav_bytes
+
+
+def tone(seconds: float, rate: int) -> np.ndarray:
+    return 10000 * np.sin(2 * np.pi * 440 * np.arange(int(seconds * rate)) / rate)
+
+
+def pcm16(samples: np.ndarray) -> bytes:
+    return np.rint(samples).astype('<i2').tobytes()
+
+
+def timed_ms(call, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def ffmpeg_path(ffmpeg: str, audio: bytes, workdir: Path) -> bytes:
+    """What the handlers did before: raw file, ffmpeg, converted file"""
+    raw_path = workdir / "utterance_raw.wav"
+    audio_path = workdir / "utterance.wav"
+    raw_path.write_bytes(audio)
+    subprocess.run(
+        [ffmpeg, '-i', str(raw_path), '-acodec', 'pcm_s16le', '-ar', '44100', '-ac', '2', '-y', str(audio_path)],
+        capture_output=True, check=True
+    )
+    os.remove(raw_path)
+    return audio_path.read_bytes()
+
+
+def snr_db(wav: bytes, seconds: float) -> float:
+    pcm, rate, channels = split_wav(wav)
+    left = np.frombuffer(pcm, dtype='<i2')[::channels].astype(np.float64)
+    reference = tone(seconds, rate)[:len(left)]
+    edge = rate // 10
+    error = left[edge:-edge] - reference[edge:-edge]
+    return float(10 * np.log10(np.mean(reference[edge:-edge] ** 2) / max(np.mean(error ** 2), 1e-12)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, nargs="+", default=[2.0, 5.0, 10.0], help="Utterance lengths")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (best is reported)")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg binary for the old path")
+    args = parser.parse_args()
+
+    ffmpeg = shutil.which(args.ffmpeg)
+    if not ffmpeg:
+        print(f"{args.ffmpeg} not found: the old path is not measured\n")
+
+    workdir = Path(tempfile.mkdtemp(prefix="tts_convert_"))
+    try:
+        print(f"{'utterance':>10}{'ffmpeg ms':>11}{'44.1k raw ms':>14}{'speedup':>9}{'16k ms':>9}{'24k ms':>9}"
+              f"{'16k SNR dB':>12}{'24k SNR dB':>12}")
+        for seconds in args.seconds:
+            raw = pcm16(tone(seconds, PLAYBACK_RATE))
+            riff_16k = wav_bytes(pcm16(tone(seconds, 16000)), 16000, 1)
+            riff_24k = wav_bytes(pcm16(tone(seconds, 24000)), 24000, 1)
+
+            old = speedup = "n/a"
+            direct = timed_ms(lambda: playback_wav(raw, PLAYBACK_RATE), args.repeat)
+            if ffmpeg:
+                riff = wav_bytes(raw, PLAYBACK_RATE, 1)
+                old_ms = timed_ms(lambda: ffmpeg_path(ffmpeg, riff, workdir), args.repeat)
+                old, speedup = f"{old_ms:.1f}", f"{old_ms / direct:.0f}x"
+            from_16k = timed_ms(lambda: playback_wav(riff_16k, 16000), args.repeat)
+            from_24k = timed_ms(lambda: playback_wav(riff_24k, 24000), args.repeat)
+            print(f"{seconds:>9.0f}s{old:>11}{direct:>14.2f}{speedup:>9}{from_16k:>9.1f}{from_24k:>9.1f}"
+                  f"{snr_db(playback_wav(riff_16k, 16000), seconds):>12.1f}"
+                  f"{snr_db(playback_wav(riff_24k, 24000), seconds):>12.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,10 @@ from pathlib import Path
 import requests
 import json
 import base64
+import time
 import websockets
 from contextlib import asynccontextmanager
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -23,6 +24,19 @@ from fastapi import FastAPI, Request
 import azure.cognitiveservices.speech as speechsdk
 
 from app.realtime_translator.web_interface import get_web_interface
+from app.realtime_translator.event_bridge import SpeechEventBridge
+from app.realtime_translator.participant_demux import ParticipantAudioDemux
+from app.realtime_translator.audio_ingest import AudioIngest
+from app.realtime_translator.settings import parse_bool
+from app.realtime_translator.vad import SessionVoiceGate, VADSettings
+from app.realtime_translator.pipeline import PipelinePolicy, RealtimePipeline, Utterance
+from app.realtime_translator.utterance_aggregator import AggregationPolicy, UtteranceAggregator
+from app.realtime_translator.speculative import SpeculationPolicy, SpeculativeTranslator
+from app.realtime_translator.streaming_translation import SentenceSplitter, iter_completion_text
+from app.glossary_matcher import GlossaryMatcher
+from app.translation_cache import TranslationCache
+from app.tts_cache import TTSCache
+from app.tts_pool import SynthesizerPool
 
 load_dotenv()
 
@@ -38,6 +52,7 @@ BASE_URL = 'https://us-west-2.recall.ai/api/v1'
 AZURE_OPENAI_KEY = os.getenv('AZURE_OPENAI_KEY')
 AZURE_OPENAI_ENDPOINT = os.getenv('AZURE_OPENAI_ENDPOINT')
 AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY')
+AZURE_OPENAI_DEPLOYMENT_FAST = os.getenv('AZURE_OPENAI_DEPLOYMENT_FAST')
 AZURE_OPENAI_API_VERSION = "2024-08-01-preview"
 
 # Azure Speech Services
@@ -46,6 +61,44 @@ AZURE_SPEECH_REGION = os.getenv('AZURE_SPEECH_REGION', 'westeurope')
 
 WEBHOOK_BASE_URL = os.getenv('WEBHOOK_URL', 'https://zoom-bot-vm.westeurope.cloudapp.azure.com')
 
+# One recognizer per active participant
+MAX_RECOGNIZERS = int(os.getenv('MAX_RECOGNIZERS', '4'))
+RECOGNIZER_IDLE_TIMEOUT = float(os.getenv('RECOGNIZER_IDLE_TIMEOUT', '30'))
+
+# Audio is coalesced into fixed-size frames before it is pushed to Azure
+INGEST_FRAME_MS = int(os.getenv('INGEST_FRAME_MS', '100'))
+
+# Local voice activity gate: long silences are not streamed to Azure
+VAD_ENABLED = os.getenv('VAD_ENABLED', 'True').lower() == 'true'
+VAD_ENERGY_THRESHOLD_DB = float(os.getenv('VAD_ENERGY_THRESHOLD_DB', '-45'))
+
+# Backpressure: end-to-end latency budget and bound of every pipeline stage
+PIPELINE_MAX_LATENCY_S = float(os.getenv('PIPELINE_MAX_LATENCY_S', '8'))
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '4'))
+PIPELINE_OVERFLOW = os.getenv('PIPELINE_OVERFLOW', 'merge')
+
+# Merge short recognized fragments of one speaker before translating them
+AGGREGATION_ENABLED = os.getenv('AGGREGATION_ENABLED', 'True').lower() == 'true'
+AGGREGATION_PAUSE_MS = int(os.getenv('AGGREGATION_PAUSE_MS', '700'))
+AGGREGATION_MAX_WAIT_MS = int(os.getenv('AGGREGATION_MAX_WAIT_MS', '1500'))
+
+# Start translating stable prefixes of partial results before the final result
+SPECULATION_ENABLED = os.getenv('SPECULATION_ENABLED', 'False').lower() == 'true'
+
+# Stream GPT output and synthesize it sentence by sentence
+STREAM_TRANSLATION = os.getenv('STREAM_TRANSLATION', 'True').lower() == 'true'
+
+# Translation cache: in-process LRU, plus a SQLite file shared between runs if set
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB')
+
+# Synthesizers kept connected per voice (also the voice's concurrent TTS calls)
+TTS_SYNTHESIZERS_PER_VOICE = int(os.getenv('TTS_SYNTHESIZERS_PER_VOICE', '2'))
+
+# Synthesized audio cache, shared with step4 if they point at the same directory
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR')
+TTS_CACHE_MAX_MB = int(os.getenv('TTS_CACHE_MAX_MB', '1024'))
+
 # Load glossary
 GLOSSARY_PATH = Path(__file__).parent.parent / 'config' / 'translation_glossary.json'
 
@@ -56,6 +109,7 @@ class GlossaryManager:
     def __init__(self, glossary_path: Path):
         self.glossary = {}
         self.load_glossary(glossary_path)
+        self.matcher = GlossaryMatcher(self.glossary)
     
     def load_glossary(self, path: Path):
         """Load glossary from JSON file"""
@@ -69,40 +123,48 @@ class GlossaryManager:
         except Exception as e:
             logger.error(f"Error loading glossary: {e}")
     
-    def build_prompt(self, limit: int = 30) -> str:
-        """Build glossary prompt for GPT"""
-        if not self.glossary:
-            return ""
-        
+    def build_prompt(self, text: str) -> str:
+        """Build glossary prompt for GPT with only the terms that occur in text"""
         terms = [
-            f"- {ru} → {data['en']}" 
-            for ru, data in list(self.glossary.items())[:limit]
+            f"- {ru} → {self.matcher.terms[ru]['en']}"
+            for ru in self.matcher.find(text)
         ]
+        if not terms:
+            return ""
         return "GLOSSARY (use exact translations):\n" + "\n".join(terms)
 
 
 class AzureSpeechTranscriber:
-    """Handles real-time transcription using Azure Speech Services with speaker diarization"""
+    """Handles real-time transcription of one participant's audio using Azure Speech Services"""
     
-    def __init__(self, speech_key: str, region: str, language: str = "ru-RU"):
+    def __init__(
+        self,
+        speech_key: str,
+        region: str,
+        language: str = "ru-RU",
+        speaker_id: str = "Speaker_1",
+        speaker_info: Optional[Dict] = None
+    ):
         self.speech_key = speech_key
         self.region = region
         self.language = language
+        self.speaker_id = speaker_id
         self.push_stream = None
         self.recognizer = None
         self.audio_config = None
         self.is_running = False
         
-        # Speaker tracking
-        self.speaker_info = {}  # {speaker_id: {"gender": "male/female", "name": "..."}}
+        # Speaker tracking, shared between the per-participant transcribers
+        self.speaker_info = speaker_info if speaker_info is not None else {}  # {speaker_id: {"gender": "male/female", "name": "..."}}
         
-        # Callbacks
+        # Callbacks (dispatched on the event loop through the event bridge)
         self.on_recognized = None
         self.on_recognizing = None
+        self.event_bridge: Optional[SpeechEventBridge] = None
         
     def start(self):
-        """Start Azure Speech recognition with speaker diarization"""
-        logger.info(f"🎤 Starting Azure Speech recognition ({self.language})...")
+        """Start Azure Speech recognition for this participant"""
+        logger.info(f"🎤 Starting Azure Speech recognition ({self.language}, {self.speaker_id})...")
         
         # Configure Speech
         speech_config = speechsdk.SpeechConfig(
@@ -131,44 +193,46 @@ class AzureSpeechTranscriber:
             audio_config=self.audio_config
         )
         
-        # Counter for speaker tracking (since we don't have true diarization)
-        self.current_speaker = "Speaker_1"
-        self.speaker_counter = 1
-        
         # Setup event handlers
         def recognized_handler(evt):
             """Handle final transcription"""
             if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
                 text = evt.result.text
                 
-                # Use simple speaker rotation (can be improved with voice analysis)
-                speaker_id = self.current_speaker
+                # Each participant has its own recognizer, so attribution is exact
+                speaker_id = self.speaker_id
                 gender = self.get_or_infer_gender(speaker_id)
                 
                 logger.info(f"✅ {speaker_id} ({gender}): {text}")
                 
-                if self.on_recognized:
-                    asyncio.create_task(self.on_recognized(
+                # SDK callback thread: hand the event over to the loop
+                if self.on_recognized and self.event_bridge:
+                    self.event_bridge.post(
+                        "recognized",
+                        self.on_recognized,
                         text=text,
                         speaker_id=speaker_id,
                         gender=gender,
-                        is_final=True
-                    ))
+                        is_final=True,
+                        recognized_at=time.monotonic()
+                    )
         
         def recognizing_handler(evt):
             """Handle partial transcription"""
             if evt.result.reason == speechsdk.ResultReason.RecognizingSpeech:
                 text = evt.result.text
-                speaker_id = self.current_speaker
+                speaker_id = self.speaker_id
                 
                 logger.debug(f"🔄 {speaker_id}: {text}")
                 
-                if self.on_recognizing:
-                    asyncio.create_task(self.on_recognizing(
+                if self.on_recognizing and self.event_bridge:
+                    self.event_bridge.post(
+                        "recognizing",
+                        self.on_recognizing,
                         text=text,
                         speaker_id=speaker_id,
                         is_final=False
-                    ))
+                    )
         
         def canceled_handler(evt):
             if evt.reason == speechsdk.CancellationReason.Error:
@@ -224,7 +288,12 @@ class AzureSpeechTranscriber:
 
 
 class AzureTTSSynthesizer:
-    """Handles text-to-speech synthesis with gender-specific voices"""
+    """Handles text-to-speech synthesis with gender-specific voices.
+
+    Each voice has its own pre-connected synthesizers (SynthesizerPool), so
+    concurrent speakers never share a mutable voice setting, and the blocking
+    SDK call runs off the event loop.
+    """
     
     # Voice mapping by gender
     VOICES = {
@@ -238,18 +307,64 @@ class AzureTTSSynthesizer:
         }
     }
     
-    def __init__(self, speech_key: str, region: str):
+    # Audio format of the results (the SDK default, set explicitly as it is part of the cache key)
+    OUTPUT_FORMAT = speechsdk.SpeechSynthesisOutputFormat.Riff16Khz16BitMonoPcm
+    
+    def __init__(self, speech_key: str, region: str, per_voice: int = TTS_SYNTHESIZERS_PER_VOICE,
+                 cache: Optional[TTSCache] = None):
         self.speech_key = speech_key
         self.region = region
+        self.cache = cache
         
-        # Configure Speech
-        self.speech_config = speechsdk.SpeechConfig(
-            subscription=speech_key,
-            region=region
+        # Connections stay open for the lifetime of their synthesizer
+        self.connections = {}
+        self.pool = SynthesizerPool(
+            self.create_synthesizer,
+            voices=[voices["en-US"] for voices in self.VOICES.values()],
+            per_voice=per_voice,
+            dispose=self.close_synthesizer
         )
-        
-        # Use neural voices for better quality
-        self.speech_config.speech_synthesis_voice_name = self.VOICES["female"]["en-US"]
+    
+    def create_synthesizer(self, voice_name: str):
+        """Synthesizer with its own config for one voice, connected ahead of its first call"""
+        speech_config = speechsdk.SpeechConfig(
+            subscription=self.speech_key,
+            region=self.region
+        )
+        speech_config.speech_synthesis_voice_name = voice_name
+        speech_config.set_speech_synthesis_output_format(self.OUTPUT_FORMAT)
+        synthesizer = speechsdk.SpeechSynthesizer(
+            speech_config=speech_config,
+            audio_config=None  # Get raw audio data
+        )
+        connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+        connection.open(True)
+        self.connections[synthesizer] = connection
+        return synthesizer
+    
+    def close_synthesizer(self, synthesizer):
+        """Close the connection of a synthesizer the pool dropped"""
+        connection = self.connections.pop(synthesizer, None)
+        if connection:
+            connection.close()
+    
+    async def start(self):
+        """Open the synthesizers' connections before the first line needs them"""
+        try:
+            await self.pool.start()
+        except Exception as e:
+            # Not fatal: the missing synthesizers are created on first use
+            logger.warning(f"⚠️ TTS warm-up failed, synthesizers will connect on first use: {e}")
+    
+    def close(self):
+        for connection in list(self.connections.values()):
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self.pool.close()
+        if self.cache:
+            self.cache.close()
     
     async def synthesize(
         self, 
@@ -264,20 +379,22 @@ class AzureTTSSynthesizer:
             if not voice_name:
                 voice_name = self.VOICES["female"][language]
             
-            self.speech_config.speech_synthesis_voice_name = voice_name
+            # Recurring lines are played from the cache (file I/O stays off the loop too)
+            loop = asyncio.get_running_loop()
+            cache_key = TTSCache.key(voice_name, text, "", self.OUTPUT_FORMAT.name)
+            if self.cache:
+                audio_data = await loop.run_in_executor(self.pool.executor, self.cache.get, cache_key)
+                if audio_data:
+                    logger.info(f"🔊 Cached audio: {len(audio_data)} bytes ({gender} voice)")
+                    return audio_data
             
-            # Configure audio output to memory stream
-            audio_config = speechsdk.audio.AudioOutputConfig(use_default_speaker=False)
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config,
-                audio_config=None  # Get raw audio data
-            )
-            
-            # Synthesize
-            result = synthesizer.speak_text_async(text).get()
+            # Synthesize on a pooled synthesizer of this voice, off the event loop
+            result = await self.pool.run_async(voice_name, lambda synthesizer: synthesizer.speak_text_async(text).get())
             
             if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
                 logger.info(f"🔊 Synthesized audio: {len(result.audio_data)} bytes ({gender} voice)")
+                if self.cache:
+                    await loop.run_in_executor(self.pool.executor, self.cache.put, cache_key, result.audio_data)
                 return result.audio_data
             else:
                 logger.error(f"TTS error: {result.reason}")
@@ -301,6 +418,9 @@ class RecallWebSocketClient:
         self.on_audio = None
         self.on_transcript = None
         
+        # Optional ingest stage: decodes audio straight into per-participant ring buffers
+        self.audio_ingest: Optional[AudioIngest] = None
+        
     async def connect(self):
         """Connect to Recall WebSocket"""
         ws_url = f"wss://us-west-2.recall.ai/api/v1/bot/{self.bot_id}/real-time"
@@ -372,13 +492,19 @@ class RecallWebSocketClient:
             if not audio_base64:
                 return
             
-            # Decode from base64
-            raw_audio = base64.b64decode(audio_base64)
-            
             # Get participant info
             participant_id = audio_data.get('participant_id')
             
-            logger.debug(f"🎵 Received audio chunk: {len(raw_audio)} bytes from participant {participant_id}")
+            if self.audio_ingest:
+                # Decode into the participant's ring buffer; full frames go to Azure
+                self.audio_ingest.feed_base64(participant_id, audio_base64)
+                return
+            
+            # Decode from base64
+            raw_audio = base64.b64decode(audio_base64)
+            
+            # Hot path: avoid formatting the message unless debug is enabled
+            logger.debug("🎵 Received audio chunk: %d bytes from participant %s", len(raw_audio), participant_id)
             
             # Send to callback (Azure Speech)
             if self.on_audio:
@@ -410,17 +536,78 @@ class RealtimeTranslator:
         # Glossary manager
         self.glossary = GlossaryManager(GLOSSARY_PATH)
         
-        # Azure Speech for transcription
-        self.azure_speech = AzureSpeechTranscriber(
-            speech_key=AZURE_SPEECH_KEY,
-            region=AZURE_SPEECH_REGION,
-            language="ru-RU"
+        # Recurring phrases are translated once (keys include model and prompt hash)
+        self.translation_cache = TranslationCache(
+            max_entries=TRANSLATION_CACHE_SIZE,
+            db_path=TRANSLATION_CACHE_DB
+        )
+        
+        # Speaker info shared by all participant transcribers
+        self.speaker_info = {}
+        
+        # Azure Speech for transcription: one recognizer per active participant
+        self.audio_demux = ParticipantAudioDemux(
+            create_transcriber=self.create_participant_transcriber,
+            max_recognizers=MAX_RECOGNIZERS,
+            idle_timeout=RECOGNIZER_IDLE_TIMEOUT,
+            on_close=self.forget_participant
         )
         
         # Azure TTS for synthesis
         self.azure_tts = AzureTTSSynthesizer(
             speech_key=AZURE_SPEECH_KEY,
-            region=AZURE_SPEECH_REGION
+            region=AZURE_SPEECH_REGION,
+            cache=TTSCache(TTS_CACHE_DIR, TTS_CACHE_MAX_MB * 1024 * 1024) if TTS_CACHE_DIR else None
+        )
+        
+        # Bounded translate -> synthesize -> output pipeline with load shedding
+        self.pipeline = RealtimePipeline(
+            translate=self.pipeline_translate,
+            synthesize=self.pipeline_synthesize,
+            output=self.pipeline_output,
+            policy=PipelinePolicy(
+                max_latency_s=PIPELINE_MAX_LATENCY_S,
+                queue_size=PIPELINE_QUEUE_SIZE,
+                overflow=PIPELINE_OVERFLOW,
+                stream_sentences=STREAM_TRANSLATION
+            ),
+            fast_model=AZURE_OPENAI_DEPLOYMENT_FAST,
+            translate_stream=self.pipeline_translate_stream
+        )
+        
+        # Translate stable prefixes of partial results ahead of the final result
+        self.speculation = SpeculativeTranslator(
+            translate=self.translate_with_usage,
+            policy=SpeculationPolicy(enabled=SPECULATION_ENABLED)
+        )
+        
+        # Merge a speaker's fragments until they pause before they enter the pipeline
+        self.aggregator = UtteranceAggregator(
+            on_utterance=self.pipeline.submit,
+            policy=AggregationPolicy(
+                enabled=AGGREGATION_ENABLED,
+                pause_ms=AGGREGATION_PAUSE_MS,
+                max_wait_ms=AGGREGATION_MAX_WAIT_MS
+            )
+        )
+        
+        # Bridge from SDK callback threads into the event loop (one per meeting)
+        self.event_bridge = SpeechEventBridge(
+            name=meeting_url,
+            coalesce_partials=self.pipeline.policy.drop_stale_partials
+        )
+        
+        # Drop long silences before they reach Azure (thresholds are per meeting)
+        self.voice_gate = SessionVoiceGate(
+            on_audio=self.audio_demux.write_audio,
+            settings=VADSettings(energy_threshold_db=VAD_ENERGY_THRESHOLD_DB),
+            enabled=VAD_ENABLED
+        )
+        
+        # Coalesce incoming audio into fixed-size frames per participant
+        self.audio_ingest = AudioIngest(
+            on_frame=self.voice_gate.write_audio,
+            frame_ms=INGEST_FRAME_MS
         )
         
         # Recall WebSocket client
@@ -441,39 +628,30 @@ class RealtimeTranslator:
     def setup_azure_callbacks(self):
         """Setup callbacks for Azure Speech recognition"""
         
-        async def on_recognized(text: str, speaker_id: str, gender: str, is_final: bool):
+        async def on_recognized(text: str, speaker_id: str, gender: str, is_final: bool, recognized_at: float):
             """Handle final recognized text from Azure"""
             logger.info(f"💬 Final transcript [{speaker_id}, {gender}]: {text}")
             
-            # Translate with glossary and filtering
-            translation = await self.translate(text)
-            logger.info(f"🌍 Translation: {translation}")
-            
-            # Broadcast to web interface
-            await self.web.broadcast({
-                "type": "translation",
-                "speaker": f"Speaker {speaker_id}",
-                "speaker_id": speaker_id,
-                "gender": gender,
-                "original": text,
-                "translation": translation
-            })
-            
-            # Synthesize audio with appropriate voice
-            audio_data = await self.azure_tts.synthesize(
-                text=translation,
+            utterance = Utterance(
+                text=text,
+                speaker_id=speaker_id,
                 gender=gender,
-                language="en-US"
+                recognized_at=recognized_at
             )
+            if self.speculation.policy.enabled:
+                # Reuses translations started on stable partials, translates the rest
+                utterance.translation_tasks.append(self.speculation.finalize(speaker_id, text))
             
-            if audio_data:
-                # Send audio back to Zoom via Recall
-                await self.send_audio_to_zoom(audio_data)
+            # Fragments are merged, then translated, synthesized and sent
+            # in the pipeline's bounded stages
+            self.aggregator.add(utterance)
         
         async def on_recognizing(text: str, speaker_id: str, is_final: bool):
             """Handle partial recognized text from Azure"""
             logger.debug(f"🔄 Partial transcript [{speaker_id}]: {text}")
             
+            self.speculation.on_partial(speaker_id, text)
+            
             # Broadcast partial result
             await self.web.broadcast({
                 "type": "partial_transcript",
@@ -482,8 +660,107 @@ class RealtimeTranslator:
                 "text": text
             })
         
-        self.azure_speech.on_recognized = on_recognized
-        self.azure_speech.on_recognizing = on_recognizing
+        self.on_recognized = on_recognized
+        self.on_recognizing = on_recognizing
+    
+    async def pipeline_translate(self, utterance: Utterance, model: Optional[str]) -> Optional[str]:
+        """Pipeline stage: translate with glossary and filtering, then show on the web UI"""
+        if utterance.translation_tasks:
+            # Translation was started speculatively, just collect it
+            parts = await asyncio.gather(*utterance.translation_tasks)
+            translation = " ".join(parts)
+        else:
+            translation = await self.translate(utterance.text, model=model)
+        logger.info(f"🌍 Translation: {translation}")
+        
+        # Broadcast to web interface
+        await self.web.broadcast({
+            "type": "translation",
+            "utterance_id": utterance.id,
+            "speaker": f"Speaker {utterance.speaker_id}",
+            "speaker_id": utterance.speaker_id,
+            "gender": utterance.gender,
+            "original": utterance.text,
+            "translation": translation
+        })
+        
+        if "[Translation error]" in translation:
+            return None
+        return translation
+    
+    async def pipeline_translate_stream(self, utterance: Utterance, model: Optional[str]) -> AsyncIterator[str]:
+        """Pipeline stage: stream the translation to the web UI, yielding complete sentences for TTS"""
+        if utterance.translation_tasks:
+            # Already translated speculatively, nothing to stream
+            utterance.translation = await self.pipeline_translate(utterance, model)
+            if utterance.translation:
+                for sentence in SentenceSplitter.split(utterance.translation):
+                    yield sentence
+            return
+        
+        splitter = SentenceSplitter()
+        parts = []
+        async for delta in self.translate_stream(utterance.text, model=model):
+            parts.append(delta)
+            await self.web.broadcast({
+                "type": "translation_delta",
+                "utterance_id": utterance.id,
+                "speaker": f"Speaker {utterance.speaker_id}",
+                "original": utterance.text,
+                "delta": delta
+            })
+            for sentence in splitter.feed(delta):
+                yield sentence
+        
+        tail = splitter.flush()
+        if tail:
+            yield tail
+        
+        translation = "".join(parts).strip() or "[Translation error]"
+        utterance.translation = translation
+        logger.info(f"🌍 Translation: {translation}")
+        
+        # Final message replaces the streamed one on the web interface
+        await self.web.broadcast({
+            "type": "translation",
+            "utterance_id": utterance.id,
+            "speaker": f"Speaker {utterance.speaker_id}",
+            "speaker_id": utterance.speaker_id,
+            "gender": utterance.gender,
+            "original": utterance.text,
+            "translation": translation
+        })
+    
+    async def pipeline_synthesize(self, utterance: Utterance) -> Optional[bytes]:
+        """Pipeline stage: synthesize audio with appropriate voice"""
+        return await self.azure_tts.synthesize(
+            text=utterance.translation,
+            gender=utterance.gender,
+            language="en-US"
+        )
+    
+    async def pipeline_output(self, utterance: Utterance):
+        """Pipeline stage: send audio back to Zoom via Recall"""
+        await self.send_audio_to_zoom(utterance.audio)
+    
+    def create_participant_transcriber(self, participant_id: str) -> AzureSpeechTranscriber:
+        """Create a transcriber for one participant (called lazily by the demux)"""
+        transcriber = AzureSpeechTranscriber(
+            speech_key=AZURE_SPEECH_KEY,
+            region=AZURE_SPEECH_REGION,
+            language="ru-RU",
+            speaker_id=participant_id,
+            speaker_info=self.speaker_info
+        )
+        transcriber.on_recognized = self.on_recognized
+        transcriber.on_recognizing = self.on_recognizing
+        transcriber.event_bridge = self.event_bridge
+        return transcriber
+    
+    def forget_participant(self, participant_id: str):
+        """Drop the ingest ring and VAD gate of a participant whose recognizer was closed"""
+        self.audio_ingest.remove(participant_id)
+        self.voice_gate.remove(participant_id)
     
     def setup_webhook(self):
         """Setup webhook endpoints for bot status events"""
@@ -505,6 +782,71 @@ class RealtimeTranslator:
             except Exception as e:
                 logger.error(f"Bot events error: {e}")
                 return {"status": "error"}
+        
+        @self.web.app.get("/metrics")
+        async def get_metrics():
+            """Pipeline metrics for this meeting"""
+            return {
+                "event_bridge": self.event_bridge.get_metrics(),
+                "recognizers": self.audio_demux.get_metrics(),
+                "ingest": self.audio_ingest.get_metrics(),
+                "vad": self.voice_gate.get_metrics(),
+                "aggregation": self.aggregator.get_metrics(),
+                "speculation": self.speculation.get_metrics(),
+                "translation_cache": self.translation_cache.get_metrics(),
+                "pipeline": self.pipeline.get_metrics()
+            }
+        
+        @self.web.app.get("/aggregation")
+        async def get_aggregation_policy():
+            """Fragment merge policy for this meeting"""
+            return self.aggregator.policy.to_dict()
+        
+        @self.web.app.post("/aggregation")
+        async def update_aggregation_policy(request: Request):
+            """Update fragment merge policy for this meeting"""
+            try:
+                data = await request.json()
+                self.aggregator.policy.update(**data)
+                logger.info(f"🧩 Aggregation policy updated: {self.aggregator.policy.to_dict()}")
+                return {"status": "ok", "policy": self.aggregator.policy.to_dict()}
+            except (ValueError, TypeError) as e:
+                return {"status": "error", "message": str(e)}
+        
+        @self.web.app.get("/pipeline")
+        async def get_pipeline_policy():
+            """Latency budget and overflow policy for this meeting"""
+            return self.pipeline.policy.to_dict()
+        
+        @self.web.app.post("/pipeline")
+        async def update_pipeline_policy(request: Request):
+            """Update latency budget and overflow policy for this meeting"""
+            try:
+                data = await request.json()
+                self.pipeline.policy.update(**data)
+                self.event_bridge.coalesce_partials = self.pipeline.policy.drop_stale_partials
+                logger.info(f"🚦 Pipeline policy updated: {self.pipeline.policy.to_dict()}")
+                return {"status": "ok", "policy": self.pipeline.policy.to_dict()}
+            except (ValueError, TypeError) as e:
+                return {"status": "error", "message": str(e)}
+        
+        @self.web.app.get("/vad")
+        async def get_vad():
+            """Voice activity gate thresholds for this meeting"""
+            return {"enabled": self.voice_gate.enabled, "settings": self.voice_gate.settings.to_dict()}
+        
+        @self.web.app.post("/vad")
+        async def update_vad(request: Request):
+            """Update voice activity gate thresholds for this meeting"""
+            try:
+                data = await request.json()
+                enabled = parse_bool(data.pop('enabled')) if 'enabled' in data else self.voice_gate.enabled
+                self.voice_gate.settings.update(**data)
+                self.voice_gate.enabled = enabled
+                logger.info(f"🔇 VAD settings updated: {self.voice_gate.settings.to_dict()}")
+                return {"status": "ok", "settings": self.voice_gate.settings.to_dict()}
+            except (ValueError, TypeError) as e:
+                return {"status": "error", "message": str(e)}
     
     async def create_bot(self):
         """Create Recall bot with WebSocket audio streaming and bot output"""
@@ -567,12 +909,13 @@ class RealtimeTranslator:
             api_key=RECALL_API_KEY
         )
         
-        # Setup callback to send audio to Azure
+        # Setup callback to send audio to the participant's own recognizer
         async def on_audio(audio_data: bytes, participant_id: str):
             """Send audio to Azure Speech"""
-            self.azure_speech.write_audio(audio_data)
+            self.audio_demux.write_audio(participant_id, audio_data)
         
         self.ws_client.on_audio = on_audio
+        self.ws_client.audio_ingest = self.audio_ingest
         
         # Connect (this will block until connection is closed)
         try:
@@ -583,12 +926,16 @@ class RealtimeTranslator:
         
         return True
     
-    async def translate(self, text: str) -> str:
+    async def translate(self, text: str, model: Optional[str] = None) -> str:
         """Translate text using Azure OpenAI with glossary and filtering"""
-        try:
-            glossary_prompt = self.glossary.build_prompt()
-            
-            system_prompt = f"""Translate from Russian to English with high quality and natural flow.
+        translation, _ = await self.translate_with_usage(text, model)
+        return translation
+    
+    def build_system_prompt(self, text: str) -> str:
+        """System prompt with the glossary terms that occur in text"""
+        glossary_prompt = self.glossary.build_prompt(text)
+        
+        return f"""Translate from Russian to English with high quality and natural flow.
 
 {glossary_prompt}
 
@@ -600,9 +947,18 @@ Rules:
 - Keep proper names unchanged
 - Remove filler words (So, Well, Like, You know, I mean, Actually, Basically, etc.)
 - Make text clean and professional"""
-
+    
+    async def translate_with_usage(self, text: str, model: Optional[str] = None) -> Tuple[str, int]:
+        """Translate text, also returning the total tokens the request used"""
+        model = model or AZURE_OPENAI_DEPLOYMENT
+        system_prompt = self.build_system_prompt(text)
+        cached = self.translation_cache.get(text, model, system_prompt)
+        if cached is not None:
+            return cached, 0
+        
+        try:
             response = await self.openai_client.chat.completions.create(
-                model=AZURE_OPENAI_DEPLOYMENT,
+                model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": text}
@@ -610,10 +966,45 @@ Rules:
                 temperature=0.3,
                 max_tokens=1000
             )
-            return response.choices[0].message.content.strip()
+            tokens = response.usage.total_tokens if response.usage else 0
+            translation = response.choices[0].message.content.strip()
+            self.translation_cache.put(text, model, system_prompt, translation)
+            return translation, tokens
         except Exception as e:
             logger.error(f"Translation error: {e}")
-            return f"[Translation error]"
+            return "[Translation error]", 0
+    
+    async def translate_stream(self, text: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        """Translate text, yielding the translation as it is generated"""
+        model = model or AZURE_OPENAI_DEPLOYMENT
+        system_prompt = self.build_system_prompt(text)
+        cached = self.translation_cache.get(text, model, system_prompt)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        try:
+            stream = await self.openai_client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
+                ],
+                temperature=0.3,
+                max_tokens=1000,
+                stream=True
+            )
+            async for delta in iter_completion_text(stream):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            logger.error(f"Streaming translation error: {e}")
+            return
+        
+        translation = "".join(parts).strip()
+        if translation:
+            self.translation_cache.put(text, model, system_prompt, translation)
     
     async def send_audio_to_zoom(self, audio_data: bytes):
         """Send synthesized audio back to Zoom via Recall Bot Output Media"""
@@ -694,8 +1085,13 @@ Rules:
                 logger.error("❌ Timeout waiting for bot to join")
                 return False
             
-            # 3. Start Azure Speech recognition
-            self.azure_speech.start()
+            # 3. Start event bridge, then Azure Speech recognition
+            #    (recognizers are created as participants start speaking)
+            self.event_bridge.start()
+            await self.azure_tts.start()
+            self.pipeline.start()
+            self.audio_demux.start()
+            self.audio_ingest.start()
             
             # 4. Connect to Recall WebSocket for audio streaming
             logger.info("🔌 Connecting to Recall WebSocket...")
@@ -717,8 +1113,32 @@ Rules:
         """Stop the translator bot"""
         logger.info("🛑 Stopping translator...")
         
-        # Stop Azure Speech
-        self.azure_speech.stop()
+        # Stop Azure Speech (flush buffered audio first)
+        await self.audio_ingest.stop()
+        await self.audio_demux.stop()
+        
+        vad_metrics = self.voice_gate.get_metrics()
+        logger.info(
+            f"🔇 VAD suppressed {vad_metrics['suppressed_s']:.0f}s of {vad_metrics['audio_s']:.0f}s "
+            f"({vad_metrics['suppressed_percent']:.1f}%)"
+        )
+        await self.event_bridge.stop()
+        self.aggregator.stop()
+        await self.pipeline.stop()
+        
+        cache_metrics = self.translation_cache.get_metrics()
+        logger.info(
+            f"🗄️ Translation cache: {cache_metrics['memory_hits'] + cache_metrics['disk_hits']} hits, "
+            f"{cache_metrics['misses']} misses"
+        )
+        self.translation_cache.close()
+        
+        tts_metrics = self.azure_tts.pool.get_metrics()
+        logger.info(
+            f"🔊 TTS pool: {tts_metrics['calls']} calls on {tts_metrics['synthesizers']} synthesizers, "
+            f"{tts_metrics['waited']} waited for a free one"
+        )
+        self.azure_tts.close()
         
         # Close WebSocket
         if self.ws_client:
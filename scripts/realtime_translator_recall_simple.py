@@ -1,18 +1,28 @@
 #!/usr/bin/env python3
 from fastapi import FastAPI, Request, Response
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse
 import uvicorn
 from openai import AsyncAzureOpenAI
 import os
-import subprocess
+import sys
+import time
 from dotenv import load_dotenv
 from pathlib import Path
 import json
 import azure.cognitiveservices.speech as speechsdk
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.audio_convert import ClipStore, playback_wav
+from app.translation_cache import TranslationCache
+
 load_dotenv()
 
+AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY')
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB')
+
 # Glossary
 glossary_path = Path("config/translation_glossary.json")
 glossary = {}
@@ -39,27 +49,37 @@ speech_config = speechsdk.SpeechConfig(
     region=os.getenv('AZURE_SPEECH_REGION', 'westeurope')
 )
 speech_config.speech_synthesis_voice_name = "en-US-JennyNeural"
+# Raw PCM at the player's rate: only the mono → stereo copy is left to do
+TTS_OUTPUT_RATE = 44100
+speech_config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Raw44100Hz16BitMonoPcm)
 
 app = FastAPI()
 
-# Store translations for web display
+# Store translations for web display, their audio in memory
 translations = []
+clips = ClipStore()
+translation_cache = TranslationCache(max_entries=TRANSLATION_CACHE_SIZE, db_path=TRANSLATION_CACHE_DB)
 
 async def translate(text: str) -> str:
     glossary_prompt = build_glossary_prompt()
+    system_prompt = f"Translate Russian to English naturally. Remove filler words (So, Well, Like, You know, I mean).\n\n{glossary_prompt}"
+
+    cached = translation_cache.get(text, AZURE_OPENAI_DEPLOYMENT, system_prompt)
+    if cached is not None:
+        return cached
+
     response = await openai_client.chat.completions.create(
-        model=os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY'),
+        model=AZURE_OPENAI_DEPLOYMENT,
         messages=[
-            {
-                "role": "system", 
-                "content": f"Translate Russian to English naturally. Remove filler words (So, Well, Like, You know, I mean).\n\n{glossary_prompt}"
-            },
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": text}
         ],
         temperature=0.3,
         max_tokens=1000
     )
-    return response.choices[0].message.content.strip()
+    translation = response.choices[0].message.content.strip()
+    translation_cache.put(text, AZURE_OPENAI_DEPLOYMENT, system_prompt, translation)
+    return translation
 
 def synthesize_audio(text: str) -> bytes:
     synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
@@ -372,9 +392,9 @@ async def get_translations():
 
 @app.get("/audio/{filename}")
 async def get_audio(filename: str):
-    audio_path = Path(f"/tmp/{filename}")
-    if audio_path.exists():
-        return FileResponse(audio_path, media_type="audio/wav")
+    wav = clips.get(filename)
+    if wav:
+        return Response(content=wav, media_type="audio/wav")
     return {"error": "Audio file not found"}
 
 @app.post("/webhook/transcript")
@@ -401,32 +421,14 @@ async def receive_transcript(request: Request):
             # Synthesize audio
             audio_data = synthesize_audio(translation)
             
-            # Save audio file
+            # Keep the browser WAV in memory (no temp files, no ffmpeg per utterance)
             timestamp = datetime.now().strftime("%H:%M:%S")
             audio_id = f"trans_{datetime.now().strftime('%H%M%S_%f')}"
-            audio_path = f"/tmp/{audio_id}.wav"
             
             if audio_data:
-                # Save raw audio first
-                raw_path = f"/tmp/{audio_id}_raw.wav"
-                with open(raw_path, 'wb') as f:
-                    f.write(audio_data)
-                
-                # Convert to browser-compatible WAV using ffmpeg
-                import subprocess
-                result = subprocess.run(
-                    ['ffmpeg', '-i', raw_path, '-acodec', 'pcm_s16le', '-ar', '44100', '-ac', '2', '-y', audio_path],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if result.returncode == 0:
-                    print(f"🔊 Audio saved and converted: {audio_path}")
-                    # Remove raw file
-                    os.remove(raw_path)
-                else:
-                    print(f"⚠️ FFmpeg conversion failed, using raw audio")
-                    os.rename(raw_path, audio_path)
+                started = time.perf_counter()
+                clips.put(audio_id, playback_wav(audio_data, TTS_OUTPUT_RATE))
+                print(f"🔊 Audio ready: {audio_id} ({(time.perf_counter() - started) * 1000:.1f}ms)")
             else:
                 print("⚠️ No audio generated")
             
@@ -21,6 +21,8 @@ from fastapi import FastAPI, Request
 import azure.cognitiveservices.speech as speechsdk
 
 from app.realtime_translator.web_interface import get_web_interface
+from app.glossary_matcher import GlossaryMatcher
+from app.translation_cache import TranslationCache
 
 load_dotenv()
 
@@ -44,6 +46,10 @@ AZURE_SPEECH_REGION = os.getenv('AZURE_SPEECH_REGION', 'westeurope')
 
 WEBHOOK_BASE_URL = os.getenv('WEBHOOK_URL', 'https://zoom-bot-vm.westeurope.cloudapp.azure.com')
 
+# Translation cache: in-process LRU, plus a SQLite file shared between runs if set
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB')
+
 # Load glossary
 GLOSSARY_PATH = Path(__file__).parent.parent / 'config' / 'translation_glossary.json'
 
@@ -54,6 +60,7 @@ class GlossaryManager:
     def __init__(self, glossary_path: Path):
         self.glossary = {}
         self.load_glossary(glossary_path)
+        self.matcher = GlossaryMatcher(self.glossary)
     
     def load_glossary(self, path: Path):
         """Load glossary from JSON file"""
@@ -67,15 +74,14 @@ class GlossaryManager:
         except Exception as e:
             logger.error(f"Error loading glossary: {e}")
     
-    def build_prompt(self, limit: int = 30) -> str:
-        """Build glossary prompt for GPT"""
-        if not self.glossary:
-            return ""
-        
+    def build_prompt(self, text: str) -> str:
+        """Build glossary prompt for GPT with only the terms that occur in text"""
         terms = [
-            f"- {ru} → {data['en']}" 
-            for ru, data in list(self.glossary.items())[:limit]
+            f"- {ru} → {self.matcher.terms[ru]['en']}"
+            for ru in self.matcher.find(text)
         ]
+        if not terms:
+            return ""
         return "GLOSSARY (use exact translations):\n" + "\n".join(terms)
 
 
@@ -151,6 +157,10 @@ class RealtimeTranslator:
         
         # Glossary manager
         self.glossary = GlossaryManager(GLOSSARY_PATH)
+        self.translation_cache = TranslationCache(
+            max_entries=TRANSLATION_CACHE_SIZE,
+            db_path=TRANSLATION_CACHE_DB
+        )
         
         # Azure TTS for synthesis
         self.azure_tts = AzureTTSSynthesizer(
@@ -384,7 +394,7 @@ class RealtimeTranslator:
     async def translate(self, text: str) -> str:
         """Translate text using Azure OpenAI with glossary"""
         try:
-            glossary_prompt = self.glossary.build_prompt()
+            glossary_prompt = self.glossary.build_prompt(text)
             
             system_prompt = f"""Translate from Russian to English with high quality and natural flow.
 
@@ -399,6 +409,10 @@ Rules:
 - Remove filler words (So, Well, Like, You know, I mean, Actually, Basically, etc.)
 - Make text clean and professional"""
 
+            cached = self.translation_cache.get(text, AZURE_OPENAI_DEPLOYMENT, system_prompt)
+            if cached is not None:
+                return cached
+
             response = await self.openai_client.chat.completions.create(
                 model=AZURE_OPENAI_DEPLOYMENT,
                 messages=[
@@ -408,7 +422,9 @@ Rules:
                 temperature=0.3,
                 max_tokens=1000
             )
-            return response.choices[0].message.content.strip()
+            translation = response.choices[0].message.content.strip()
+            self.translation_cache.put(text, AZURE_OPENAI_DEPLOYMENT, system_prompt, translation)
+            return translation
         except Exception as e:
             logger.error(f"Translation error: {e}")
             return "[Translation error]"
@@ -4,11 +4,11 @@ import asyncio
 import logging
 import os
 import sys
+import time
 from pathlib import Path
 import requests
 import json
 import base64
-import subprocess
 from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -16,12 +16,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 from openai import AsyncAzureOpenAI
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Response
+from fastapi.responses import HTMLResponse
 
 # Azure Speech SDK
 import azure.cognitiveservices.speech as speechsdk
 
+from app.realtime_translator.event_bridge import SpeechEventBridge
+from app.glossary_matcher import GlossaryMatcher
+from app.translation_cache import TranslationCache
+from app.audio_convert import ClipStore, playback_wav
+
 load_dotenv()
 
 logging.basicConfig(
@@ -45,6 +50,10 @@ AZURE_SPEECH_REGION = os.getenv('AZURE_SPEECH_REGION', 'westeurope')
 WEBHOOK_BASE_URL = os.getenv('WEBHOOK_URL', 'https://zoom-bot-vm.westeurope.cloudapp.azure.com')
 WEBSOCKET_BASE_URL = os.getenv('WEBSOCKET_URL', 'wss://zoom-bot-vm.westeurope.cloudapp.azure.com')
 
+# Translation cache: in-process LRU, plus a SQLite file shared between runs if set
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB')
+
 # Load glossary
 GLOSSARY_PATH = Path(__file__).parent.parent / 'config' / 'translation_glossary.json'
 
@@ -55,6 +64,7 @@ class GlossaryManager:
     def __init__(self, glossary_path: Path):
         self.glossary = {}
         self.load_glossary(glossary_path)
+        self.matcher = GlossaryMatcher(self.glossary)
     
     def load_glossary(self, path: Path):
         """Load glossary from JSON file"""
@@ -68,15 +78,14 @@ class GlossaryManager:
         except Exception as e:
             logger.error(f"Error loading glossary: {e}")
     
-    def build_prompt(self, limit: int = 30) -> str:
-        """Build glossary prompt for GPT"""
-        if not self.glossary:
-            return ""
-        
+    def build_prompt(self, text: str) -> str:
+        """Build glossary prompt for GPT with only the terms that occur in text"""
         terms = [
-            f"- {ru} → {data['en']}" 
-            for ru, data in list(self.glossary.items())[:limit]
+            f"- {ru} → {self.matcher.terms[ru]['en']}"
+            for ru in self.matcher.find(text)
         ]
+        if not terms:
+            return ""
         return "GLOSSARY (use exact translations):\n" + "\n".join(terms)
 
 
@@ -92,9 +101,10 @@ class AzureSpeechTranscriber:
         self.audio_config = None
         self.is_running = False
         
-        # Callbacks
+        # Callbacks (dispatched on the event loop through the event bridge)
         self.on_recognized = None
         self.on_recognizing = None
+        self.event_bridge: Optional[SpeechEventBridge] = None
         
     def start(self):
         """Start Azure Speech recognition"""
@@ -129,14 +139,15 @@ class AzureSpeechTranscriber:
         def recognized_handler(evt):
             if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
                 logger.info(f"✅ Azure recognized: {evt.result.text}")
-                if self.on_recognized:
-                    asyncio.create_task(self.on_recognized(evt.result.text, is_final=True))
+                # SDK callback thread: hand the event over to the loop
+                if self.on_recognized and self.event_bridge:
+                    self.event_bridge.post("recognized", self.on_recognized, text=evt.result.text, is_final=True)
         
         def recognizing_handler(evt):
             if evt.result.reason == speechsdk.ResultReason.RecognizingSpeech:
                 logger.debug(f"🔄 Azure recognizing: {evt.result.text}")
-                if self.on_recognizing:
-                    asyncio.create_task(self.on_recognizing(evt.result.text, is_final=False))
+                if self.on_recognizing and self.event_bridge:
+                    self.event_bridge.post("recognizing", self.on_recognizing, text=evt.result.text, is_final=False)
         
         def canceled_handler(evt):
             if evt.reason == speechsdk.CancellationReason.Error:
@@ -196,6 +207,10 @@ class AzureTTSSynthesizer:
         "female": {"en-US": "en-US-JennyNeural"}
     }
     
+    # Raw PCM at the player's rate: only the mono → stereo copy is left to do
+    OUTPUT_FORMAT = speechsdk.SpeechSynthesisOutputFormat.Raw44100Hz16BitMonoPcm
+    OUTPUT_RATE = 44100
+    
     def __init__(self, speech_key: str, region: str):
         self.speech_key = speech_key
         self.region = region
@@ -205,6 +220,7 @@ class AzureTTSSynthesizer:
             region=region
         )
         self.speech_config.speech_synthesis_voice_name = self.VOICES["female"]["en-US"]
+        self.speech_config.set_speech_synthesis_output_format(self.OUTPUT_FORMAT)
     
     async def synthesize(
         self, 
@@ -253,6 +269,10 @@ class RealtimeTranslator:
         
         # Glossary manager
         self.glossary = GlossaryManager(GLOSSARY_PATH)
+        self.translation_cache = TranslationCache(
+            max_entries=TRANSLATION_CACHE_SIZE,
+            db_path=TRANSLATION_CACHE_DB
+        )
         
         # Azure Speech for transcription
         self.azure_speech = AzureSpeechTranscriber(
@@ -267,6 +287,10 @@ class RealtimeTranslator:
             region=AZURE_SPEECH_REGION
         )
         
+        # Bridge from SDK callback threads into the event loop (one per meeting)
+        self.event_bridge = SpeechEventBridge(name=meeting_url)
+        self.azure_speech.event_bridge = self.event_bridge
+        
         self.app = FastAPI()
         self.headers = {
             'Authorization': f'Token {RECALL_API_KEY}',
@@ -276,6 +300,7 @@ class RealtimeTranslator:
         # Storage
         self.translations = []
         self.speakers = {}
+        self.clips = ClipStore()
         
         # Setup callbacks and routes
         self.setup_azure_callbacks()
@@ -299,30 +324,15 @@ class RealtimeTranslator:
                 language="en-US"
             )
             
-            # Save audio
+            # Keep the browser WAV in memory (no temp files, no ffmpeg per utterance)
             from datetime import datetime
             timestamp = datetime.now().strftime("%H:%M:%S")
             audio_id = f"trans_{datetime.now().strftime('%H%M%S_%f')}"
-            audio_path = f"/tmp/{audio_id}.wav"
             
             if audio_data:
-                # Save raw audio first
-                raw_path = f"/tmp/{audio_id}_raw.wav"
-                with open(raw_path, 'wb') as f:
-                    f.write(audio_data)
-                
-                # Convert to browser-compatible WAV
-                result = subprocess.run(
-                    ['ffmpeg', '-i', raw_path, '-acodec', 'pcm_s16le', '-ar', '44100', '-ac', '2', '-y', audio_path],
-                    capture_output=True
-                )
-                
-                if result.returncode == 0:
-                    logger.info(f"🔊 Audio saved: {audio_path}")
-                    os.remove(raw_path)
-                else:
-                    logger.warning(f"⚠️ FFmpeg conversion failed, using raw audio")
-                    os.rename(raw_path, audio_path)
+                started = time.perf_counter()
+                self.clips.put(audio_id, playback_wav(audio_data, self.azure_tts.OUTPUT_RATE))
+                logger.info(f"🔊 Audio ready: {audio_id} ({(time.perf_counter() - started) * 1000:.1f}ms)")
             
             # Store translation
             self.translations.append({
@@ -390,18 +400,27 @@ class RealtimeTranslator:
             """Get recent translations"""
             return self.translations[-20:]
         
+        @self.app.get("/metrics")
+        async def get_metrics():
+            """Pipeline metrics for this meeting"""
+            return {
+                "event_bridge": self.event_bridge.get_metrics(),
+                "translation_cache": self.translation_cache.get_metrics(),
+                "audio_clips": self.clips.get_metrics()
+            }
+        
         @self.app.get("/audio/{filename}")
         async def get_audio(filename: str):
             """Serve audio file"""
-            audio_path = Path(f"/tmp/{filename}")
-            if audio_path.exists():
-                return FileResponse(audio_path, media_type="audio/wav")
+            wav = self.clips.get(filename)
+            if wav:
+                return Response(content=wav, media_type="audio/wav")
             return {"error": "Audio file not found"}
     
     async def translate(self, text: str) -> str:
         """Translate text using Azure OpenAI with glossary"""
         try:
-            glossary_prompt = self.glossary.build_prompt()
+            glossary_prompt = self.glossary.build_prompt(text)
             
             system_prompt = f"""Translate from Russian to English with high quality and natural flow.
 
@@ -415,6 +434,10 @@ Rules:
 - Remove filler words (So, Well, Like, You know, I mean, Actually, Basically, etc.)
 - Make text clean and professional"""
 
+            cached = self.translation_cache.get(text, AZURE_OPENAI_DEPLOYMENT, system_prompt)
+            if cached is not None:
+                return cached
+
             response = await self.openai_client.chat.completions.create(
                 model=AZURE_OPENAI_DEPLOYMENT,
                 messages=[
@@ -424,7 +447,9 @@ Rules:
                 temperature=0.3,
                 max_tokens=1000
             )
-            return response.choices[0].message.content.strip()
+            translation = response.choices[0].message.content.strip()
+            self.translation_cache.put(text, AZURE_OPENAI_DEPLOYMENT, system_prompt, translation)
+            return translation
         except Exception as e:
             logger.error(f"Translation error: {e}")
             return "[Translation error]"
@@ -478,7 +503,8 @@ Rules:
                 logger.error("❌ Failed to create bot")
                 return False
             
-            # 2. Start Azure Speech recognition
+            # 2. Start event bridge, then Azure Speech recognition
+            self.event_bridge.start()
             self.azure_speech.start()
             
             # 3. WebSocket server is ready, waiting for Recall to connect
@@ -502,6 +528,7 @@ Rules:
         
         # Stop Azure Speech
         self.azure_speech.stop()
+        await self.event_bridge.stop()
         
         # Delete bot
         if self.bot_id:
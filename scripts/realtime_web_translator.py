@@ -16,6 +16,7 @@ from openai import AsyncAzureOpenAI
 import uvicorn
 
 from app.realtime_translator.web_interface import get_web_interface
+from app.translation_cache import TranslationCache
 
 load_dotenv()
 
@@ -30,6 +31,8 @@ BASE_URL = 'https://us-west-2.recall.ai/api/v1'
 AZURE_OPENAI_KEY = os.getenv('AZURE_OPENAI_KEY')
 AZURE_OPENAI_ENDPOINT = os.getenv('AZURE_OPENAI_ENDPOINT')
 AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY')
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB')
 AZURE_OPENAI_API_VERSION = "2024-08-01-preview"
 
 class RealtimeTranslator:
@@ -41,6 +44,10 @@ class RealtimeTranslator:
             api_version=AZURE_OPENAI_API_VERSION,
             azure_endpoint=AZURE_OPENAI_ENDPOINT
         )
+        self.translation_cache = TranslationCache(
+            max_entries=TRANSLATION_CACHE_SIZE,
+            db_path=TRANSLATION_CACHE_DB
+        )
         self.web = get_web_interface()
         self.headers = {
             'Authorization': f'Token {API_KEY}',
@@ -130,22 +137,24 @@ class RealtimeTranslator:
     
     async def translate(self, text: str) -> str:
         try:
+            system_prompt = "You are a professional translator. Translate Russian to English. Provide only the translation, no explanations."
+
+            cached = self.translation_cache.get(text, AZURE_OPENAI_DEPLOYMENT, system_prompt)
+            if cached is not None:
+                return cached
+
             response = await self.openai_client.chat.completions.create(
                 model=AZURE_OPENAI_DEPLOYMENT,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional translator. Translate Russian to English. Provide only the translation, no explanations."
-                    },
-                    {
-                        "role": "user",
-                        "content": text
-                    }
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
                 ],
                 temperature=0.3,
                 max_tokens=1000
             )
-            return response.choices[0].message.content.strip()
+            translation = response.choices[0].message.content.strip()
+            self.translation_cache.put(text, AZURE_OPENAI_DEPLOYMENT, system_prompt, translation)
+            return translation
         
         except Exception as e:
             logger.error(f"Translation error: {e}")
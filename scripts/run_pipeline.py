@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Весь офлайн-конвейер одной командой: step1 → step2 → step3 → step3.5 → step4 → step5
+- Каждый артефакт хранится по хешу своих входов и параметров (glossary, модель, голос, темп)
+- Перезапускаются только этапы, ключ которых изменился
+- Смена голоса TTS перезапускает только step4; правка термина в glossary
+  переводит заново только сегменты, где он встречается (остальные берутся из кэша переводов)
+
+Usage:
+    python run_pipeline.py <video.mp4 | *_audio.wav> [--until step4] [--force step3 ...]
+    python run_pipeline.py <video.mp4 | *_audio.wav> --stream
+    python run_pipeline.py <video.mp4 | *_audio.wav> --segments
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.offline_pipeline import ArtifactStore, OfflinePipeline, Stage
+from app.segment_store import STORE_SUFFIX
+
+load_dotenv()
+
+ROOT = Path(__file__).parent.parent
+SCRIPTS = Path(__file__).parent
+GLOSSARY_PATH = ROOT / 'config' / 'translation_glossary.json'
+
+# Artifact file names, by the convention the step scripts use
+ARTIFACTS = {
+    "video": ".mp4",
+    "audio": "_audio.wav",
+    "transcription": "_transcription.json",
+    "translated": "_translated.json",
+    "reviewed": "_translated_fixed.json",
+    "audio_en": "_audio_en.wav",
+    "highlights": "_highlights.json",
+}
+
+# step2 is not keyed on the glossary: phrase hints only nudge recognition, and
+# re-transcribing hours of audio for a glossary edit is never what we want
+# (use --force step2 when it is)
+STAGES = [
+    Stage("step1", ROOT / 'step1_extract_audio.py', ["video"], "audio"),
+    Stage("step2", SCRIPTS / 'step2_transcribe.py', ["audio"], "transcription"),
+    Stage("step3", SCRIPTS / 'step3_translate.py', ["transcription"], "translated",
+          params=["AZURE_OPENAI_DEPLOYMENT_QUALITY", "TRANSLATION_BATCH_SIZE"], files=[GLOSSARY_PATH]),
+    Stage("step3.5", SCRIPTS / 'step3.5_review.py', ["translated"], "reviewed",
+          params=["AZURE_OPENAI_DEPLOYMENT_QUALITY"]),
+    Stage("step4", SCRIPTS / 'step4_synthesize_audio.py', ["reviewed"], "audio_en",
+          params=["TTS_VOICE_MALE", "TTS_VOICE_FEMALE", "TTS_RATE", "TTS_RATE_MIN", "TTS_RATE_MAX"]),
+    Stage("step5", SCRIPTS / 'step5_analyze_highlights.py', ["reviewed"], "highlights",
+          params=["AZURE_OPENAI_DEPLOYMENT_QUALITY"]),
+]
+
+
+def artifact_paths(source: Path) -> dict:
+    """Paths of all artifacts of one video (or of its extracted audio)"""
+    name = source.name
+    for suffix in (ARTIFACTS["audio"], ARTIFACTS["video"]):
+        if name.endswith(suffix):
+            base = source.with_name(name[:-len(suffix)])
+            break
+    else:
+        raise ValueError(f"Expected a .mp4 video or an {ARTIFACTS['audio']} file: {source}")
+    return {artifact: base.with_name(base.name + suffix) for artifact, suffix in ARTIFACTS.items()}
+
+
+def with_segment_store(stages: list, paths: dict):
+    """Stages and paths writing the transcription and translation as columnar segment stores"""
+    stored = ("transcription", "translated")
+    paths = {name: path.with_suffix(STORE_SUFFIX) if name in stored else path for name, path in paths.items()}
+    stages = [
+        Stage(stage.name, stage.script, stage.inputs, stage.output, stage.params, stage.files, ["--segments"])
+        if stage.output in stored else stage
+        for stage in stages
+    ]
+    return stages, paths
+
+
+def run_streaming(pipeline: OfflinePipeline, paths: dict) -> bool:
+    """Extract audio if needed, stream step2 → step4, then file the complete results in the artifact store"""
+    from stream_pipeline import STREAMED, stream_pipeline
+    
+    if "step1" in pipeline.stages and not pipeline.run(["step1"]):
+        return False
+    step2 = pipeline.stages["step2"]
+    if pipeline.store.path(step2.name, step2.key(paths), paths[step2.output].suffix).exists():
+        # An earlier stream stored the transcription but not everything after it:
+        # resume step by step (translations and audio come from the caches)
+        print("♻️ Transcription is up to date: resuming step by step")
+        return pipeline.run(["step4"])
+    
+    complete = asyncio.run(stream_pipeline(paths))
+    # Only complete outputs are stored, so a rerun resumes from the first partial one.
+    # step5 is not part of the stream: the DAG can pick it up from here
+    for stage in pipeline.plan(["step4"]):
+        if stage.name != "step1" and stage.output in complete:
+            pipeline.store.save(stage.name, stage.key(paths), paths[stage.output])
+            pipeline.ran.append(stage.name)
+    return len(complete) == len(STREAMED)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Original video (.mp4) or already extracted *_audio.wav")
+    parser.add_argument("--until", choices=[stage.name for stage in STAGES],
+                        help="Last stage to run (default: all)")
+    parser.add_argument("--force", nargs="*", default=[], metavar="STAGE",
+                        help="Rerun these stages even if they are up to date")
+    parser.add_argument("--store", help="Artifact store directory (default: .artifacts next to the source)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Run step2 → step4 concurrently, connected by bounded queues (see stream_pipeline.py)")
+    parser.add_argument("--segments", action="store_true",
+                        help="Write the transcription and translation as columnar segment stores (app/segment_store.py)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    source = Path(args.source)
+    if not source.exists():
+        print(f"❌ Source not found: {source}")
+        sys.exit(1)
+    paths = artifact_paths(source)
+    store = ArtifactStore(args.store or source.parent / '.artifacts')
+
+    stages = STAGES
+    if source.name.endswith(ARTIFACTS["audio"]):
+        # Started from audio: it is the source, there is nothing to extract
+        stages = [stage for stage in STAGES if stage.name != "step1"]
+    if args.segments:
+        stages, paths = with_segment_store(stages, paths)
+
+    # Translations persist across runs, so after a glossary edit step3 only
+    # sends the segments whose prompt (i.e. matched terms) changed
+    os.environ.setdefault('TRANSLATION_CACHE_DB', str(store.root / 'translations.sqlite'))
+    # Likewise synthesized audio: a new timing or voice for some lines re-synthesizes only those
+    os.environ.setdefault('TTS_CACHE_DIR', str(store.root / 'tts'))
+
+    pipeline = OfflinePipeline(stages, paths, store)
+    if args.stream:
+        success = run_streaming(pipeline, paths)
+    else:
+        success = pipeline.run([args.until] if args.until else None, force=args.force)
+
+    print(f"\n{'✅' if success else '❌'} Pipeline {'completed' if success else 'failed'}")
+    print(f"  ▶️ Ran: {', '.join(pipeline.ran) or '-'}")
+    print(f"  ♻️ Reused: {', '.join(pipeline.reused) or '-'}")
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,100 @@
 import os
 import sys
 import json
+import asyncio
+import threading
+import time
+import wave
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from dotenv import load_dotenv
 import azure.cognitiveservices.speech as speechsdk
 from datetime import timedelta
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.chunked_transcription import frame_energies_db, plan_chunks, reconcile_speakers, stitch_chunks
+from app.media_source import FfmpegPcmSource, PcmFeeder, probe_duration_ms
+from app.run_journal import RunJournal, fingerprint
+from app.segment_store import STORE_SUFFIX, save_transcript
+
 load_dotenv()
 
 # Load glossary
-GLOSSARY_PATH = Path(__file__).parent / 'config' / 'translation_glossary.json'
+GLOSSARY_PATH = Path(__file__).parent.parent / 'config' / 'translation_glossary.json'
+
+# Long recordings are split at pauses into chunks transcribed by parallel
+# sessions (1 worker = the whole file in one session, in real time)
+TRANSCRIBE_WORKERS = int(os.getenv('TRANSCRIBE_WORKERS', '1'))
+TRANSCRIBE_CHUNK_S = float(os.getenv('TRANSCRIBE_CHUNK_S', '600'))
+TRANSCRIBE_OVERLAP_S = float(os.getenv('TRANSCRIBE_OVERLAP_S', '10'))
+
+# A session gets this many times its audio length (plus a margin) before it is
+# considered hung; progress is printed every PROGRESS_INTERVAL_S meanwhile
+TRANSCRIBE_TIMEOUT_FACTOR = float(os.getenv('TRANSCRIBE_TIMEOUT_FACTOR', '2'))
+PROGRESS_INTERVAL_S = 15
+
+
+def session_timeout_s(audio_ms: float) -> float:
+    return audio_ms / 1000 * TRANSCRIBE_TIMEOUT_FACTOR + 120
+
+
+class TranscriptionProgress:
+    """Progress from the latest recognized offset of each session: percent, ETA and real-time factor.
+
+    total_ms is the audio all sessions have to get through, done_ms the part
+    a previous run already transcribed. RTF = wall time / audio transcribed
+    in this run: ~1 for one real-time session, lower with parallel chunks.
+    """
+    
+    def __init__(self, total_ms: float, done_ms: float = 0):
+        self.total_ms = total_ms
+        self.done_ms = done_ms
+        self.started = time.monotonic()
+        self.positions = {}
+        self.lock = threading.Lock()
+    
+    def update(self, session, position_ms: float):
+        """Audio of session transcribed so far in this run (ms from where the session started)"""
+        with self.lock:
+            self.positions[session] = max(self.positions.get(session, 0), position_ms)
+    
+    @property
+    def processed_ms(self) -> float:
+        with self.lock:
+            return sum(self.positions.values())
+    
+    @property
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started
+    
+    @property
+    def rtf(self) -> float:
+        processed_s = self.processed_ms / 1000
+        return self.elapsed_s / processed_s if processed_s else 0.0
+    
+    def report(self):
+        processed_ms = self.processed_ms
+        percent = min(100.0, (self.done_ms + processed_ms) * 100 / self.total_ms) if self.total_ms else 100.0
+        line = f"  ⏳ {percent:.1f}% [{format_time((self.done_ms + processed_ms) * 10000)} / {format_time(self.total_ms * 10000)}]"
+        if processed_ms:
+            remaining_s = max(0.0, self.total_ms - self.done_ms - processed_ms) / 1000 * self.rtf
+            line += f", RTF {self.rtf:.2f}, осталось ~{timedelta(seconds=int(remaining_s))}"
+        print(line)
+    
+    def summary(self, sessions: int):
+        print(f"⏱️ Распознано {self.processed_ms / 60000:.1f} мин аудио за {timedelta(seconds=int(self.elapsed_s))}: "
+              f"RTF {self.rtf:.2f} ({sessions} сесс.)")
+
+
+def wait_for(done: threading.Event, progress: TranscriptionProgress, timeout_s: float) -> bool:
+    """Wait for done, reporting progress meanwhile; False if it timed out"""
+    deadline = time.monotonic() + timeout_s
+    while not done.wait(min(PROGRESS_INTERVAL_S, max(0.0, deadline - time.monotonic()))):
+        if time.monotonic() >= deadline:
+            return False
+        progress.report()
+    return True
 
 
 def load_glossary():
@@ -69,27 +154,56 @@ def format_time(milliseconds):
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{ms:03d}"
 
 
-def transcribe_audio(audio_path: str, output_json: str):
-    """Транскрибирует аудио с определением спикеров"""
-    
-    audio_file = Path(audio_path)
-    if not audio_file.exists():
-        print(f"❌ Аудио не найдено: {audio_path}")
-        return False
+def is_wav(audio_file: Path) -> bool:
+    return Path(audio_file).suffix.lower() == '.wav'
+
+
+def open_audio_from(audio_file: Path, start_ms: float, end_ms: float = None, tee_path: Path = None):
+    """Audio config for the file from start_ms to end_ms (whole file by default).
+
+    The SDK can't seek in a file, so a resumed run or a chunk pushes its PCM
+    frames into a stream. Anything that is not a WAV (the video itself) is
+    decoded by ffmpeg straight into the stream, with no intermediate WAV
+    unless tee_path asks for one. Returns (audio_config, PcmFeeder or None).
+    """
+    if not is_wav(audio_file):
+        stream = speechsdk.audio.PushAudioInputStream(stream_format=speechsdk.audio.AudioStreamFormat(
+            samples_per_second=16000, bits_per_sample=16, channels=1
+        ))
+        source = FfmpegPcmSource(audio_file, start_ms, end_ms, tee_path=tee_path)
+        return speechsdk.audio.AudioConfig(stream=stream), PcmFeeder(source.blocks(), stream)
     
-    print(f"🎵 Аудио: {audio_file.name}")
-    print(f"📝 Начинаем транскрипцию с определением спикеров...")
+    if not start_ms and end_ms is None:
+        return speechsdk.audio.AudioConfig(filename=str(audio_file)), None
     
-    # Load glossary
-    print(f"📚 Загружаем glossary...")
-    glossary = load_glossary()
-    if glossary:
-        print(f"✅ Glossary загружен: {len(glossary)} терминов")
-    else:
-        print(f"⚠️ Glossary не загружен, продолжаем без него")
+    wav = wave.open(str(audio_file), 'rb')
+    stream_format = speechsdk.audio.AudioStreamFormat(
+        samples_per_second=wav.getframerate(),
+        bits_per_sample=wav.getsampwidth() * 8,
+        channels=wav.getnchannels()
+    )
+    stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+    wav.setpos(min(wav.getnframes(), int(start_ms * wav.getframerate() / 1000)))
+    end_frame = wav.getnframes() if end_ms is None else min(wav.getnframes(), int(end_ms * wav.getframerate() / 1000))
     
-    print(f"⏳ Это может занять несколько минут...")
+    def blocks():
+        try:
+            while wav.tell() < end_frame:
+                frames = wav.readframes(min(wav.getframerate() // 10, end_frame - wav.tell()))
+                if not frames:
+                    break
+                yield frames
+        finally:
+            wav.close()
     
+    return speechsdk.audio.AudioConfig(stream=stream), PcmFeeder(blocks(), stream)
+
+
+def create_transcriber(audio_file: Path, glossary: dict, start_ms: float = 0, end_ms: float = None, tee_path: Path = None):
+    """ConversationTranscriber (diarization, glossary phrase hints) for the file from start_ms to end_ms.
+
+    Returns (transcriber, feeder thread or None); start the feeder right after start_transcribing_async().
+    """
     # Configure Azure Speech
     speech_config = speechsdk.SpeechConfig(
         subscription=os.getenv('AZURE_SPEECH_KEY'),
@@ -105,7 +219,7 @@ def transcribe_audio(audio_path: str, output_json: str):
     )
     
     # Audio config
-    audio_config = speechsdk.audio.AudioConfig(filename=str(audio_file))
+    audio_config, feeder = open_audio_from(audio_file, start_ms, end_ms, tee_path)
     
     # Create conversation transcriber for speaker diarization
     conversation_transcriber = speechsdk.transcription.ConversationTranscriber(
@@ -136,63 +250,158 @@ def transcribe_audio(audio_path: str, output_json: str):
             print(f"⚠️ Не удалось добавить phrase hints: {e}")
             print(f"   Продолжаем транскрипцию без phrase hints")
     
+    return conversation_transcriber, feeder
+
+
+def segment_from_result(result, base_offset: int = 0) -> dict:
+    """Segment dict of a recognized result; base_offset (100ns ticks) is where its audio started"""
+    # Get speaker ID
+    speaker_id = result.speaker_id if hasattr(result, 'speaker_id') else "Unknown"
+    
+    # Get timing (offsets count from base_offset)
+    offset = result.offset + base_offset
+    offset_ms = offset / 10000  # Convert from 100ns ticks to ms
+    duration_ms = result.duration / 10000
+    
+    # Get text
+    text = result.text
+    
+    # Try to get detailed results with confidence
+    try:
+        detailed = json.loads(result.json)
+        best = detailed.get('NBest', [{}])[0]
+        confidence = best.get('Confidence', 0.0)
+        # Word offsets count from the start of the session's audio too
+        words = [dict(word, Offset=word.get('Offset', 0) + base_offset) for word in best.get('Words', [])]
+    except:
+        confidence = 0.0
+        words = []
+    
+    return {
+        "speaker": speaker_id,
+        "text": text,
+        "start_time": format_time(offset),
+        "end_time": format_time(offset + result.duration),
+        "start_ms": offset_ms,
+        "end_ms": offset_ms + duration_ms,
+        "duration_ms": duration_ms,
+        "confidence": confidence,
+        "words": words
+    }
+
+
+def assign_gender(speakers: dict, result: dict):
+    """Gender of the result's speaker, assigned on first appearance"""
+    speaker = result['speaker']
+    if speaker not in speakers:
+        # Alternate gender assignment (simple heuristic)
+        speakers[speaker] = "female" if len(speakers) % 2 == 0 else "male"
+    result['gender'] = speakers[speaker]
+
+
+def transcription_output(audio_file: Path, transcription_results: list, speakers: dict, glossary: dict) -> dict:
+    """Contents of the *_transcription.json file"""
+    return {
+        "audio_file": str(audio_file),
+        "language": "ru-RU",
+        "total_segments": len(transcription_results),
+        "speakers": speakers,
+        "glossary_used": bool(glossary),
+        "glossary_terms_count": len(glossary) if glossary else 0,
+        "segments": transcription_results
+    }
+
+
+async def stream_transcription(audio_file: Path, glossary: dict):
+    """Yield segments (gender included) as soon as the transcriber recognizes them.
+
+    SDK callbacks run on the SDK's thread and hand results to the event loop
+    with call_soon_threadsafe. Recognition runs at the pace of the audio, so
+    this queue stays short; backpressure starts at the next stage.
+    """
+    loop = asyncio.get_running_loop()
+    results = asyncio.Queue()
+    speakers = {}
+    conversation_transcriber, feeder = create_transcriber(audio_file, glossary)
+    
+    def transcribed_handler(evt):
+        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            loop.call_soon_threadsafe(results.put_nowait, segment_from_result(evt.result))
+    
+    def stopped_handler(evt):
+        if getattr(evt, 'reason', None) == speechsdk.CancellationReason.Error:
+            loop.call_soon_threadsafe(results.put_nowait, RuntimeError(f"Транскрипция отменена: {evt.error_details}"))
+        loop.call_soon_threadsafe(results.put_nowait, None)
+    
+    conversation_transcriber.transcribed.connect(transcribed_handler)
+    conversation_transcriber.session_stopped.connect(stopped_handler)
+    conversation_transcriber.canceled.connect(stopped_handler)
+    
+    conversation_transcriber.start_transcribing_async()
+    if feeder:
+        feeder.start()
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            if isinstance(result, Exception):
+                raise result
+            assign_gender(speakers, result)
+            yield result
+    finally:
+        conversation_transcriber.stop_transcribing_async()
+
+
+def transcribe_sequential(audio_file: Path, glossary: dict, journal: RunJournal, duration_ms: float, on_segment,
+                          tee_path: Path = None):
+    """Whole file in one session (resuming after the last journaled segment); returns (results, failed).
+
+    on_segment is called with every segment in order, those of the previous run first.
+    tee_path: where to also save the decoded audio of a video (only on a full, not resumed, pass).
+    """
+    transcription_results = sorted(journal.values(), key=lambda result: result['start_ms'])
+    resume_ms = transcription_results[-1]['end_ms'] if transcription_results else 0
+    if resume_ms:
+        print(f"📓 {len(transcription_results)} сегментов из прошлого запуска, продолжаем с {format_time(resume_ms * 10000)}")
+    for result in transcription_results:
+        on_segment(result)
+    
+    if tee_path and resume_ms:
+        print(f"⚠️ Продолжение с середины: {tee_path.name} не сохраняется")
+        tee_path = None
+    conversation_transcriber, feeder = create_transcriber(audio_file, glossary, resume_ms, tee_path=tee_path)
+    progress = TranscriptionProgress(duration_ms, resume_ms)
+    
     # Storage for results
-    transcription_results = []
-    all_done = False
+    done = threading.Event()
+    failed = False
     
     def transcribed_handler(evt):
         """Handle transcribed segments"""
         if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-            # Get speaker ID
-            speaker_id = evt.result.speaker_id if hasattr(evt.result, 'speaker_id') else "Unknown"
-            
-            # Get timing
-            offset_ms = evt.result.offset / 10000  # Convert from 100ns ticks to ms
-            duration_ms = evt.result.duration / 10000
-            
-            # Get text
-            text = evt.result.text
-            
-            # Try to get detailed results with confidence
-            try:
-                import json
-                detailed = json.loads(evt.result.json)
-                best = detailed.get('NBest', [{}])[0]
-                confidence = best.get('Confidence', 0.0)
-                words = best.get('Words', [])
-            except:
-                confidence = 0.0
-                words = []
-            
-            result = {
-                "speaker": speaker_id,
-                "text": text,
-                "start_time": format_time(evt.result.offset),
-                "end_time": format_time(evt.result.offset + evt.result.duration),
-                "start_ms": offset_ms,
-                "end_ms": offset_ms + duration_ms,
-                "duration_ms": duration_ms,
-                "confidence": confidence,
-                "words": words
-            }
+            result = segment_from_result(evt.result, int(resume_ms * 10000))
             
             transcription_results.append(result)
+            journal.record(result['start_ms'], result)
+            on_segment(result)
+            progress.update("file", result['end_ms'] - resume_ms)
             
             # Progress indicator
-            print(f"  [{result['start_time']}] {speaker_id}: {text[:80]}...")
+            print(f"  [{result['start_time']}] {result['speaker']}: {result['text'][:80]}...")
     
     def session_stopped_handler(evt):
         """Handle session stopped"""
-        nonlocal all_done
-        all_done = True
+        done.set()
     
     def canceled_handler(evt):
         """Handle cancellation"""
         print(f"❌ Транскрипция отменена: {evt.reason}")
+        nonlocal failed
         if evt.reason == speechsdk.CancellationReason.Error:
             print(f"❌ Ошибка: {evt.error_details}")
-        nonlocal all_done
-        all_done = True
+            failed = True
+        done.set()
     
     # Connect callbacks
     conversation_transcriber.transcribed.connect(transcribed_handler)
@@ -201,39 +410,184 @@ def transcribe_audio(audio_path: str, output_json: str):
     
     # Start transcription
     conversation_transcriber.start_transcribing_async()
+    if feeder:
+        feeder.start()
     
     # Wait for completion
-    import time
-    while not all_done:
-        time.sleep(0.5)
+    if not wait_for(done, progress, session_timeout_s(duration_ms - resume_ms)):
+        print(f"❌ Транскрипция не завершилась за {session_timeout_s(duration_ms - resume_ms):.0f}s")
+        failed = True
     
     conversation_transcriber.stop_transcribing_async()
+    if feeder and feeder.error:
+        print(f"❌ Ошибка чтения аудио: {feeder.error}")
+        failed = True
+    progress.summary(1)
+    
+    return transcription_results, failed
+
+
+def transcribe_chunk(audio_file: Path, glossary: dict, chunk: dict, progress: TranscriptionProgress = None) -> list:
+    """Transcribe one chunk in its own session (blocking); segment times are file-global"""
+    conversation_transcriber, feeder = create_transcriber(audio_file, glossary, chunk['start_ms'], chunk['end_ms'])
+    results = []
+    errors = []
+    done = threading.Event()
+    
+    def transcribed_handler(evt):
+        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            results.append(segment_from_result(evt.result, int(chunk['start_ms'] * 10000)))
+            if progress:
+                progress.update(chunk['index'], results[-1]['end_ms'] - chunk['start_ms'])
+    
+    def canceled_handler(evt):
+        if evt.reason == speechsdk.CancellationReason.Error:
+            errors.append(evt.error_details)
+        done.set()
+    
+    conversation_transcriber.transcribed.connect(transcribed_handler)
+    conversation_transcriber.session_stopped.connect(lambda evt: done.set())
+    conversation_transcriber.canceled.connect(canceled_handler)
+    
+    conversation_transcriber.start_transcribing_async()
+    feeder.start()
+    timeout_s = session_timeout_s(chunk['end_ms'] - chunk['start_ms'])
+    if not done.wait(timeout_s):
+        errors.append(f"no result in {timeout_s:.0f}s")
+    conversation_transcriber.stop_transcribing_async()
+    if feeder.error:
+        errors.append(str(feeder.error))
+    
+    if errors:
+        raise RuntimeError(errors[0])
+    if progress:
+        progress.update(chunk['index'], chunk['end_ms'] - chunk['start_ms'])
+    return results
+
+
+def transcribe_parallel(audio_file: Path, glossary: dict, journal: RunJournal):
+    """Split the file at pauses and transcribe the chunks concurrently; returns (results, failed).
+
+    Chunks overlap by TRANSCRIBE_OVERLAP_S: the overlap is where speaker ids
+    of neighbouring chunks are matched and duplicate words are dropped.
+    Finished chunks are journaled, so a rerun only transcribes the rest.
+    """
+    levels, duration_ms = frame_energies_db(audio_file)
+    chunks = plan_chunks(levels, 100, duration_ms, TRANSCRIBE_CHUNK_S * 1000, TRANSCRIBE_OVERLAP_S * 1000)
+    print(f"✂️ {len(chunks)} чанков по ~{TRANSCRIBE_CHUNK_S / 60:.0f} мин, {TRANSCRIBE_WORKERS} сессий параллельно")
+    
+    chunk_results = [journal.get(f"chunk-{chunk['index']}") for chunk in chunks]
+    if any(results is not None for results in chunk_results):
+        print(f"📓 {sum(results is not None for results in chunk_results)} чанков из прошлого запуска")
+    failed = False
+    
+    # Overlaps are transcribed twice: progress counts all the audio the sessions hear
+    chunk_ms = [chunk['end_ms'] - chunk['start_ms'] for chunk in chunks]
+    progress = TranscriptionProgress(
+        sum(chunk_ms),
+        sum(ms for ms, results in zip(chunk_ms, chunk_results) if results is not None)
+    )
+    
+    with ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS) as executor:
+        futures = {
+            executor.submit(transcribe_chunk, audio_file, glossary, chunk, progress): chunk
+            for chunk, results in zip(chunks, chunk_results) if results is None
+        }
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=PROGRESS_INTERVAL_S, return_when=FIRST_COMPLETED)
+            if not finished:
+                progress.report()
+            for future in finished:
+                chunk = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"❌ Чанк {chunk['index'] + 1}/{len(chunks)}: {e}")
+                    failed = True
+                    continue
+                chunk_results[chunk['index']] = results
+                journal.record(f"chunk-{chunk['index']}", results)
+                print(f"  ✅ Чанк {chunk['index'] + 1}/{len(chunks)} "
+                      f"[{format_time(chunk['start_ms'] * 10000)} - {format_time(chunk['end_ms'] * 10000)}]: "
+                      f"{len(results)} сегментов")
+    
+    progress.summary(TRANSCRIBE_WORKERS)
+    
+    # Failed chunks leave a gap; the journal keeps the rest for the rerun
+    chunk_results = [results or [] for results in chunk_results]
+    reconcile_speakers(chunks, chunk_results)
+    return stitch_chunks(chunks, chunk_results, format_time), failed
+
+
+def transcribe_audio(audio_path: str, output_json: str, tee_wav: str = None):
+    """Транскрибирует аудио с определением спикеров.
+
+    audio_path может быть и видео: тогда ffmpeg декодирует его прямо в распознавание,
+    без промежуточного WAV (tee_wav — куда всё же сохранить аудио для кэша).
+    """
+    
+    audio_file = Path(audio_path)
+    if not audio_file.exists():
+        print(f"❌ Аудио не найдено: {audio_path}")
+        return False
+    
+    print(f"🎵 Аудио: {audio_file.name}")
+    print(f"📝 Начинаем транскрипцию с определением спикеров...")
     
-    # Infer gender for each speaker
+    # Load glossary
+    print(f"📚 Загружаем glossary...")
+    glossary = load_glossary()
+    if glossary:
+        print(f"✅ Glossary загружен: {len(glossary)} терминов")
+    else:
+        print(f"⚠️ Glossary не загружен, продолжаем без него")
+    
+    print(f"⏳ Это может занять несколько минут...")
+    
+    # Long recordings: chunks in parallel sessions instead of one real-time pass
+    # Chunks are cut by the levels of the WAV: a piped video is one session
+    duration_ms = probe_duration_ms(audio_file) or 0
+    parallel = is_wav(audio_file) and TRANSCRIBE_WORKERS > 1 and duration_ms > TRANSCRIBE_CHUNK_S * 1500
+    if not is_wav(audio_file):
+        print(f"🎬 ffmpeg → распознавание напрямую, без промежуточного WAV")
+    
+    # Recognized segments (or chunks) are journaled as they arrive; a rerun
+    # after a crash keeps them and transcribes only what is missing
+    journal = RunJournal(
+        Path(output_json).with_suffix('.journal.jsonl'),
+        fingerprint(audio_file, GLOSSARY_PATH, *((TRANSCRIBE_CHUNK_S, TRANSCRIBE_OVERLAP_S) if parallel else ()))
+    )
+    
+    # Segments are also appended to a JSONL file as soon as they are final, so
+    # downstream tools can tail it (parallel chunks are only final once stitched)
+    segments_path = Path(output_json).with_suffix('.jsonl')
     speakers = {}
-    for result in transcription_results:
-        speaker = result['speaker']
-        if speaker not in speakers:
-            # Alternate gender assignment (simple heuristic)
-            gender = "female" if len(speakers) % 2 == 0 else "male"
-            speakers[speaker] = gender
-            result['gender'] = gender
+    with open(segments_path, 'w', encoding='utf-8') as segments_file:
+        def on_segment(result):
+            # Infer gender for each speaker
+            assign_gender(speakers, result)
+            segments_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+            segments_file.flush()
+        
+        if parallel:
+            transcription_results, failed = transcribe_parallel(audio_file, glossary, journal)
+            for result in transcription_results:
+                on_segment(result)
         else:
-            result['gender'] = speakers[speaker]
-    
-    # Save results
-    output_data = {
-        "audio_file": str(audio_file),
-        "language": "ru-RU",
-        "total_segments": len(transcription_results),
-        "speakers": speakers,
-        "glossary_used": bool(glossary),
-        "glossary_terms_count": len(glossary) if glossary else 0,
-        "segments": transcription_results
-    }
+            transcription_results, failed = transcribe_sequential(
+                audio_file, glossary, journal, duration_ms, on_segment,
+                Path(tee_wav) if tee_wav and not is_wav(audio_file) else None
+            )
+    journal.close()
     
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    # Save results (JSON, or the columnar segment store for a *.segments path)
+    output_data = transcription_output(audio_file, transcription_results, speakers, glossary)
+    save_transcript(output_json, output_data)
+    if failed:
+        print(f"⚠️ Транскрипция прервана: {journal.path.name} сохранён, повторный запуск продолжит с места остановки")
+    else:
+        journal.finish()
     
     print(f"\n✅ Транскрипция завершена!")
     print(f"📊 Сегментов: {len(transcription_results)}")
@@ -243,18 +597,30 @@ def transcribe_audio(audio_path: str, output_json: str):
     if glossary:
         print(f"📚 Использован glossary: {len(glossary)} терминов")
     print(f"💾 Сохранено: {output_json}")
+    print(f"💾 Сегменты (JSONL): {segments_path}")
     
-    return True
+    # A partial result is a failure, so run_pipeline.py doesn't store it as up to date
+    return not failed
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python step2_transcribe.py <audio_file>")
+    args = [arg for arg in sys.argv[1:] if arg not in ('--tee-wav', '--segments')]
+    if not args:
+        print("Usage: python step2_transcribe.py <audio_file | video_file> [--tee-wav] [--segments]")
         print("Example: python step2_transcribe.py videos/original_audio.wav")
+        print("         python step2_transcribe.py videos/original.mp4 --tee-wav  # also saves original_audio.wav")
+        print("         python step2_transcribe.py videos/original_audio.wav --segments  # original_transcription.segments")
         sys.exit(1)
     
-    audio_path = sys.argv[1]
-    output_json = audio_path.replace('_audio.wav', '_transcription.json')
+    audio_path = args[0]
+    # --segments: write the columnar segment store (app/segment_store.py) instead of JSON
+    suffix = STORE_SUFFIX if '--segments' in sys.argv else '.json'
+    if audio_path.endswith('_audio.wav'):
+        output_json = audio_path[:-len('_audio.wav')] + '_transcription' + suffix
+    else:
+        # Piped straight from the video
+        output_json = str(Path(audio_path).with_suffix('')) + '_transcription' + suffix
+    tee_wav = str(Path(audio_path).with_suffix('')) + '_audio.wav' if '--tee-wav' in sys.argv else None
     
-    success = transcribe_audio(audio_path, output_json)
+    success = transcribe_audio(audio_path, output_json, tee_wav)
     sys.exit(0 if success else 1)
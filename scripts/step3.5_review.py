@@ -14,6 +14,11 @@ from dotenv import load_dotenv
 from openai import AzureOpenAI
 import time
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.run_journal import RunJournal, fingerprint
+from app.segment_store import load_transcript
+
 load_dotenv()
 
 # Azure OpenAI config
@@ -22,6 +27,9 @@ AZURE_OPENAI_ENDPOINT = os.getenv('AZURE_OPENAI_ENDPOINT')
 AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY')
 AZURE_OPENAI_API_VERSION = "2024-08-01-preview"
 
+# Segments reviewed together (10 at a time for better context)
+REVIEW_BATCH_SIZE = 10
+
 
 def analyze_and_fix_translations(client, segments_batch, batch_num):
     """Analyze batch of segments for consistency and fix issues"""
@@ -96,6 +104,36 @@ Return only valid JSON, no explanations."""
         return None
 
 
+def apply_fixes(batch, fixes):
+    """Apply GPT's fixes to the batch's segments in place"""
+    fixes_dict = {fix['id']: fix for fix in fixes}
+    
+    for seg in batch:
+        seg_id = seg['segment_id']
+        if seg_id not in fixes_dict:
+            continue
+        fix = fixes_dict[seg_id]
+        
+        # Check if anything changed
+        original_changed = 'original_fixed' in fix and fix['original_fixed'] != seg['original']
+        translation_changed = 'translation_fixed' in fix and fix['translation_fixed'] != seg['translation']
+        
+        if original_changed or translation_changed:
+            print(f"    ✏️ Fixed segment {seg_id}:")
+            
+            if original_changed:
+                print(f"       Original: {seg['original'][:60]}...")
+                print(f"       Fixed:    {fix['original_fixed'][:60]}...")
+            
+            if translation_changed:
+                print(f"       Translation: {seg['translation'][:60]}...")
+                print(f"       Fixed:       {fix['translation_fixed'][:60]}...")
+        
+        # Update segment
+        seg['original'] = fix.get('original_fixed', seg['original'])
+        seg['translation'] = fix.get('translation_fixed', seg['translation'])
+
+
 def review_and_fix_translations(input_path: str, output_path: str):
     """Review and fix translation file"""
     
@@ -107,10 +145,11 @@ def review_and_fix_translations(input_path: str, output_path: str):
     
     print(f"📖 Loading translations: {input_file.name}")
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # JSON or columnar segment store (app/segment_store.py); fixes are applied
+    # in place, so store segments are copied into dicts
+    data = load_transcript(input_file)
     
-    segments = data.get('segments', [])
+    segments = [dict(segment) for segment in data.get('segments', [])]
     print(f"📊 Total segments: {len(segments)}")
     
     # Initialize OpenAI client
@@ -121,53 +160,43 @@ def review_and_fix_translations(input_path: str, output_path: str):
         azure_endpoint=AZURE_OPENAI_ENDPOINT
     )
     
-    # Process in batches (10 segments at a time for better context)
+    # Process in batches
     print(f"\n🔍 Analyzing translations for consistency...")
-    batch_size = 10
+    batch_size = REVIEW_BATCH_SIZE
     fixed_segments = []
+    failed_batches = 0
+    
+    # Reviewed batches are journaled, so a rerun only reviews what is left
+    journal = RunJournal(
+        Path(output_path).with_suffix('.journal.jsonl'),
+        fingerprint(input_path, AZURE_OPENAI_DEPLOYMENT, batch_size)
+    )
+    if len(journal):
+        print(f"  📓 {len(journal)} batches already reviewed in a previous run")
     
     for i in range(0, len(segments), batch_size):
         batch = segments[i:i + batch_size]
         batch_num = (i // batch_size) + 1
         total_batches = (len(segments) + batch_size - 1) // batch_size
         
+        if i in journal:
+            fixed_segments.extend(journal.get(i))
+            continue
+        
         print(f"  Processing batch {batch_num}/{total_batches} (segments {i+1}-{min(i+batch_size, len(segments))})...")
         
         # Get fixes from GPT
         fixes = analyze_and_fix_translations(client, batch, batch_num)
         
         if fixes:
-            # Apply fixes
-            fixes_dict = {fix['id']: fix for fix in fixes}
+            apply_fixes(batch, fixes)
+            fixed_segments.extend(batch)
             
-            for seg in batch:
-                seg_id = seg['segment_id']
-                if seg_id in fixes_dict:
-                    fix = fixes_dict[seg_id]
-                    
-                    # Check if anything changed
-                    original_changed = 'original_fixed' in fix and fix['original_fixed'] != seg['original']
-                    translation_changed = 'translation_fixed' in fix and fix['translation_fixed'] != seg['translation']
-                    
-                    if original_changed or translation_changed:
-                        print(f"    ✏️ Fixed segment {seg_id}:")
-                        
-                        if original_changed:
-                            print(f"       Original: {seg['original'][:60]}...")
-                            print(f"       Fixed:    {fix['original_fixed'][:60]}...")
-                        
-                        if translation_changed:
-                            print(f"       Translation: {seg['translation'][:60]}...")
-                            print(f"       Fixed:       {fix['translation_fixed'][:60]}...")
-                    
-                    # Update segment
-                    seg['original'] = fix.get('original_fixed', seg['original'])
-                    seg['translation'] = fix.get('translation_fixed', seg['translation'])
-                
-                fixed_segments.append(seg)
+            journal.record(i, batch)
         else:
-            # If batch failed, keep originals
+            # If batch failed, keep originals (not journaled: a rerun retries it)
             fixed_segments.extend(batch)
+            failed_batches += 1
         
         # Rate limiting
         time.sleep(1)
@@ -181,6 +210,12 @@ def review_and_fix_translations(input_path: str, output_path: str):
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     
+    if failed_batches:
+        journal.close()
+        print(f"\n⚠️ {failed_batches} batches kept unreviewed: rerun to retry only those")
+    else:
+        journal.finish()
+    
     print(f"\n✅ Review completed!")
     print(f"💾 Saved to: {output_path}")
     
@@ -189,17 +224,18 @@ def review_and_fix_translations(input_path: str, output_path: str):
     changes_count = sum(1 for seg in fixed_segments if seg.get('_fixed', False))
     print(f"  Changed segments: {changes_count}")
     
-    return True
+    # A partial result is a failure, so run_pipeline.py doesn't store it as up to date
+    return not failed_batches
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python step3.5_review.py <translated_json>")
+        print("Usage: python step3.5_review.py <translated_json | translated.segments>")
         print("Example: python step3.5_review.py videos/original_translated.json")
         sys.exit(1)
     
     input_path = sys.argv[1]
-    output_path = input_path.replace('_translated.json', '_translated_fixed.json')
+    output_path = input_path.rsplit('_translated', 1)[0] + '_translated_fixed.json'
     
     success = review_and_fix_translations(input_path, output_path)
     sys.exit(0 if success else 1)
@@ -9,11 +9,20 @@
 import os
 import sys
 import json
+import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
 import time
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.glossary_matcher import GlossaryMatcher
+from app.run_journal import RunJournal, fingerprint
+from app.segment_store import STORE_SUFFIX, load_transcript, save_transcript
+from app.translation_cache import TranslationCache
+from app.translation_engine import BatchTranslationEngine, RateLimiter, retry_after_seconds
+
 load_dotenv()
 
 # Azure OpenAI config
@@ -22,8 +31,29 @@ AZURE_OPENAI_ENDPOINT = os.getenv('AZURE_OPENAI_ENDPOINT')
 AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT_QUALITY')
 AZURE_OPENAI_API_VERSION = "2024-08-01-preview"
 
+# Translation cache: repeated phrases are translated once, across runs if the DB is set
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB')
+
+# Concurrent requests, kept under the deployment's quotas (empty = no limit)
+TRANSLATION_CONCURRENCY = int(os.getenv('TRANSLATION_CONCURRENCY', '8'))
+AZURE_OPENAI_RPM = float(os.getenv('AZURE_OPENAI_RPM') or 0)
+AZURE_OPENAI_TPM = float(os.getenv('AZURE_OPENAI_TPM') or 0)
+MAX_TOKENS = 2000
+
+# Consecutive segments packed into one request (1 = one request per segment)
+TRANSLATION_BATCH_SIZE = int(os.getenv('TRANSLATION_BATCH_SIZE', '10'))
+TRANSLATION_BATCH_TOKENS = int(os.getenv('TRANSLATION_BATCH_TOKENS', '1500'))
+
+BATCH_INSTRUCTIONS = """
+BATCH MODE:
+The user message is a JSON object {"segments": [{"id": ..., "text": "..."}, ...]} with consecutive segments of one talk.
+Translate every segment separately: do not merge, split, reorder or skip segments.
+Return ONLY a JSON object: {"translations": [{"id": <same id>, "translation": "..."}, ...]} with one entry per segment.
+"""
+
 # Load glossary
-GLOSSARY_PATH = Path(__file__).parent / 'config' / 'translation_glossary.json'
+GLOSSARY_PATH = Path(__file__).parent.parent / 'config' / 'translation_glossary.json'
 
 
 def load_glossary():
@@ -37,15 +67,12 @@ def load_glossary():
     return {}
 
 
-def build_glossary_context(glossary):
-    """Build glossary context for GPT prompt"""
+def build_glossary_context(matcher: GlossaryMatcher, terms: list):
+    """Build glossary context for GPT prompt from the terms found in a segment"""
     glossary_terms = []
     
-    for ru_term, data in glossary.items():
-        # Skip comment entries
-        if ru_term.startswith('_comment'):
-            continue
-            
+    for ru_term in terms:
+        data = matcher.terms[ru_term]
         en_term = data.get('en', '')
         alternatives = data.get('alternatives', [])
         description = data.get('description', '')
@@ -58,16 +85,15 @@ def build_glossary_context(glossary):
     
     if glossary_terms:
         context = "\n\nIMPORTANT TERMINOLOGY (use these exact translations):\n"
-        context += "\n".join(glossary_terms[:50])  # Limit to 50 terms to fit in context
+        context += "\n".join(glossary_terms)
         return context
     
     return ""
 
 
-def translate_text(client, text: str, glossary_context: str) -> str:
-    """Translate text using Azure OpenAI with glossary"""
-    
-    system_prompt = f"""You are a professional Russian to English translator.
+def build_system_prompt(glossary_context: str) -> str:
+    """System prompt with the segment's glossary terms"""
+    return f"""You are a professional Russian to English translator.
 
 RULES:
 1. Translate Russian to English accurately
@@ -80,27 +106,47 @@ RULES:
 8. Return ONLY the translation, no explanations
 {glossary_context}
 """
-    
+
+
+def estimate_tokens(system_prompt: str, text: str) -> int:
+    """Tokens Azure counts against TPM: a rough prompt estimate plus max_tokens"""
+    return (len(system_prompt) + len(text)) // 3 + MAX_TOKENS
+
+
+def record_usage(usage: dict, response, prompt_chars: int):
+    """Accumulate the tokens a response used (and the prompt size that cost them)"""
+    if usage is None or not response.usage:
+        return
+    usage['requests'] = usage.get('requests', 0) + 1
+    usage['prompt_tokens'] = usage.get('prompt_tokens', 0) + response.usage.prompt_tokens
+    usage['completion_tokens'] = usage.get('completion_tokens', 0) + response.usage.completion_tokens
+    usage['prompt_chars'] = usage.get('prompt_chars', 0) + prompt_chars
+
+
+async def translate_text_async(client, text: str, system_prompt: str, cache: TranslationCache = None,
+                               usage: dict = None) -> str:
+    """Translate text with the glossary prompt; rate limit errors are raised so the engine can retry them"""
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
-                {
-                    "role": "system",
-                    "content": system_prompt
-                },
-                {
-                    "role": "user",
-                    "content": text
-                }
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text}
             ],
             temperature=0.3,
-            max_tokens=2000
+            max_tokens=MAX_TOKENS
         )
+        record_usage(usage, response, len(system_prompt) + len(text))
         
-        return response.choices[0].message.content.strip()
+        translation = response.choices[0].message.content.strip()
+        if cache:
+            cache.put(text, AZURE_OPENAI_DEPLOYMENT, system_prompt, translation)
+        return translation
         
     except Exception as e:
+        if retry_after_seconds(e) is not None:
+            raise
+        
         error_str = str(e)
         
         # Check if content filter error
@@ -111,6 +157,335 @@ RULES:
         return f"[Translation error]"
 
 
+def make_batch(jobs: list, matcher: GlossaryMatcher) -> dict:
+    """One multi-segment request: shared prompt with the union of the segments' glossary terms"""
+    terms = list(dict.fromkeys(term for job in jobs for term in job['terms']))
+    payload = json.dumps(
+        {"segments": [{"id": job['index'] + 1, "text": job['text']} for job in jobs]},
+        ensure_ascii=False
+    )
+    input_tokens = len(payload) // 3
+    return {
+        "jobs": jobs,
+        "system_prompt": build_system_prompt(build_glossary_context(matcher, terms)) + BATCH_INSTRUCTIONS,
+        "payload": payload,
+        # Translations plus JSON overhead; a truncated answer fails validation and is re-split
+        "max_tokens": min(2 * MAX_TOKENS, 2 * input_tokens + 30 * len(jobs) + 100),
+    }
+
+
+def pack_batches(jobs: list, matcher: GlossaryMatcher, max_segments: int = TRANSLATION_BATCH_SIZE,
+                 max_tokens: int = TRANSLATION_BATCH_TOKENS) -> list:
+    """Group consecutive jobs into batches bounded by segment count and input tokens"""
+    batches = []
+    current = []
+    current_tokens = 0
+    for job in jobs:
+        tokens = len(job['text']) // 3
+        if current and (len(current) >= max_segments or current_tokens + tokens > max_tokens):
+            batches.append(make_batch(current, matcher))
+            current = []
+            current_tokens = 0
+        current.append(job)
+        current_tokens += tokens
+    if current:
+        batches.append(make_batch(current, matcher))
+    return batches
+
+
+def parse_batch_response(content: str, jobs: list):
+    """Translations keyed by job index, or None unless every segment came back exactly once"""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return None
+    items = data.get('translations') if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return None
+    
+    translations = {}
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        translation = item.get('translation')
+        if not isinstance(translation, str) or not translation.strip():
+            return None
+        translations[str(item.get('id'))] = translation.strip()
+    
+    expected = [str(job['index'] + 1) for job in jobs]
+    if len(items) != len(jobs) or set(translations) != set(expected):
+        return None
+    return {job['index']: translations[key] for job, key in zip(jobs, expected)}
+
+
+async def translate_batch_async(client, batch: dict, usage: dict = None):
+    """One multi-segment request; None if the answer doesn't validate (rate limits are raised)"""
+    try:
+        response = await client.chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT,
+            messages=[
+                {"role": "system", "content": batch['system_prompt']},
+                {"role": "user", "content": batch['payload']}
+            ],
+            temperature=0.3,
+            max_tokens=batch['max_tokens'],
+            response_format={"type": "json_object"}
+        )
+        record_usage(usage, response, len(batch['system_prompt']) + len(batch['payload']))
+        return parse_batch_response(response.choices[0].message.content or "", batch['jobs'])
+    except Exception as e:
+        if retry_after_seconds(e) is not None:
+            raise
+        # Content filter or server error: smaller batches isolate the culprit
+        return None
+
+
+async def translate_batches(client, jobs: list, matcher: GlossaryMatcher, limiter: RateLimiter,
+                            concurrency: int, cache: TranslationCache, done: dict, usage: dict,
+                            journal: RunJournal = None) -> list:
+    """Translate jobs in multi-segment requests, re-splitting batches that fail validation.
+
+    Translations go into done (keyed by job index); returns the jobs that
+    still need a single-segment request.
+    """
+    engine = BatchTranslationEngine(
+        translate=lambda batch: translate_batch_async(client, batch, usage),
+        limiter=limiter,
+        concurrency=concurrency,
+        fallback=lambda batch, error: None
+    )
+    
+    batches = pack_batches(jobs, matcher)
+    print(f"  📦 {len(jobs)} segments packed into {len(batches)} requests")
+    singles = []
+    while batches:
+        results = await engine.run(
+            batches,
+            estimate_tokens=lambda batch: (len(batch['system_prompt']) + len(batch['payload'])) // 3 + batch['max_tokens']
+        )
+        retry = []
+        for batch, translations in zip(batches, results):
+            batch_jobs = batch['jobs']
+            if translations is not None:
+                for job in batch_jobs:
+                    done[job['index']] = translations[job['index']]
+                    cache.put(job['text'], AZURE_OPENAI_DEPLOYMENT, job['system_prompt'], translations[job['index']])
+                    if journal:
+                        journal.record(job['index'], translations[job['index']])
+            elif len(batch_jobs) > 1:
+                usage['resplits'] = usage.get('resplits', 0) + 1
+                half = len(batch_jobs) // 2
+                retry += [make_batch(batch_jobs[:half], matcher), make_batch(batch_jobs[half:], matcher)]
+            else:
+                singles.append(batch_jobs[0])
+        batches = retry
+    
+    if singles:
+        print(f"  ↩️ {len(singles)} segments fall back to single-segment requests")
+    return singles
+
+
+async def translate_jobs(jobs: list, cache: TranslationCache, matcher: GlossaryMatcher = None,
+                         concurrency: int = TRANSLATION_CONCURRENCY, batch_size: int = TRANSLATION_BATCH_SIZE,
+                         usage: dict = None, journal: RunJournal = None) -> list:
+    """Translate segment jobs concurrently under the RPM/TPM quotas; results keep the jobs' order.
+
+    Segments already in the journal are not translated again; every new
+    translation is journaled as soon as it arrives (errors are not, so a rerun
+    retries them).
+    """
+    done = {}
+    if journal:
+        for job in jobs:
+            if job['index'] in journal:
+                done[job['index']] = journal.get(job['index'])
+        if done:
+            print(f"  📓 {len(done)} segments already translated in a previous run")
+    resumed = len(done)
+    for job in jobs:
+        if job['index'] in done:
+            continue
+        cached = cache.get(job['text'], AZURE_OPENAI_DEPLOYMENT, job['system_prompt'])
+        if cached is not None:
+            done[job['index']] = cached
+            if journal:
+                journal.record(job['index'], cached)
+    pending = [job for job in jobs if job['index'] not in done]
+    if len(done) > resumed:
+        print(f"  🗄️ {len(done) - resumed} segments served from cache")
+    
+    usage = usage if usage is not None else {}
+    usage['single_prompt_chars'] = sum(len(job['system_prompt']) + len(job['text']) for job in pending)
+    matcher = matcher or GlossaryMatcher({})
+    
+    # Retries are ours: the client must not sleep on 429 behind the limiter's back
+    client = AsyncAzureOpenAI(
+        api_key=AZURE_OPENAI_KEY,
+        api_version=AZURE_OPENAI_API_VERSION,
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        max_retries=0
+    )
+    # Batched and single-segment requests share the deployment's quota
+    limiter = RateLimiter(rpm=AZURE_OPENAI_RPM, tpm=AZURE_OPENAI_TPM)
+    
+    async def translate(job):
+        translation = await translate_text_async(client, job['text'], job['system_prompt'], cache, usage)
+        if journal and translation != "[Translation error]":
+            journal.record(job['index'], translation)
+        return translation
+    
+    def report(finished: int, total: int):
+        if finished % 10 == 0 or finished == total:
+            print(f"  Translated {finished}/{total} segments...")
+    
+    engine = BatchTranslationEngine(
+        translate=translate,
+        limiter=limiter,
+        concurrency=concurrency,
+        fallback=lambda job, error: "[Translation error]"
+    )
+    try:
+        if batch_size > 1 and pending:
+            pending = await translate_batches(client, pending, matcher, limiter, concurrency, cache, done, usage,
+                                              journal)
+        if pending:
+            results = await engine.run(
+                pending,
+                estimate_tokens=lambda job: estimate_tokens(job['system_prompt'], job['text']),
+                on_progress=report
+            )
+            for job, translation in zip(pending, results):
+                done[job['index']] = translation
+    finally:
+        await client.close()
+    
+    print(f"  📡 {usage.get('requests', 0)} successful requests, {limiter.throttled} rate limited, "
+          f"{limiter.wait_s:.0f}s waiting for quota")
+    
+    return [done[job['index']] for job in jobs]
+
+
+def make_job(index: int, segment: dict, matcher: GlossaryMatcher) -> dict:
+    """Translation job for one transcript segment, with only the glossary terms it mentions"""
+    terms = matcher.find(segment['text'])
+    glossary_context = build_glossary_context(matcher, terms)
+    return {
+        "index": index,
+        "segment": segment,
+        "text": segment['text'],
+        "terms": terms,
+        "glossary_context": glossary_context,
+        "system_prompt": build_system_prompt(glossary_context)
+    }
+
+
+def make_translated_segment(job: dict, translation: str) -> dict:
+    """Output segment of step3 for a translated job"""
+    i = job['index']
+    segment = job['segment']
+    original_text = job['text']
+    
+    # Check if content filter blocked
+    if translation == "[CONTENT_FILTERED]":
+        print(f"  ⚠️ Segment {i+1} blocked by content filter")
+        # Keep original for manual review
+        translation = f"[FILTERED] {original_text}"
+    
+    return {
+        "segment_id": i + 1,
+        "speaker": segment.get('speaker', 'Unknown'),
+        "gender": segment.get('gender', 'unknown'),
+        "start_time": segment.get('start_time', ''),
+        "end_time": segment.get('end_time', ''),
+        "start_ms": segment.get('start_ms', 0),
+        "end_ms": segment.get('end_ms', 0),
+        "duration_ms": segment.get('duration_ms', 0),
+        "original": original_text,
+        "translation": translation,
+        "confidence": segment.get('confidence', 0.0)
+    }
+
+
+def translation_output(transcription_data: dict, translated_segments: list, glossary: dict) -> dict:
+    """Contents of the *_translated.json file"""
+    return {
+        "audio_file": transcription_data.get('audio_file', ''),
+        "source_language": "ru-RU",
+        "target_language": "en-US",
+        "total_segments": len(translated_segments),
+        "speakers": transcription_data.get('speakers', {}),
+        "glossary_used": bool(glossary),
+        "glossary_terms_count": len(glossary) if glossary else 0,
+        "translation_service": "Azure OpenAI GPT-4o",
+        "segments": translated_segments
+    }
+
+
+async def translate_segment_stream(segments, cache: TranslationCache, matcher: GlossaryMatcher,
+                                   concurrency: int = TRANSLATION_CONCURRENCY, usage: dict = None):
+    """Translate transcript segments as they arrive from an async iterator; yields translated segments in order.
+
+    Up to concurrency requests are in flight. When translation falls behind,
+    the bounded queue of pending requests stops reading from the source.
+    Segments arrive one by one, so each is its own request (no batching).
+    """
+    usage = usage if usage is not None else {}
+    client = AsyncAzureOpenAI(
+        api_key=AZURE_OPENAI_KEY,
+        api_version=AZURE_OPENAI_API_VERSION,
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        max_retries=0
+    )
+    engine = BatchTranslationEngine(
+        translate=lambda job: translate_text_async(client, job['text'], job['system_prompt'], cache, usage),
+        limiter=RateLimiter(rpm=AZURE_OPENAI_RPM, tpm=AZURE_OPENAI_TPM),
+        concurrency=concurrency,
+        fallback=lambda job, error: "[Translation error]"
+    )
+    
+    async def translate(job):
+        cached = cache.get(job['text'], AZURE_OPENAI_DEPLOYMENT, job['system_prompt'])
+        if cached is not None:
+            return cached
+        return await engine.run_one(job, estimate_tokens(job['system_prompt'], job['text']))
+    
+    # (job, request task) in segment order; None marks the end of the source
+    in_flight = asyncio.Queue(maxsize=concurrency)
+    
+    async def read_segments():
+        try:
+            index = 0
+            async for segment in segments:
+                if segment.get('text', ''):
+                    job = make_job(index, segment, matcher)
+                    await in_flight.put((job, asyncio.ensure_future(translate(job))))
+                index += 1
+        finally:
+            await in_flight.put(None)
+    
+    reader = asyncio.ensure_future(read_segments())
+    try:
+        while True:
+            item = await in_flight.get()
+            if item is None:
+                break
+            job, request = item
+            yield make_translated_segment(job, await request)
+        # Errors of the source (e.g. a canceled transcription) surface here
+        await reader
+    finally:
+        reader.cancel()
+        await client.close()
+
+
+def single_request_prompt_tokens(usage: dict) -> int:
+    """Prompt tokens the translated jobs would cost one request each, at the measured tokens per char"""
+    if not usage.get('prompt_chars'):
+        return 0
+    tokens_per_char = usage['prompt_tokens'] / usage['prompt_chars']
+    return int(usage['single_prompt_chars'] * tokens_per_char)
+
+
 def translate_transcription(transcription_path: str, output_path: str):
     """Translate transcription JSON"""
     
@@ -122,8 +497,8 @@ def translate_transcription(transcription_path: str, output_path: str):
     
     print(f"📖 Loading transcription: {transcription_file.name}")
     
-    with open(transcription_file, 'r', encoding='utf-8') as f:
-        transcription_data = json.load(f)
+    # JSON or columnar segment store (app/segment_store.py)
+    transcription_data = load_transcript(transcription_file)
     
     segments = transcription_data.get('segments', [])
     print(f"📊 Total segments: {len(segments)}")
@@ -131,88 +506,77 @@ def translate_transcription(transcription_path: str, output_path: str):
     # Load glossary
     print(f"📚 Loading glossary...")
     glossary = load_glossary()
-    glossary_context = build_glossary_context(glossary)
+    matcher = GlossaryMatcher(glossary)
+    terms_used = set()
+    context_chars = 0
     
     if glossary:
-        print(f"✅ Glossary loaded: {len(glossary)} terms")
-        print(f"📝 Glossary context size: {len(glossary_context)} characters")
+        print(f"✅ Glossary loaded: {len(matcher)} terms, {matcher.patterns} variants")
     else:
         print(f"⚠️ No glossary found, translating without it")
     
-    # Initialize OpenAI client
-    print(f"🔧 Initializing Azure OpenAI client...")
-    client = AzureOpenAI(
-        api_key=AZURE_OPENAI_KEY,
-        api_version=AZURE_OPENAI_API_VERSION,
-        azure_endpoint=AZURE_OPENAI_ENDPOINT
-    )
+    cache = TranslationCache(max_entries=TRANSLATION_CACHE_SIZE, db_path=TRANSLATION_CACHE_DB)
     
-    # Translate segments
-    print(f"\n🌍 Starting translation...")
-    translated_segments = []
+    # Finished segments are journaled next to the output, so a crashed run resumes where it stopped
+    journal = RunJournal(
+        Path(output_path).with_suffix('.journal.jsonl'),
+        fingerprint(transcription_path, GLOSSARY_PATH, AZURE_OPENAI_DEPLOYMENT)
+    )
     
+    # Prepare requests: only the glossary terms each segment mentions
+    jobs = []
     for i, segment in enumerate(segments):
-        speaker = segment.get('speaker', 'Unknown')
-        original_text = segment.get('text', '')
-        start_time = segment.get('start_time', '')
-        
-        if not original_text:
+        if not segment.get('text', ''):
             continue
         
-        # Show progress
-        if (i + 1) % 10 == 0 or i == 0:
-            print(f"  Translating segment {i+1}/{len(segments)}...")
-        
-        # Translate
-        translation = translate_text(client, original_text, glossary_context)
-        
-        # Check if content filter blocked
-        if translation == "[CONTENT_FILTERED]":
-            print(f"  ⚠️ Segment {i+1} blocked by content filter")
-            # Keep original for manual review
-            translation = f"[FILTERED] {original_text}"
-        
-        # Add to results
-        translated_segment = {
-            "segment_id": i + 1,
-            "speaker": speaker,
-            "gender": segment.get('gender', 'unknown'),
-            "start_time": start_time,
-            "end_time": segment.get('end_time', ''),
-            "start_ms": segment.get('start_ms', 0),
-            "end_ms": segment.get('end_ms', 0),
-            "duration_ms": segment.get('duration_ms', 0),
-            "original": original_text,
-            "translation": translation,
-            "confidence": segment.get('confidence', 0.0)
-        }
-        
-        translated_segments.append(translated_segment)
-        
-        # Rate limiting (to avoid API throttling)
-        time.sleep(0.1)
+        job = make_job(i, segment, matcher)
+        terms_used.update(job['terms'])
+        context_chars += len(job['glossary_context'])
+        jobs.append(job)
+    
+    # Translate segments
+    print(f"\n🌍 Starting translation ({TRANSLATION_CONCURRENCY} concurrent requests)...")
+    started = time.monotonic()
+    usage = {}
+    try:
+        translations = asyncio.run(translate_jobs(jobs, cache, matcher, usage=usage, journal=journal))
+    finally:
+        journal.close()
+    print(f"  ⏱️ Translated in {time.monotonic() - started:.1f}s")
+    
+    if TRANSLATION_BATCH_SIZE > 1 and usage.get('prompt_tokens'):
+        # Tokens saved by sharing one system prompt per batch
+        single_tokens = single_request_prompt_tokens(usage)
+        saved = single_tokens - usage['prompt_tokens']
+        hours = max((segment.get('end_ms', 0) for segment in segments), default=0) / 3_600_000
+        print(f"  🪙 Prompt tokens: {usage['prompt_tokens']} batched vs ~{single_tokens} one request per segment "
+              f"({usage.get('resplits', 0)} batches re-split)")
+        if hours:
+            print(f"  🪙 ~{saved / hours:,.0f} prompt tokens saved per hour of content")
+    
+    translated_segments = [make_translated_segment(job, translation) for job, translation in zip(jobs, translations)]
     
     # Save translated data
-    output_data = {
-        "audio_file": transcription_data.get('audio_file', ''),
-        "source_language": "ru-RU",
-        "target_language": "en-US",
-        "total_segments": len(translated_segments),
-        "speakers": transcription_data.get('speakers', {}),
-        "glossary_used": bool(glossary),
-        "glossary_terms_count": len(glossary) if glossary else 0,
-        "translation_service": "Azure OpenAI GPT-4o",
-        "segments": translated_segments
-    }
+    output_data = translation_output(transcription_data, translated_segments, glossary)
+    save_transcript(output_path, output_data)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    errors = sum(1 for segment in translated_segments if segment['translation'] == "[Translation error]")
+    if errors:
+        print(f"\n⚠️ {errors} segments failed: rerun to retry only those ({journal.path.name} is kept)")
+    else:
+        journal.finish()
     
     print(f"\n✅ Translation completed!")
     print(f"📊 Translated segments: {len(translated_segments)}")
+    cache_metrics = cache.get_metrics()
+    print(f"🗄️ Translation cache: {cache_metrics['memory_hits'] + cache_metrics['disk_hits']} hits, "
+          f"{cache_metrics['misses']} misses")
+    cache.close()
     print(f"👥 Speakers: {len(transcription_data.get('speakers', {}))}")
     if glossary:
-        print(f"📚 Glossary terms used: {len(glossary)}")
+        print(f"📚 Glossary terms used: {len(terms_used)} of {len(matcher)}")
+        if translated_segments:
+            print(f"📝 Average glossary context: {context_chars // len(translated_segments)} characters")
     print(f"💾 Saved to: {output_path}")
     
     # Show sample translations
@@ -222,17 +586,22 @@ def translate_transcription(transcription_path: str, output_path: str):
         print(f"  🇷🇺 {segment['original'][:100]}...")
         print(f"  🇬🇧 {segment['translation'][:100]}...")
     
-    return True
+    # A partial result is a failure, so run_pipeline.py doesn't store it as up to date
+    return not errors
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python step3_translate.py <transcription_json>")
+    args = [arg for arg in sys.argv[1:] if arg != '--segments']
+    if not args:
+        print("Usage: python step3_translate.py <transcription_json | transcription.segments> [--segments]")
         print("Example: python step3_translate.py videos/original_transcription.json")
+        print("         python step3_translate.py videos/original_transcription.segments --segments  # original_translated.segments")
         sys.exit(1)
     
-    transcription_path = sys.argv[1]
-    output_path = transcription_path.replace('_transcription.json', '_translated.json')
+    transcription_path = args[0]
+    # --segments: write the columnar segment store (app/segment_store.py) instead of JSON
+    base = transcription_path.rsplit('_transcription', 1)[0]
+    output_path = base + '_translated' + (STORE_SUFFIX if '--segments' in sys.argv else '.json')
     
     success = translate_transcription(transcription_path, output_path)
     sys.exit(0 if success else 1)
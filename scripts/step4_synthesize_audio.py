@@ -12,9 +12,23 @@ import json
 from pathlib import Path
 from dotenv import load_dotenv
 import azure.cognitiveservices.speech as speechsdk
-from pydub import AudioSegment
-import time
 import io
+import shutil
+import subprocess
+import threading
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.audio_convert import convert_pcm16, split_wav
+from app.run_journal import RunJournal, fingerprint
+from app.segment_store import load_transcript
+from app.tts_cache import TTSCache
+from app.tts_pool import SynthesizerPool
+from app.tts_timing import DriftStats, DurationModel, TimingPlanner, parse_rate
 
 load_dotenv()
 
@@ -22,26 +36,61 @@ load_dotenv()
 AZURE_SPEECH_KEY = os.getenv('AZURE_SPEECH_KEY')
 AZURE_SPEECH_REGION = os.getenv('AZURE_SPEECH_REGION', 'westeurope')
 
+# English voices and speaking rate (part of the artifact key in run_pipeline.py)
+TTS_VOICE_MALE = os.getenv('TTS_VOICE_MALE', 'en-US-GuyNeural')
+TTS_VOICE_FEMALE = os.getenv('TTS_VOICE_FEMALE', 'en-US-JennyNeural')
+TTS_RATE = os.getenv('TTS_RATE', '-10%')
+
+# Bounds of the per-segment rate chosen to fit the original timing (TTS_RATE is preferred)
+TTS_RATE_MAX = os.getenv('TTS_RATE_MAX', '+25%')
+TTS_RATE_MIN = os.getenv('TTS_RATE_MIN', TTS_RATE)
+
+# Synthesizers kept connected per voice (also the voice's concurrent TTS calls)
+TTS_SYNTHESIZERS_PER_VOICE = int(os.getenv('TTS_SYNTHESIZERS_PER_VOICE', '2'))
+
+# Segments synthesized concurrently (each voice is still limited to its synthesizers)
+TTS_WORKERS = int(os.getenv('TTS_WORKERS', str(2 * TTS_SYNTHESIZERS_PER_VOICE)))
+
+# Synthesized audio is cached by voice, SSML, rate and format (default: .tts_cache next to the output)
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR')
+TTS_CACHE_MAX_MB = int(os.getenv('TTS_CACHE_MAX_MB', '1024'))
+
 
 class AzureTTSSynthesizer:
-    """Synthesize speech using Azure TTS"""
+    """Synthesize speech using Azure TTS (synthesizers are reused, see SynthesizerPool)"""
     
     # Neural voices (best quality)
     VOICES = {
         "male": {
-            "en-US": "en-US-GuyNeural",
+            "en-US": TTS_VOICE_MALE,
             "ru-RU": "ru-RU-DmitryNeural"
         },
         "female": {
-            "en-US": "en-US-JennyNeural",
+            "en-US": TTS_VOICE_FEMALE,
             "ru-RU": "ru-RU-SvetlanaNeural"
         }
     }
     
-    def __init__(self, speech_key: str, region: str, language: str = "en-US"):
+    # Audio format of the results (the SDK default, set explicitly as it is part of the cache key)
+    OUTPUT_FORMAT = speechsdk.SpeechSynthesisOutputFormat.Riff16Khz16BitMonoPcm
+    
+    def __init__(
+        self,
+        speech_key: str,
+        region: str,
+        language: str = "en-US",
+        cache: TTSCache = None,
+        durations: DurationModel = None
+    ):
         self.speech_key = speech_key
         self.region = region
         self.language = language
+        self.cache = cache
+        self.durations = durations  # Learns durations from every result, for the timing planner
+        
+        # Metrics (synthesize runs on worker threads, so the counter is locked)
+        self.azure_calls = 0
+        self.lock = threading.Lock()
         
         # Configure Speech
         self.speech_config = speechsdk.SpeechConfig(
@@ -51,12 +100,39 @@ class AzureTTSSynthesizer:
         
         # Use neural voices for best quality
         self.speech_config.speech_synthesis_voice_name = self.VOICES["female"][language]
+        self.speech_config.set_speech_synthesis_output_format(self.OUTPUT_FORMAT)
+        
+        # Created on first use of a voice, then kept connected
+        self.connections = {}
+        self.pool = SynthesizerPool(self.create_synthesizer, per_voice=TTS_SYNTHESIZERS_PER_VOICE,
+                                    dispose=self.close_synthesizer)
+    
+    def create_synthesizer(self, voice_name: str):
+        """Synthesizer for one voice (the voice itself is set by the SSML)"""
+        # Use synthesizer without audio output config to get raw data
+        synthesizer = speechsdk.SpeechSynthesizer(
+            speech_config=self.speech_config,
+            audio_config=None  # None = return audio data directly
+        )
+        connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+        connection.open(True)
+        self.connections[synthesizer] = connection
+        return synthesizer
+    
+    def close_synthesizer(self, synthesizer):
+        """Close the connection of a synthesizer the pool dropped"""
+        connection = self.connections.pop(synthesizer, None)
+        if connection:
+            connection.close()
+    
+    def voice_for(self, gender: str) -> str:
+        return self.VOICES.get(gender, self.VOICES["female"])[self.language]
     
-    def synthesize(self, text: str, gender: str = "female", rate: str = "-10%") -> bytes:
+    def synthesize(self, text: str, gender: str = "female", rate: str = TTS_RATE) -> bytes:
         """Synthesize text to audio bytes with adjustable speed"""
         
         # Select voice based on gender
-        voice_name = self.VOICES.get(gender, self.VOICES["female"])[self.language]
+        voice_name = self.voice_for(gender)
         
         # Create SSML for speed control
         ssml = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="en-US">
@@ -67,18 +143,24 @@ class AzureTTSSynthesizer:
             </voice>
         </speak>"""
         
-        # Use synthesizer without audio output config to get raw data
-        synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=self.speech_config,
-            audio_config=None  # None = return audio data directly
-        )
+        cache_key = TTSCache.key(voice_name, ssml, rate, self.OUTPUT_FORMAT.name)
+        if self.cache:
+            audio_data = self.cache.get(cache_key)
+            if audio_data:
+                self.observe(voice_name, text, rate, audio_data)
+                return audio_data
         
         try:
-            result = synthesizer.speak_ssml_async(ssml).get()
+            with self.lock:
+                self.azure_calls += 1
+            result = self.pool.run(voice_name, lambda synthesizer: synthesizer.speak_ssml_async(ssml).get())
             
             if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
                 # Get audio data
                 audio_data = result.audio_data
+                if self.cache:
+                    self.cache.put(cache_key, audio_data)
+                self.observe(voice_name, text, rate, audio_data)
                 return audio_data
             else:
                 print(f"  ❌ TTS error: {result.reason}")
@@ -87,11 +169,236 @@ class AzureTTSSynthesizer:
         except Exception as e:
             print(f"  ❌ TTS exception: {e}")
             return None
+    
+    def observe(self, voice_name: str, text: str, rate: str, audio_data: bytes):
+        if self.durations:
+            self.durations.observe(voice_name, text, rate, wav_duration_ms(audio_data))
+
+
+def wav_duration_ms(audio_data: bytes) -> float:
+    with wave.open(io.BytesIO(audio_data), 'rb') as wav:
+        return wav.getnframes() * 1000 / wav.getframerate()
+
+
+class DubbingTimeline:
+    """English track written segment by segment with smart timing.
+
+    While the track is ahead of the original, a segment waits (silence) for
+    its original start time; once the track runs long, segments follow each
+    other directly until it has caught up.
+
+    Segments arrive in order and only ever go after what is written, so the
+    track is streamed into a 16 kHz mono WAV next to the output: memory stays
+    flat however long the dub is, and nothing is copied twice. finish() moves
+    it into place, or converts it once with ffmpeg for other formats.
+    """
+    
+    SAMPLE_RATE = 16000
+    SILENCE_BLOCK = b'\x00\x00' * SAMPLE_RATE  # 1s
+    
+    def __init__(self, output_path: Union[str, Path]):
+        self.output_path = Path(output_path)
+        self.temp_path = self.output_path.with_name(self.output_path.name + '.part.wav')
+        self.writer = wave.open(str(self.temp_path), 'wb')
+        self.writer.setnchannels(1)
+        self.writer.setsampwidth(2)
+        self.writer.setframerate(self.SAMPLE_RATE)
+        self.frames = 0
+        self.segments = 0
+        self.accumulated_delay_ms = 0  # How much we're behind/ahead schedule
+        self.drift = DriftStats()
+    
+    @property
+    def current_position_ms(self) -> float:
+        """Where we are in the audio timeline"""
+        return self.frames * 1000 / self.SAMPLE_RATE
+    
+    def write_silence(self, duration_ms: float):
+        frames = int(round(duration_ms * self.SAMPLE_RATE / 1000))
+        self.frames += frames
+        while frames > 0:
+            block = min(frames, self.SAMPLE_RATE)
+            self.writer.writeframes(self.SILENCE_BLOCK[:block * 2])
+            frames -= block
+    
+    def sync(self, segment: dict, verbose: bool = False, start_ms: float = None):
+        """Add silence up to the segment's start (planned, or original) if the track is ahead of it"""
+        # Calculate when this segment should ideally start
+        ideal_start_ms = segment.get('start_ms', 0) if start_ms is None else start_ms
+        actual_start_ms = self.current_position_ms
+        
+        # If we're behind schedule (current position < ideal start)
+        if actual_start_ms < ideal_start_ms:
+            # Add silence to catch up
+            silence_needed = ideal_start_ms - actual_start_ms
+            self.write_silence(silence_needed)
+            self.accumulated_delay_ms = 0  # Reset delay
+            
+            if verbose:
+                print(f"    + Added {silence_needed/1000:.1f}s silence to sync")
+    
+    def add(self, segment: dict, audio_data: bytes, verbose: bool = False):
+        """Append a synthesized segment (WAV bytes, converted to the track's format if needed)"""
+        pcm, rate, channels = split_wav(audio_data)
+        if (rate, channels) != (self.SAMPLE_RATE, 1):
+            pcm = convert_pcm16(pcm, rate or self.SAMPLE_RATE, self.SAMPLE_RATE, 1, channels or 1)
+        
+        # Add this segment
+        self.writer.writeframes(pcm)
+        self.frames += len(pcm) // 2
+        self.segments += 1
+        
+        # Calculate delay: positive = we're running long, negative = we're running short
+        self.accumulated_delay_ms = self.current_position_ms - segment.get('end_ms', 0)
+        self.drift.record(segment.get('end_ms', 0), self.current_position_ms)
+        
+        # Log significant delays
+        if abs(self.accumulated_delay_ms) > 2000 and verbose:
+            if self.accumulated_delay_ms > 0:
+                print(f"    ⚠️ Running {self.accumulated_delay_ms/1000:.1f}s behind schedule")
+            else:
+                print(f"    ✅ Running {-self.accumulated_delay_ms/1000:.1f}s ahead of schedule")
+    
+    def finish(self) -> float:
+        """Put the track at output_path (replacing, never writing through, a link); returns its duration in ms"""
+        self.writer.close()
+        converted = self.output_path.with_name(self.output_path.name + '.part' + self.output_path.suffix)
+        try:
+            if self.output_path.suffix.lower() == '.wav':
+                os.replace(self.temp_path, self.output_path)
+            else:
+                subprocess.run(
+                    ['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', str(self.temp_path),
+                     '-ar', str(self.SAMPLE_RATE), '-y', str(converted)],
+                    check=True
+                )
+                os.replace(converted, self.output_path)
+        finally:
+            self.temp_path.unlink(missing_ok=True)
+            converted.unlink(missing_ok=True)
+        return self.current_position_ms
+    
+    def abort(self):
+        self.writer.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+def is_skipped(translation: str) -> bool:
+    return translation.startswith('[FILTERED]') or translation.startswith('[Translation error')
 
 
-def create_silence(duration_ms: int) -> AudioSegment:
-    """Create silence audio segment"""
-    return AudioSegment.silent(duration=duration_ms)
+def run_fingerprint(translation_path: Union[str, Path], tts: AzureTTSSynthesizer) -> str:
+    """Hash of everything a dub depends on: the translations, voices and rate bounds"""
+    return fingerprint(translation_path, json.dumps(tts.VOICES, sort_keys=True), tts.language,
+                       TTS_RATE, TTS_RATE_MIN, TTS_RATE_MAX)
+
+
+def timing_planner(tts: AzureTTSSynthesizer) -> TimingPlanner:
+    return TimingPlanner(tts.durations, rate=TTS_RATE, fastest=TTS_RATE_MAX, slowest=TTS_RATE_MIN)
+
+
+def timing_item(segment: dict, tts: AzureTTSSynthesizer) -> dict:
+    """A segment as the timing planner sees it"""
+    return {
+        "start_ms": segment.get('start_ms', 0),
+        "end_ms": segment.get('end_ms', 0),
+        "text": segment['translation'],
+        "voice": tts.voice_for(segment.get('gender', 'female')),
+    }
+
+
+def save_plan(tts: AzureTTSSynthesizer, run_fingerprint: str, plans: dict):
+    plan_path = tts.cache.root / 'plans' / f"{run_fingerprint}.json"
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    plan_path.write_text(json.dumps({"fingerprint": run_fingerprint, "plans": plans}), encoding='utf-8')
+
+
+def plan_timing(segments: list, tts: AzureTTSSynthesizer, run_fingerprint: str) -> dict:
+    """Start and prosody rate per segment id (as str), fitted to the original timing.
+
+    The plan is saved in the TTS cache, keyed by the run's inputs, so a
+    resumed run or a rerun keeps the rates of the first one even though the
+    duration model has learned since: same rates, same cache keys, no new
+    Azure calls.
+    """
+    plan_path = tts.cache.root / 'plans' / f"{run_fingerprint}.json"
+    if plan_path.exists():
+        saved = json.loads(plan_path.read_text(encoding='utf-8'))
+        if saved.get('fingerprint') == run_fingerprint:
+            return saved['plans']
+    
+    spoken = [s for s in segments if not is_skipped(s['translation'])]
+    timing = timing_planner(tts).plan([timing_item(s, tts) for s in spoken])
+    plans = {str(s['segment_id']): plan for s, plan in zip(spoken, timing)}
+    save_plan(tts, run_fingerprint, plans)
+    
+    voices = tts.durations.get_metrics()
+    calibrated = ", ".join(f"{voice}: {m['observations']}" for voice, m in voices.items()) or "none yet"
+    print(f"⏱️ Timing planned from the duration model (observations per voice: {calibrated})")
+    return plans
+
+
+def print_timing_report(plans: dict, drift: DriftStats):
+    """Rates chosen by the planner and how far the track ended up from the original timing"""
+    rates = [parse_rate(plan['rate']) for plan in plans.values()]
+    preferred = parse_rate(TTS_RATE)
+    faster = sum(1 for rate in rates if rate > preferred)
+    slower = sum(1 for rate in rates if rate < preferred)
+    print(f"🏃 Rates: {faster} segments sped up (up to {max(rates, default=preferred):+.0f}%), "
+          f"{slower} slowed down, {len(rates) - faster - slower} at {TTS_RATE}")
+    
+    stats = drift.summary()
+    if stats['segments']:
+        print(f"🎯 Drift vs original ends: median {stats['median_abs_ms']/1000:.2f}s, "
+              f"p95 {stats['p95_abs_ms']/1000:.2f}s, max late {stats['max_late_ms']/1000:.1f}s, "
+              f"final {stats['final_ms']/1000:+.1f}s, {stats['over_1s']} segments >1s late")
+
+
+def synthesize_in_order(
+    tts: AzureTTSSynthesizer,
+    jobs: List[Tuple[dict, dict]],
+    parts_dir: Path,
+    journal: RunJournal,
+    workers: int = TTS_WORKERS
+) -> Iterator[Tuple[dict, dict, bytes]]:
+    """(segment, plan, audio) for (segment, plan) jobs, in order, synthesized by workers concurrently.
+
+    At most 4 * workers segments are in flight or waiting to be placed, so
+    memory doesn't grow with the length of the dub. Parts of a previous run
+    are reused; new ones are journaled here, in the consuming thread.
+    """
+    def synthesize(segment: dict, plan: dict) -> Tuple[bytes, bool]:
+        part_path = parts_dir / f"segment_{segment['segment_id']:05d}.wav"
+        if segment['segment_id'] in journal and part_path.exists():
+            return part_path.read_bytes(), False
+        audio_data = tts.synthesize(segment['translation'], segment.get('gender', 'female'), plan['rate'])
+        if audio_data:
+            part_path.write_bytes(audio_data)
+        return audio_data, bool(audio_data)
+    
+    workers = max(1, workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="synth") as executor:
+        pending = deque()
+        queued = iter(jobs)
+        
+        def submit():
+            job = next(queued, None)
+            if job:
+                pending.append((*job, executor.submit(synthesize, *job)))
+        
+        try:
+            for _ in range(4 * workers):
+                submit()
+            while pending:
+                segment, plan, future = pending.popleft()
+                audio_data, new_part = future.result()
+                if new_part:
+                    journal.record(segment['segment_id'], f"segment_{segment['segment_id']:05d}.wav")
+                submit()
+                yield segment, plan, audio_data
+        finally:
+            for _, _, future in pending:
+                future.cancel()
 
 
 def synthesize_translation_audio(translation_path: str, output_audio: str):
@@ -105,126 +412,99 @@ def synthesize_translation_audio(translation_path: str, output_audio: str):
     
     print(f"📖 Loading translations: {translation_file.name}")
     
-    with open(translation_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # JSON or columnar segment store (app/segment_store.py)
+    data = load_transcript(translation_file)
     
     segments = data.get('segments', [])
     print(f"📊 Total segments: {len(segments)}")
     
     # Initialize TTS
     print(f"🔧 Initializing Azure TTS...")
+    output_path = Path(output_audio)
+    cache = TTSCache(TTS_CACHE_DIR or output_path.parent / '.tts_cache', TTS_CACHE_MAX_MB * 1024 * 1024)
     tts = AzureTTSSynthesizer(
         speech_key=AZURE_SPEECH_KEY,
         region=AZURE_SPEECH_REGION,
-        language="en-US"
+        language="en-US",
+        cache=cache,
+        durations=DurationModel(cache.root / 'durations.sqlite')
     )
     
+    # Synthesized segments are kept as WAV parts and journaled, so a rerun
+    # only synthesizes what is missing
+    parts_dir = output_path.with_name(output_path.stem + '_parts')
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    journal = RunJournal(parts_dir / 'journal.jsonl', run_fingerprint(translation_path, tts))
+    if len(journal):
+        print(f"📓 {len(journal)} segments already synthesized in a previous run")
+    
+    plans = plan_timing(segments, tts, journal.fingerprint)
+    
     # Create audio for each segment
-    print(f"\n🎙️ Synthesizing audio with smart timing...")
-    
-    audio_segments = []
-    current_position_ms = 0  # Where we are in the audio timeline
-    accumulated_delay_ms = 0  # How much we're behind/ahead schedule
-    
-    for i, segment in enumerate(segments):
-        seg_id = segment['segment_id']
-        translation = segment['translation']
-        gender = segment.get('gender', 'female')
-        start_ms = segment.get('start_ms', 0)
-        end_ms = segment.get('end_ms', 0)
-        segment_duration = end_ms - start_ms
-        
+    print(f"\n🎙️ Synthesizing audio with smart timing ({TTS_WORKERS} workers)...")
+    
+    jobs = []
+    for segment in segments:
         # Skip filtered or error segments
-        if translation.startswith('[FILTERED]') or translation.startswith('[Translation error'):
-            print(f"  ⏭️ Skipping segment {seg_id} (filtered/error)")
+        if is_skipped(segment['translation']):
+            print(f"  ⏭️ Skipping segment {segment['segment_id']} (filtered/error)")
             continue
-        
-        # Show progress
-        if (i + 1) % 10 == 0 or i == 0:
-            print(f"  Synthesizing segment {i+1}/{len(segments)}... (delay: {accumulated_delay_ms/1000:.1f}s)")
-        
-        # Calculate when this segment should ideally start
-        ideal_start_ms = start_ms
-        actual_start_ms = current_position_ms
-        
-        # If we're behind schedule (current position < ideal start)
-        if actual_start_ms < ideal_start_ms:
-            # Add silence to catch up
-            silence_needed = ideal_start_ms - actual_start_ms
-            silence = create_silence(int(silence_needed))
-            audio_segments.append(silence)
-            current_position_ms = ideal_start_ms
-            accumulated_delay_ms = 0  # Reset delay
-            
-            if (i + 1) % 10 == 0 or i == 0:
-                print(f"    + Added {silence_needed/1000:.1f}s silence to sync")
-        
-        # Synthesize audio
-        audio_data = tts.synthesize(translation, gender)
-        
-        if audio_data:
-            # Convert to AudioSegment (Azure returns WAV format)
-            audio_segment = AudioSegment.from_file(
-                io.BytesIO(audio_data),
-                format="wav"
-            )
-            
-            actual_duration = len(audio_segment)
-            
-            # Add this segment
-            audio_segments.append(audio_segment)
-            current_position_ms += actual_duration
-            
-            # Calculate delay: positive = we're running long, negative = we're running short
-            accumulated_delay_ms = current_position_ms - end_ms
-            
-            # Log significant delays
-            if abs(accumulated_delay_ms) > 2000 and (i + 1) % 10 == 0:
-                if accumulated_delay_ms > 0:
-                    print(f"    ⚠️ Running {accumulated_delay_ms/1000:.1f}s behind schedule")
-                else:
-                    print(f"    ✅ Running {-accumulated_delay_ms/1000:.1f}s ahead of schedule")
-            
-        else:
-            print(f"  ⚠️ Failed to synthesize segment {seg_id}")
-        
-        # Rate limiting
-        time.sleep(0.1)
+        jobs.append((segment, plans[str(segment['segment_id'])]))
     
-    # Combine all audio segments
-    print(f"\n🔗 Combining audio segments...")
+    timeline = DubbingTimeline(output_path)
+    failed = 0
     
-    if not audio_segments:
+    try:
+        for i, (segment, plan, audio_data) in enumerate(synthesize_in_order(tts, jobs, parts_dir, journal)):
+            # Show progress
+            verbose = (i + 1) % 10 == 0 or i == 0
+            if verbose:
+                print(f"  Synthesized segment {i+1}/{len(jobs)}... (delay: {timeline.accumulated_delay_ms/1000:.1f}s)")
+            
+            timeline.sync(segment, verbose, plan['start_ms'])
+            if audio_data:
+                timeline.add(segment, audio_data, verbose and i > 0)
+            else:
+                print(f"  ⚠️ Failed to synthesize segment {segment['segment_id']}")
+                failed += 1
+    except BaseException:
+        timeline.abort()
+        raise
+    finally:
+        journal.close()
+        cache_metrics = tts.cache.get_metrics()
+        tts.cache.close()
+        tts.durations.close()
+    
+    if not timeline.segments:
+        timeline.abort()
         print(f"❌ No audio segments created!")
         return False
     
-    final_audio = audio_segments[0]
-    for segment in audio_segments[1:]:
-        final_audio += segment
-    
-    # Export final audio
-    print(f"💾 Exporting audio...")
+    # Export final audio (once: the track was written as it was built)
+    print(f"\n💾 Exporting audio...")
+    duration_ms = timeline.finish()
     
-    output_path = Path(output_audio)
-    output_format = output_path.suffix[1:]  # Remove dot
-    
-    final_audio.export(
-        output_audio,
-        format=output_format,
-        parameters=["-ar", "16000"]  # 16kHz sample rate
-    )
+    # Parts are only needed to resume an unfinished run
+    if failed:
+        print(f"⚠️ {failed} segments failed: rerun to synthesize only those ({parts_dir.name} is kept)")
+    else:
+        shutil.rmtree(parts_dir, ignore_errors=True)
     
     # Stats
-    duration_seconds = len(final_audio) / 1000
+    duration_seconds = duration_ms / 1000
     minutes = int(duration_seconds // 60)
     seconds = int(duration_seconds % 60)
     
     print(f"\n✅ Audio synthesis completed!")
-    print(f"📊 Total segments synthesized: {len(audio_segments)}")
+    print(f"📊 Total segments synthesized: {timeline.segments}")
     print(f"⏱️ Duration: {minutes}:{seconds:02d}")
+    print(f"🗄️ TTS cache: {cache_metrics['hits']} hits, {tts.azure_calls} Azure calls")
+    print_timing_report(plans, timeline.drift)
     print(f"💾 Saved to: {output_audio}")
     
-    return True
+    # A partial result is a failure, so run_pipeline.py doesn't store it as up to date
+    return not failed
 
 
 if __name__ == "__main__":
@@ -14,6 +14,10 @@ from pathlib import Path
 from dotenv import load_dotenv
 from openai import AzureOpenAI
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.segment_store import load_transcript
+
 load_dotenv()
 
 # Azure OpenAI config
@@ -142,8 +146,8 @@ def analyze_content_highlights(translation_path: str, output_path: str):
     
     print(f"📖 Loading translations: {translation_file.name}")
     
-    with open(translation_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # JSON or columnar segment store (app/segment_store.py)
+    data = load_transcript(translation_file)
     
     segments = data.get('segments', [])
     print(f"📊 Total segments: {len(segments)}")
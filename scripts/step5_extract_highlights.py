@@ -15,6 +15,10 @@ from dotenv import load_dotenv
 from openai import AzureOpenAI
 import subprocess
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.segment_store import load_transcript
+
 load_dotenv()
 
 # Azure OpenAI config
@@ -194,8 +198,8 @@ def create_highlights_video(translation_path: str, video_path: str, output_path:
     
     print(f"📖 Loading translations: {translation_file.name}")
     
-    with open(translation_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # JSON or columnar segment store (app/segment_store.py)
+    data = load_transcript(translation_file)
     
     segments = data.get('segments', [])
     print(f"📊 Total segments: {len(segments)}")
@@ -296,7 +300,7 @@ def create_highlights_video(translation_path: str, video_path: str, output_path:
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
-        print("Usage: python step5_extract_highlights.py <translation_json> <video_file>")
+        print("Usage: python step5_extract_highlights.py <translation_json | translation.segments> <video_file>")
         print("Example: python step5_extract_highlights.py videos/original_translated_fixed.json videos/original_english.mp4")
         sys.exit(1)
     
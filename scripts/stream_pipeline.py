@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Потоковый режим: step2 → step3 → step3.5 → step4 работают одновременно
+- Сегмент переводится сразу, как только step2 его распознал
+- Проверка (step3.5) идёт пачками по 10 готовых переводов, озвучка — по мере проверки
+- Этапы связаны ограниченными очередями: отстающий этап притормаживает предыдущий
+- Общее время ≈ самый долгий этап (транскрипция идёт в реальном времени), а не сумма этапов
+- Результаты те же файлы, что и у пошагового запуска: _transcription.json,
+  _translated.json, _translated_fixed.json, _audio_en.wav
+
+Usage:
+    python stream_pipeline.py <audio_file>
+    python run_pipeline.py <video.mp4> --stream
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.offline_pipeline import StreamBuffer
+from app.segment_store import save_transcript
+
+load_dotenv()
+
+SCRIPTS = Path(__file__).parent
+
+# Segments buffered between two stages
+STREAM_QUEUE_SIZE = int(os.getenv('STREAM_QUEUE_SIZE', '32'))
+
+# Outputs of a streaming run, in stage order
+STREAMED = ("transcription", "translated", "reviewed", "audio_en")
+
+
+def load_step(filename: str):
+    """Import a step script as a module (step3.5_review.py is not a valid module name)"""
+    spec = importlib.util.spec_from_file_location(Path(filename).stem.replace('.', '_'), SCRIPTS / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def review_stream(translated, step35, client, failures: dict):
+    """Review translated segments in batches of step3.5's size as they arrive (failed batches are counted)"""
+    loop = asyncio.get_running_loop()
+    batch = []
+    batch_num = 0
+
+    async def review(batch):
+        nonlocal batch_num
+        batch_num += 1
+        fixes = await loop.run_in_executor(None, step35.analyze_and_fix_translations, client, batch, batch_num)
+        if fixes:
+            step35.apply_fixes(batch, fixes)
+        else:
+            failures['review'] += 1
+        return batch
+
+    async for segment in translated:
+        # Fixes are applied in place; the step3 result must keep the unreviewed text
+        batch.append(dict(segment))
+        if len(batch) == step35.REVIEW_BATCH_SIZE:
+            for reviewed in await review(batch):
+                yield reviewed
+            batch = []
+    if batch:
+        for reviewed in await review(batch):
+            yield reviewed
+
+
+async def stream_pipeline(paths: dict) -> list:
+    """Transcribe, translate, review and synthesize paths['audio'] with all stages overlapping.
+
+    Returns the outputs (names in STREAMED) that are complete: a stage with
+    failed segments leaves its output, and everything after it, partial.
+    """
+    step2 = load_step('step2_transcribe.py')
+    step3 = load_step('step3_translate.py')
+    step35 = load_step('step3.5_review.py')
+    step4 = load_step('step4_synthesize_audio.py')
+
+    audio_file = Path(paths['audio'])
+    glossary = step3.load_glossary()
+    matcher = step3.GlossaryMatcher(glossary)
+    cache = step3.TranslationCache(max_entries=step3.TRANSLATION_CACHE_SIZE, db_path=step3.TRANSLATION_CACHE_DB)
+    review_client = step35.AzureOpenAI(
+        api_key=step35.AZURE_OPENAI_KEY,
+        api_version=step35.AZURE_OPENAI_API_VERSION,
+        azure_endpoint=step35.AZURE_OPENAI_ENDPOINT
+    )
+    tts_cache = step4.TTSCache(
+        step4.TTS_CACHE_DIR or Path(paths['audio_en']).parent / '.tts_cache',
+        step4.TTS_CACHE_MAX_MB * 1024 * 1024
+    )
+    tts = step4.AzureTTSSynthesizer(
+        speech_key=step4.AZURE_SPEECH_KEY,
+        region=step4.AZURE_SPEECH_REGION,
+        language="en-US",
+        cache=tts_cache,
+        durations=step4.DurationModel(tts_cache.root / 'durations.sqlite')
+    )
+
+    transcribed = []
+    translated = []
+
+    async def collect(source, into: list):
+        async for item in source:
+            into.append(item)
+            yield item
+
+    # Each stage reads from the bounded buffer of the previous one
+    buffers = []
+
+    def buffer(name, source):
+        buffers.append(StreamBuffer(name, source, STREAM_QUEUE_SIZE))
+        return buffers[-1]
+
+    segments = buffer("transcribe", collect(step2.stream_transcription(audio_file, glossary), transcribed))
+    translations = buffer("translate", collect(step3.translate_segment_stream(segments, cache, matcher), translated))
+    failures = {"review": 0}
+    reviewed = buffer("review", review_stream(translations, step35, review_client, failures))
+
+    print(f"🎵 Audio: {audio_file.name}")
+    print(f"🌊 Streaming transcription → translation → review → synthesis...")
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+    timeline = step4.DubbingTimeline(paths['audio_en'])
+    fixed_segments = []
+    failed = 0
+
+    # Segments are synthesized concurrently like in step4 and placed in order;
+    # at most 4 * TTS_WORKERS are in flight, beyond that the review stage waits
+    workers = max(1, step4.TTS_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="synth")
+    pending = deque()
+
+    # Timing is planned like in step4: a segment's plan only needs the next
+    # segment's start, so each one is held back until the next one arrives
+    planner = step4.timing_planner(tts)
+    plans = {}
+    held = None
+
+    async def submit(segment: dict, next_start_ms):
+        plan = planner.place(step4.timing_item(segment, tts), next_start_ms)
+        plans[str(segment['segment_id'])] = plan
+        future = loop.run_in_executor(executor, tts.synthesize, segment['translation'],
+                                      segment.get('gender', 'female'), plan['rate'])
+        pending.append((segment, plan, future))
+        await place(4 * workers)
+
+    async def place(limit: int):
+        """Add finished segments to the track in order, waiting while more than limit are in flight"""
+        nonlocal failed
+        while pending and (len(pending) > limit or pending[0][2].done()):
+            segment, plan, future = pending.popleft()
+            audio_data = await future
+            timeline.sync(segment, start_ms=plan['start_ms'])
+            if audio_data:
+                timeline.add(segment, audio_data)
+            else:
+                print(f"  ⚠️ Failed to synthesize segment {segment['segment_id']}")
+                failed += 1
+            if timeline.segments and timeline.segments % 10 == 0 and audio_data:
+                print(f"  [{segment['start_time']}] {timeline.segments} segments voiced "
+                      f"(delay: {timeline.accumulated_delay_ms / 1000:.1f}s)")
+
+    try:
+        async for segment in reviewed:
+            fixed_segments.append(segment)
+            if step4.is_skipped(segment['translation']):
+                print(f"  ⏭️ Skipping segment {segment['segment_id']} (filtered/error)")
+                continue
+
+            if held:
+                await submit(held, segment.get('start_ms', 0))
+            held = segment
+        if held:
+            await submit(held, None)
+        await place(0)
+    except Exception as e:
+        for _, _, future in pending:
+            future.cancel()
+        timeline.abort()
+        print(f"❌ Streaming run failed: {e}")
+        return []
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        cache.close()
+        tts.cache.close()
+        tts.durations.close()
+    elapsed = time.monotonic() - started
+
+    # Same artifacts as a step by step run
+    speakers = {}
+    for result in transcribed:
+        step2.assign_gender(speakers, result)
+    transcription_data = step2.transcription_output(audio_file, transcribed, speakers, glossary)
+    translated_data = step3.translation_output(transcription_data, translated, glossary)
+    fixed_data = dict(translated_data, segments=fixed_segments, reviewed=True,
+                      review_notes='Reviewed and fixed by GPT-4o for consistency')
+    for name, data in (("transcription", transcription_data), ("translated", translated_data), ("reviewed", fixed_data)):
+        # JSON or segment store by the path's suffix (run_pipeline.py --segments)
+        save_transcript(paths[name], data)
+    # Filed like step4's plan, so step4 on these translations keeps the same rates (and cache keys)
+    step4.save_plan(tts, step4.run_fingerprint(paths['reviewed'], tts), plans)
+
+    if not timeline.segments:
+        timeline.abort()
+        print(f"❌ No audio segments created!")
+        return []
+    timeline.finish()
+
+    audio_s = transcribed[-1]['end_ms'] / 1000 if transcribed else 0
+    print(f"\n✅ Streaming run completed in {elapsed:.1f}s ({audio_s:.1f}s of audio)")
+    for stage in buffers:
+        metrics = stage.get_metrics()
+        print(f"  {metrics['stage']:<11} {metrics['items']:>5} segments, done at {metrics['finished_s']}s, "
+              f"max queue {metrics['max_queue_depth']}/{metrics['maxsize']}")
+    print(f"  synthesize  {timeline.segments:>5} segments, done at {elapsed:.1f}s ({workers} workers)")
+    step4.print_timing_report(plans, timeline.drift)
+    for name in STREAMED:
+        print(f"💾 {paths[name]}")
+
+    # Partial outputs are kept for inspection, but only complete ones are reported as done
+    translation_errors = sum(1 for segment in translated if segment['translation'].startswith('[Translation error'))
+    complete = ["transcription"]
+    if translation_errors:
+        print(f"⚠️ {translation_errors} segments failed to translate")
+    else:
+        complete.append("translated")
+        if failures['review']:
+            print(f"⚠️ {failures['review']} review batches failed")
+        else:
+            complete.append("reviewed")
+            if failed:
+                print(f"⚠️ {failed} segments failed to synthesize")
+            else:
+                complete.append("audio_en")
+    return complete
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python stream_pipeline.py <audio_file>")
+        print("Example: python stream_pipeline.py videos/original_audio.wav")
+        sys.exit(1)
+
+    audio_path = sys.argv[1]
+    paths = {
+        "audio": audio_path,
+        "transcription": audio_path.replace('_audio.wav', '_transcription.json'),
+        "translated": audio_path.replace('_audio.wav', '_translated.json'),
+        "reviewed": audio_path.replace('_audio.wav', '_translated_fixed.json'),
+        "audio_en": audio_path.replace('_audio.wav', '_audio_en.wav'),
+    }
+
+    complete = asyncio.run(stream_pipeline(paths))
+    sys.exit(0 if len(complete) == len(STREAMED) else 1)
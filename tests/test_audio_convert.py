@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from app.audio_convert import ClipStore, playback_wav, resample_poly, split_wav, wav_bytes
+
+
+def tone(seconds: float, rate: int) -> np.ndarray:
+    return 10000 * np.sin(2 * np.pi * 440 * np.arange(int(seconds * rate)) / rate)
+
+
+def test_raw_playback_rate_is_only_made_stereo():
+    pcm = np.rint(tone(0.1, 44100)).astype('<i2')
+    pcm_out, rate, channels = split_wav(playback_wav(pcm.tobytes(), 44100))
+    assert (rate, channels) == (44100, 2)
+    assert np.array_equal(np.frombuffer(pcm_out, dtype='<i2'), np.repeat(pcm, 2))
+
+
+@pytest.mark.parametrize("rate", [16000, 24000, 48000])
+def test_resampled_tone_matches_the_exact_tone(rate):
+    out = resample_poly(tone(0.5, rate), rate, 44100)
+    reference = tone(0.5, 44100)
+    assert len(out) == len(reference)
+    edge = 4410
+    error = out[edge:-edge] - reference[edge:-edge]
+    snr_db = 10 * np.log10(np.mean(reference[edge:-edge] ** 2) / np.mean(error ** 2))
+    assert snr_db > 60
+
+
+def test_riff_input_is_resampled_and_downmixed():
+    stereo = np.repeat(np.rint(tone(0.2, 16000)).astype('<i2'), 2).tobytes()
+    _, rate, channels = split_wav(playback_wav(wav_bytes(stereo, 16000, 2), 16000))
+    assert (rate, channels) == (44100, 2)
+
+
+def test_clip_store_keeps_the_newest():
+    store = ClipStore(max_entries=2)
+    for clip_id in "abc":
+        store.put(clip_id, clip_id.encode())
+    assert store.get("a.wav") is None
+    assert store.get("b.wav") == b"b" and store.get("c") == b"c"
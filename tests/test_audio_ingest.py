@@ -0,0 +1,111 @@
+import asyncio
+import base64
+
+from app.realtime_translator.audio_ingest import AudioIngest, PCMRingBuffer, frame_size_bytes
+from app.realtime_translator.participant_demux import ParticipantAudioDemux
+
+
+def pattern(n: int, start: int = 0) -> bytes:
+    return bytes((start + i) % 251 for i in range(n))
+
+
+def test_frame_size_bytes():
+    assert frame_size_bytes(100) == 3200
+    assert frame_size_bytes(20) == 640
+
+
+def test_ring_buffer_frames_across_wrap():
+    ring = PCMRingBuffer(frame_bytes=4, frames=3)
+    data = pattern(40)
+    out = b''
+    for i in range(0, len(data), 5):
+        ring.write(data[i:i + 5])
+        while ring.has_frame():
+            out += bytes(ring.read_frame())
+    assert out == data[:len(out)]
+    assert len(out) == 40 - ring.size
+
+
+def test_ring_buffer_write_is_bounded_by_free_space():
+    ring = PCMRingBuffer(frame_bytes=4, frames=2)
+    assert ring.write(pattern(10)) == 8
+    assert ring.free == 0
+    assert ring.write(b'x') == 0
+
+
+def test_flush_then_more_audio_keeps_frames_aligned():
+    frames = []
+    ingest = AudioIngest(lambda participant, frame: frames.append(frame), frame_ms=100, ring_frames=4)
+    frame_bytes = ingest.frame_bytes
+
+    written = pattern(frame_bytes + frame_bytes // 2)
+    ingest.feed("a", written)
+    ingest.flush("a")
+    assert [len(f) for f in frames] == [frame_bytes, frame_bytes // 2]
+
+    # Enough writes to wrap the ring several times
+    frames.clear()
+    more = pattern(frame_bytes * 13, start=7)
+    for i in range(0, len(more), 1000):
+        ingest.feed("a", more[i:i + 1000])
+    ingest.flush("a")
+
+    assert all(len(f) == frame_bytes for f in frames[:-1])
+    assert b''.join(frames) == more
+    assert ingest.partial_flushes == 1 + (len(more) % frame_bytes != 0)
+
+
+def test_participants_are_buffered_separately():
+    frames = []
+    ingest = AudioIngest(lambda participant, frame: frames.append((participant, frame)), frame_ms=100)
+    half = ingest.frame_bytes // 2
+    ingest.feed("a", pattern(half))
+    ingest.feed("b", pattern(half, start=1))
+    assert frames == []
+    ingest.feed("a", pattern(half, start=half))
+    assert frames == [("a", pattern(2 * half))]
+
+
+def test_feed_base64_counts_invalid_payloads():
+    frames = []
+    ingest = AudioIngest(lambda participant, frame: frames.append(frame), frame_ms=100)
+    ingest.feed_base64("a", "not base64!")
+    assert ingest.decode_errors == 1
+    ingest.feed_base64("a", base64.b64encode(pattern(ingest.frame_bytes)).decode('ascii'))
+    assert frames == [pattern(ingest.frame_bytes)]
+
+
+class Transcriber:
+    def start(self):
+        pass
+
+    def write_audio(self, data):
+        pass
+
+    def stop(self):
+        pass
+
+
+def test_participants_closed_by_the_demux_are_forgotten():
+    async def main():
+        demux = ParticipantAudioDemux(lambda participant: Transcriber(), max_recognizers=2, min_idle_for_eviction=0)
+        ingest = AudioIngest(demux.write_audio, frame_ms=100)
+        demux.on_close = ingest.remove
+
+        # Recall's ids may be numbers; the ingest keys them like the demux
+        ingest.feed(7, pattern(ingest.frame_bytes + 10))
+        ingest.feed("b", pattern(ingest.frame_bytes))
+        await asyncio.sleep(0)
+        assert set(ingest.rings) == set(ingest.last_feed_at) == {"7", "b"}
+
+        # Reaped as idle
+        demux.close_stream("7")
+        assert set(ingest.rings) == set(ingest.last_feed_at) == {"b"}
+
+        # Evicted at the recognizer cap by a new participant
+        ingest.feed("c", pattern(ingest.frame_bytes))
+        ingest.feed("d", pattern(ingest.frame_bytes))
+        assert len(ingest.rings) == len(demux.streams) == 2
+        assert set(ingest.rings) == set(demux.streams)
+        await demux.stop()
+    asyncio.run(main())
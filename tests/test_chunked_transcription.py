@@ -0,0 +1,141 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.chunked_transcription import TICKS_PER_MS, plan_chunks, reconcile_speakers, stitch_chunks, trim_words_before
+
+# Two chunks cut at 60 s; each one's audio reaches 5 s into the other
+CHUNKS = [
+    {"index": 0, "cut_start_ms": 0.0, "cut_end_ms": 60000.0, "start_ms": 0.0, "end_ms": 65000.0},
+    {"index": 1, "cut_start_ms": 60000.0, "cut_end_ms": 120000.0, "start_ms": 55000.0, "end_ms": 120000.0},
+]
+
+
+def format_time(ticks) -> str:
+    return f"{ticks / TICKS_PER_MS:.0f}"
+
+
+def segment(speaker: str, words: list) -> dict:
+    """A recognized segment from (start_ms, word) pairs, 900 ms per word, in file-global time"""
+    start_ms, end_ms = words[0][0], words[-1][0] + 900
+    return {
+        "speaker": speaker,
+        "text": " ".join(word for _, word in words),
+        "start_time": format_time(start_ms * TICKS_PER_MS),
+        "start_ms": start_ms,
+        "end_ms": end_ms,
+        "duration_ms": end_ms - start_ms,
+        "words": [{"Word": word, "Offset": start * TICKS_PER_MS, "Duration": 900 * TICKS_PER_MS}
+                  for start, word in words],
+    }
+
+
+def recording():
+    """Speaker A, then B across the cut, then A again; chunk 1 numbers the speakers the other way round.
+
+    Chunk 0's audio ends before "epsilon" and chunk 1 splits B's sentence
+    differently, so the overlap holds both duplicates and new words.
+    """
+    first = [
+        segment("Guest-1", [(53000, "one"), (54000, "two"), (55000, "three"), (56000, "four")]),
+        segment("Guest-2", [(57000, "alpha"), (58000, "beta"), (60500, "gamma"), (62000, "delta")]),
+    ]
+    second = [
+        segment("Guest-2", [(55000, "three"), (56000, "four")]),
+        segment("Guest-1", [(57000, "alpha"), (58000, "beta")]),
+        segment("Guest-1", [(60500, "gamma"), (62000, "delta"), (64800, "epsilon")]),
+        segment("Guest-2", [(67000, "five"), (68000, "six")]),
+    ]
+    return [first, second]
+
+
+def test_plan_cuts_at_the_quietest_point_near_the_target():
+    levels = np.full(3000, -20.0)  # 300 s of speech in 100 ms frames
+    levels[1300:1310] = -60.0  # a one-second pause at 130 s
+    chunks = plan_chunks(levels, 100, 300000, chunk_ms=120000, overlap_ms=5000)
+
+    assert len(chunks) == 2
+    cut = chunks[0]['cut_end_ms']
+    assert 130000 <= cut <= 131000
+    assert chunks[1]['cut_start_ms'] == cut
+    assert chunks[0]['cut_start_ms'] == 0 and chunks[-1]['cut_end_ms'] == 300000
+    # The audio reaches overlap_ms past each cut, clipped to the recording
+    assert chunks[0]['start_ms'] == 0 and chunks[0]['end_ms'] == cut + 5000
+    assert chunks[1]['start_ms'] == cut - 5000 and chunks[1]['end_ms'] == 300000
+
+
+def test_short_recording_is_one_chunk():
+    chunks = plan_chunks(np.full(100, -20.0), 100, 10000, chunk_ms=120000, overlap_ms=5000)
+    assert chunks == [{"index": 0, "cut_start_ms": 0.0, "cut_end_ms": 10000,
+                       "start_ms": 0.0, "end_ms": 10000}]
+
+
+def test_speakers_keep_their_ids_across_chunks():
+    results = recording()
+    mappings = reconcile_speakers(CHUNKS, results)
+    assert mappings[1] == {"Guest-1": "Guest-2", "Guest-2": "Guest-1"}
+    assert [s['speaker'] for s in results[1]] == ["Guest-1", "Guest-2", "Guest-2", "Guest-1"]
+
+
+def test_speaker_without_overlap_evidence_gets_a_new_id():
+    results = recording()
+    results[1].append(segment("Guest-7", [(90000, "hello")]))
+    mappings = reconcile_speakers(CHUNKS, results)
+    # Speaks only after the overlap: the next free global id
+    assert mappings[1]["Guest-7"] == "Guest-3"
+    assert results[1][-1]['speaker'] == "Guest-3"
+
+
+def test_stitch_drops_words_heard_twice_and_keeps_global_times():
+    results = recording()
+    reconcile_speakers(CHUNKS, results)
+    stitched = stitch_chunks(CHUNKS, results, format_time)
+
+    assert [(s['speaker'], s['text']) for s in stitched] == [
+        ("Guest-1", "one two three four"),
+        ("Guest-2", "alpha beta gamma delta"),
+        ("Guest-2", "epsilon"),
+        ("Guest-1", "five six"),
+    ]
+    # Every word once, in order
+    words = [word['Word'] for s in stitched for word in s['words']]
+    assert words == "one two three four alpha beta gamma delta epsilon five six".split()
+    assert [(s['start_ms'], s['end_ms']) for s in stitched] == [
+        (53000, 56900), (57000, 62900), (64800, 65700), (67000, 68900)]
+    assert stitched[2]['start_time'] == "64800" and stitched[2]['duration_ms'] == 900
+
+
+def test_trim_words_before():
+    kept = segment("Guest-1", [(1000, "a"), (2000, "b"), (3000, "c")])
+    assert trim_words_before(kept, 2450, format_time)
+    assert kept['text'] == "b c" and kept['start_ms'] == 2000 and kept['duration_ms'] == 1900
+    assert not trim_words_before(segment("Guest-1", [(1000, "a")]), 1500, format_time)
+
+    # Without word timings the segment is kept only if most of it is new
+    untimed = dict(segment("Guest-1", [(1000, "a"), (2000, "b")]), words=[])
+    assert trim_words_before(untimed, 1900, format_time)
+    assert not trim_words_before(untimed, 2000, format_time)
+
+
+def test_step2_rebases_chunk_results_to_the_file():
+    pytest.importorskip("dotenv")
+    pytest.importorskip("azure.cognitiveservices.speech")
+    from stream_pipeline import load_step
+    # By path: the repo root has an older step2_transcribe.py of its own
+    step2 = load_step('step2_transcribe.py')
+
+    chunk = CHUNKS[1]
+    # Azure reports offsets from the start of the chunk's own audio
+    local = [(5500, "gamma"), (7000, "delta")]
+    result = SimpleNamespace(
+        speaker_id="Guest-1", text="gamma delta",
+        offset=5500 * TICKS_PER_MS, duration=2400 * TICKS_PER_MS,
+        json=json.dumps({"NBest": [{"Confidence": 0.9, "Words": [
+            {"Word": word, "Offset": start * TICKS_PER_MS, "Duration": 900 * TICKS_PER_MS} for start, word in local
+        ]}]})
+    )
+    rebased = step2.segment_from_result(result, int(chunk['start_ms'] * TICKS_PER_MS))
+    assert (rebased['start_ms'], rebased['end_ms']) == (60500, 62900)
+    assert [word['Offset'] / TICKS_PER_MS for word in rebased['words']] == [60500, 62000]
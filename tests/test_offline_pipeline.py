@@ -0,0 +1,107 @@
+import textwrap
+
+from app.offline_pipeline import ArtifactStore, OfflinePipeline, Stage
+
+
+def write_stage(path, body: str):
+    """A stage script: argv[1] is the input, the output is input + '.out'"""
+    path.write_text(textwrap.dedent('''
+        import sys
+        from pathlib import Path
+        source = Path(sys.argv[1])
+        output = source.with_name(source.name + '.out')
+        runs = source.with_name('runs')
+        runs.write_text(str(int(runs.read_text()) + 1) if runs.exists() else '1')
+    ''') + textwrap.dedent(body))
+
+
+def make_pipeline(tmp_path, body: str):
+    script = tmp_path / 'stage.py'
+    write_stage(script, body)
+    source = tmp_path / 'input.txt'
+    source.write_text('hello')
+    paths = {"input": source, "output": tmp_path / 'input.txt.out'}
+    stage = Stage("stage", script, ["input"], "output")
+    return OfflinePipeline([stage], paths, ArtifactStore(tmp_path / 'store')), paths
+
+
+def runs(tmp_path) -> int:
+    return int((tmp_path / 'runs').read_text())
+
+
+def test_complete_stage_is_stored_and_reused(tmp_path):
+    pipeline, paths = make_pipeline(tmp_path, '''
+        output.write_text(source.read_text().upper())
+    ''')
+    assert pipeline.run()
+    assert paths["output"].read_text() == 'HELLO'
+
+    rerun, _ = make_pipeline(tmp_path, '''
+        output.write_text(source.read_text().upper())
+    ''')
+    assert rerun.run()
+    assert rerun.reused == ["stage"]
+    assert runs(tmp_path) == 1
+
+
+def test_failed_stage_is_not_stored(tmp_path):
+    pipeline, paths = make_pipeline(tmp_path, '''
+        output.write_text('partial')
+        sys.exit(1)
+    ''')
+    assert not pipeline.run()
+    assert not pipeline.run()
+    assert runs(tmp_path) == 2
+
+
+def test_stage_leaving_a_journal_is_not_stored(tmp_path):
+    body = '''
+        output.write_text('partial')
+        output.with_suffix('.journal.jsonl').write_text('{}')
+    '''
+    pipeline, paths = make_pipeline(tmp_path, body)
+    assert not pipeline.run()
+    assert not list((tmp_path / 'store').rglob('*.out'))
+
+    # The next run reruns the stage (which resumes its journal) instead of reusing the partial output
+    rerun, _ = make_pipeline(tmp_path, body)
+    assert not rerun.run()
+    assert runs(tmp_path) == 2
+
+
+def test_stage_leaving_parts_is_not_stored(tmp_path):
+    pipeline, paths = make_pipeline(tmp_path, '''
+        output.write_text('partial')
+        output.with_name(output.stem + '_parts').mkdir()
+    ''')
+    assert not pipeline.run()
+    assert Stage.unfinished(paths["output"]) == [paths["output"].with_name('input.txt_parts')]
+
+
+def test_directory_output_is_stored_and_restored(tmp_path):
+    script = tmp_path / 'stage.py'
+    write_stage(script, '''
+        import shutil
+        shutil.rmtree(output, ignore_errors=True)
+        output.mkdir()
+        (output / 'meta.json').write_text(source.read_text() + ' ' + ' '.join(sys.argv[2:]))
+    ''')
+    source = tmp_path / 'input.txt'
+    source.write_text('hello')
+    paths = {"input": source, "output": tmp_path / 'input.txt.out'}
+    store = ArtifactStore(tmp_path / 'store')
+    stage = Stage("stage", script, ["input"], "output", args=["--segments"])
+
+    assert OfflinePipeline([stage], paths, store).run()
+    assert (paths["output"] / 'meta.json').read_text() == 'hello --segments'
+
+    # Restored from the store as a tree, not rerun
+    rerun = OfflinePipeline([stage], paths, store)
+    assert rerun.run()
+    assert rerun.reused == ["stage"]
+    assert runs(tmp_path) == 1
+    assert (paths["output"] / 'meta.json').read_text() == 'hello --segments'
+
+    # The args are part of the key
+    plain = Stage("stage", script, ["input"], "output")
+    assert plain.key(paths) != stage.key(paths)
@@ -0,0 +1,63 @@
+from app.run_journal import RunJournal, fingerprint
+
+
+def test_resume_after_close(tmp_path):
+    path = tmp_path / 'step.journal.jsonl'
+    journal = RunJournal(path, "abc")
+    journal.record(1, {"text": "один"})
+    journal.record("2")
+    journal.close()
+
+    resumed = RunJournal(path, "abc")
+    assert resumed.resumed == 2
+    assert 1 in resumed and "1" in resumed
+    assert resumed.get(1) == {"text": "один"}
+    assert resumed.get(3, "missing") == "missing"
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = tmp_path / 'step.journal.jsonl'
+    journal = RunJournal(path, "abc")
+    journal.record(1, "done")
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "2", "val')  # crash in the middle of a write
+
+    resumed = RunJournal(path, "abc")
+    assert len(resumed) == 1 and 2 not in resumed
+    # The next record starts on a line of its own
+    resumed.record(2, "done")
+    resumed.close()
+    assert RunJournal(path, "abc").get(2) == "done"
+
+
+def test_journal_for_other_inputs_is_set_aside(tmp_path):
+    path = tmp_path / 'step.journal.jsonl'
+    journal = RunJournal(path, "old")
+    journal.record(1, "done")
+    journal.close()
+
+    fresh = RunJournal(path, "new")
+    assert len(fresh) == 0 and fresh.resumed == 0
+    stale = path.with_name(path.name + '.stale')
+    assert stale.exists() and '"old"' in stale.read_text()
+    fresh.close()
+    assert '"new"' in path.read_text().splitlines()[0]
+
+
+def test_finish_removes_the_journal(tmp_path):
+    path = tmp_path / 'step.journal.jsonl'
+    journal = RunJournal(path)
+    journal.record(1)
+    journal.finish()
+    assert not path.exists()
+
+
+def test_fingerprint_hashes_file_contents(tmp_path):
+    source = tmp_path / 'input.json'
+    source.write_text('{"a": 1}')
+    first = fingerprint(source, "model", None)
+    assert fingerprint(source, "model", None) == first
+    assert fingerprint(source, "other", None) != first
+    source.write_text('{"a": 2}')
+    assert fingerprint(source, "model", None) != first
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+import run_pipeline
+import stream_pipeline
+from app.offline_pipeline import ArtifactStore, OfflinePipeline
+
+
+@pytest.fixture
+def streaming(tmp_path, monkeypatch):
+    """Pipeline over an extracted audio file, with the streaming run replaced by one that reports `complete`"""
+    source = tmp_path / 'talk_audio.wav'
+    source.write_bytes(b'RIFF')
+    paths = run_pipeline.artifact_paths(source)
+    stages = [stage for stage in run_pipeline.STAGES if stage.name != "step1"]
+    store = ArtifactStore(tmp_path / 'store')
+    state = {"complete": list(stream_pipeline.STREAMED), "streams": 0, "dag_runs": []}
+
+    async def fake_stream(paths):
+        state["streams"] += 1
+        for name in stream_pipeline.STREAMED:
+            paths[name].write_text(f"{name} {state['streams']}")
+        return state["complete"]
+    monkeypatch.setattr(stream_pipeline, "stream_pipeline", fake_stream)
+
+    def make_pipeline():
+        pipeline = OfflinePipeline(stages, paths, store)
+        monkeypatch.setattr(pipeline, "run", lambda targets=None, force=(): state["dag_runs"].append(targets) or True)
+        return pipeline
+    return make_pipeline, paths, store, state
+
+
+def stored(store, paths, pipeline):
+    return [stage.name for stage in pipeline.plan(["step4"])
+            if store.path(stage.name, stage.key(paths), paths[stage.output].suffix).exists()]
+
+
+def test_complete_stream_is_stored(streaming):
+    make_pipeline, paths, store, state = streaming
+    pipeline = make_pipeline()
+    assert run_pipeline.run_streaming(pipeline, paths)
+    assert stored(store, paths, pipeline) == ["step2", "step3", "step3.5", "step4"]
+
+
+def test_partial_stream_stores_only_complete_outputs_and_resumes(streaming):
+    make_pipeline, paths, store, state = streaming
+    state["complete"] = ["transcription", "translated"]
+    pipeline = make_pipeline()
+    assert not run_pipeline.run_streaming(pipeline, paths)
+    assert stored(store, paths, pipeline) == ["step2", "step3"]
+    assert pipeline.ran == ["step2", "step3"]
+
+    # The rerun doesn't stream (and transcribe) again: the DAG resumes after the transcription
+    rerun = make_pipeline()
+    assert run_pipeline.run_streaming(rerun, paths)
+    assert state["streams"] == 1
+    assert state["dag_runs"] == [["step4"]]
+
+
+def test_segment_store_option_switches_transcription_and_translation(tmp_path):
+    paths = run_pipeline.artifact_paths(tmp_path / 'talk.mp4')
+    stages, store_paths = run_pipeline.with_segment_store(run_pipeline.STAGES, paths)
+    assert store_paths["transcription"].name == 'talk_transcription.segments'
+    assert store_paths["translated"].name == 'talk_translated.segments'
+    assert store_paths["reviewed"] == paths["reviewed"]
+    assert {stage.name: stage.args for stage in stages if stage.args} == {
+        "step2": ["--segments"], "step3": ["--segments"]}
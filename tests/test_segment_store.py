@@ -0,0 +1,63 @@
+import json
+
+from app.segment_store import SegmentStore, is_segment_store, load_transcript, save_transcript
+
+TRANSCRIPT = {
+    "audio_file": "talk_audio.wav",
+    "speakers": {"Guest-1": "male", "Guest-2": "female"},
+    "segments": [
+        {
+            "segment_id": i,
+            "speaker": f"Guest-{1 + i % 2}",
+            "gender": "male" if i % 2 == 0 else "female",
+            "start_ms": 1000 * i,
+            "end_ms": 1000 * i + 800,
+            "text": f"сегмент номер {i}",
+            "confidence": 0.5 + i / 100,
+            "words": [{"Word": "сегмент", "Offset": 10_000_000 * i, "Duration": 4_000_000, "Confidence": 0.9}],
+        }
+        for i in range(8)
+    ],
+}
+
+
+def test_store_round_trip(tmp_path):
+    path = tmp_path / 'talk_transcription.segments'
+    save_transcript(path, TRANSCRIPT)
+    assert is_segment_store(path)
+    store = SegmentStore(path)
+    assert {column['name']: column['kind'] for column in store.meta['columns']} == {
+        "segment_id": "int", "speaker": "category", "gender": "category", "start_ms": "int",
+        "end_ms": "int", "text": "text", "confidence": "float", "words": "words",
+    }
+    assert store.to_json() == TRANSCRIPT
+    assert list(store.array('start_ms')) == [1000 * i for i in range(8)]
+
+
+def test_load_transcript_reads_both_formats(tmp_path):
+    json_path = tmp_path / 'talk_transcription.json'
+    store_path = tmp_path / 'talk_transcription.segments'
+    save_transcript(json_path, TRANSCRIPT)
+    save_transcript(store_path, TRANSCRIPT)
+    assert json.loads(json_path.read_text(encoding='utf-8')) == TRANSCRIPT
+
+    data = load_transcript(store_path)
+    assert data['speakers'] == TRANSCRIPT['speakers']
+    segment = data['segments'][-1]
+    assert segment['text'] == "сегмент номер 7" and segment.get('missing', 'x') == 'x'
+    assert dict(segment) == TRANSCRIPT['segments'][-1]
+
+
+def test_save_replaces_instead_of_writing_through_links(tmp_path):
+    path = tmp_path / 'talk_translated.json'
+    save_transcript(path, {"segments": []})
+    link = tmp_path / 'stored.json'
+    link.hardlink_to(path)
+    save_transcript(path, TRANSCRIPT)
+    assert json.loads(link.read_text(encoding='utf-8')) == {"segments": []}
+
+    store_path = tmp_path / 'talk_translated.segments'
+    save_transcript(store_path, TRANSCRIPT)
+    save_transcript(store_path, {"segments": TRANSCRIPT['segments'][:2]})
+    assert len(SegmentStore(store_path)) == 2
+    assert not store_path.with_name(store_path.name + '.tmp').exists()
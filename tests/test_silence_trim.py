@@ -0,0 +1,87 @@
+import wave
+
+import numpy as np
+
+from app.silence_trim import find_pauses, kept_regions, trim_pauses_numpy, write_regions
+
+FRAME_MS = 10
+SPEECH_DB = -20.0
+SILENCE_DB = -80.0
+# Windows are averaged in power: one speech frame among 200 silent ones (-43 dB) is not silence
+THRESHOLD_DB = -50.0
+
+
+def levels(*runs) -> np.ndarray:
+    """Frame levels from (level_db, duration_ms) runs"""
+    return np.concatenate([np.full(duration_ms // FRAME_MS, level) for level, duration_ms in runs])
+
+
+def test_pauses_at_both_edges_of_the_file():
+    pauses = find_pauses(levels((SILENCE_DB, 3000), (SPEECH_DB, 1000), (SILENCE_DB, 2500)),
+                         FRAME_MS, 2000, THRESHOLD_DB)
+    assert pauses == [(0, 3000), (4000, 6500)]
+
+    # Leading silence keeps its last keep_silence_ms; trailing silence too
+    assert kept_regions(pauses, 6500, 2000, 250) == [(2750.0, 4000.0), (6250.0, 6500)]
+
+
+def test_pause_of_exactly_min_pause_ms_is_kept():
+    pauses = find_pauses(levels((SPEECH_DB, 1000), (SILENCE_DB, 2000), (SPEECH_DB, 1000)),
+                         FRAME_MS, 2000, THRESHOLD_DB)
+    assert pauses == [(1000, 3000)]
+    # Only pauses longer than min_pause_ms are shortened (like pydub)
+    assert kept_regions(pauses, 4000, 2000, 250) == [(0.0, 4000)]
+
+    # One frame shorter is not a pause at all
+    assert find_pauses(levels((SPEECH_DB, 1000), (SILENCE_DB, 1990), (SPEECH_DB, 1000)),
+                       FRAME_MS, 2000, THRESHOLD_DB) == []
+
+
+def test_click_inside_a_long_pause_does_not_split_it():
+    click = levels((SPEECH_DB, 1000), (SILENCE_DB, 1500), (-30.0, 10), (SILENCE_DB, 1490), (SPEECH_DB, 1000))
+    assert find_pauses(click, FRAME_MS, 2000, THRESHOLD_DB) == [(1000, 4000)]
+
+    # A loud one is speech: what is left on either side is shorter than a pause
+    loud = levels((SPEECH_DB, 1000), (SILENCE_DB, 1500), (0.0, 10), (SILENCE_DB, 1490), (SPEECH_DB, 1000))
+    assert find_pauses(loud, FRAME_MS, 2000, THRESHOLD_DB) == []
+
+
+def write_wav(path, samples: np.ndarray, rate: int = 16000):
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.astype('<i2').tobytes())
+
+
+def read_wav(path) -> np.ndarray:
+    with wave.open(str(path), 'rb') as wav:
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+
+
+def test_write_regions_copies_exactly_the_regions(tmp_path):
+    samples = np.arange(16000, dtype=np.int64) % 30000  # one second, every sample distinct
+    source, output = tmp_path / 'in.wav', tmp_path / 'out.wav'
+    write_wav(source, samples)
+
+    # Small blocks so regions span several reads; the last region runs past the end
+    duration = write_regions(source, output, [(0, 100), (250.5, 400), (900, 1200)], block_frames=500)
+    expected = np.concatenate([samples[0:1600], samples[4008:6400], samples[14400:]])
+    assert np.array_equal(read_wav(output), expected)
+    assert duration == len(expected) * 1000 / 16000
+
+
+def test_trim_pauses_streams_wav_to_wav(tmp_path):
+    rate = 16000
+    rng = np.random.default_rng(0)
+    speech = rng.normal(0, 3000, rate)
+    silence = rng.normal(0, 3, 3 * rate)
+    source, output = tmp_path / 'in.wav', tmp_path / 'out.wav'
+    write_wav(source, np.concatenate([silence, speech, silence, speech]))
+
+    result = trim_pauses_numpy(source, output, min_pause_ms=2000, keep_silence_ms=250)
+    assert result["pauses"] == 2
+    assert result["input_ms"] == 8000
+    # Each 3 s pause is cut to 250 ms
+    assert result["output_ms"] == 2500
+    assert len(read_wav(output)) == 2500 * rate // 1000
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("openai")
+
+import step3_translate as step3
+from app.glossary_matcher import GlossaryMatcher
+
+GLOSSARY = {
+    "выручка": {"en": "revenue"},
+    "маржа": {"en": "margin"},
+}
+
+
+@pytest.fixture
+def matcher():
+    return GlossaryMatcher(GLOSSARY)
+
+
+def jobs_for(texts, matcher):
+    return [step3.make_job(i, {"text": text}, matcher) for i, text in enumerate(texts)]
+
+
+def answer(jobs, **overrides):
+    items = [{"id": job['index'] + 1, "translation": f" en {job['index']} "} for job in jobs]
+    for key, value in overrides.items():
+        items[int(key[1:])] = value
+    return json.dumps({"translations": items})
+
+
+def test_pack_batches_bounds_segments_and_tokens(matcher):
+    jobs = jobs_for(["короткий текст"] * 7 + ["длинный " * 200] + ["ещё"] * 2, matcher)
+    batches = step3.pack_batches(jobs, matcher, max_segments=3, max_tokens=300)
+
+    assert [[job['index'] for job in batch['jobs']] for batch in batches] == [[0, 1, 2], [3, 4, 5], [6], [7], [8, 9]]
+    # An oversized segment still gets a batch of its own
+    assert len(batches[3]['jobs'][0]['text']) // 3 > 300
+    payload = json.loads(batches[0]['payload'])
+    assert [segment['id'] for segment in payload['segments']] == [1, 2, 3]
+
+
+def test_batch_prompt_has_the_union_of_glossary_terms(matcher):
+    jobs = jobs_for(["выручка выросла", "маржа упала", "выручка снова"], matcher)
+    batch, = step3.pack_batches(jobs, matcher)
+    assert "→ revenue" in batch['system_prompt'] and "→ margin" in batch['system_prompt']
+    assert batch['system_prompt'].count("→ revenue") == 1
+    assert batch['system_prompt'].endswith(step3.BATCH_INSTRUCTIONS)
+
+
+def test_parse_batch_response(matcher):
+    jobs = jobs_for(["раз", "два", "три"], matcher)[1:]
+    assert step3.parse_batch_response(answer(jobs), jobs) == {1: "en 1", 2: "en 2"}
+    # A bare list is accepted too, in any order
+    items = json.loads(answer(jobs))['translations'][::-1]
+    assert step3.parse_batch_response(json.dumps(items), jobs) == {1: "en 1", 2: "en 2"}
+
+
+@pytest.mark.parametrize("content", [
+    '{"translations": [{"id": 2, "translation": "en"}',  # truncated
+    '{"result": []}',
+    '{"translations": [{"id": 2, "translation": "en 1"}]}',  # missing segment
+    '{"translations": [{"id": 2, "translation": "a"}, {"id": 2, "translation": "b"}]}',  # duplicate
+    '{"translations": [{"id": 2, "translation": "a"}, {"id": 9, "translation": "b"}]}',  # unknown id
+    '{"translations": [{"id": 2, "translation": "a"}, {"id": 3, "translation": "  "}]}',  # empty
+    '{"translations": [{"id": 2, "translation": "a"}, "b"]}',
+])
+def test_parse_batch_response_rejects_incomplete_answers(matcher, content):
+    jobs = jobs_for(["раз", "два", "три"], matcher)[1:]
+    assert step3.parse_batch_response(content, jobs) is None
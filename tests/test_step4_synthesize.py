@@ -0,0 +1,127 @@
+import io
+import json
+import re
+import struct
+import wave
+
+import pytest
+
+pytest.importorskip("dotenv")
+speechsdk = pytest.importorskip("azure.cognitiveservices.speech")
+
+import step4_synthesize_audio as step4
+
+
+def wav_of(duration_ms: float, rate: int = 16000, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b'\x01\x00' * channels * int(rate * duration_ms / 1000))
+    return buffer.getvalue()
+
+
+class FakeResult:
+    def __init__(self, audio_data: bytes):
+        self.reason = speechsdk.ResultReason.SynthesizingAudioCompleted
+        self.audio_data = audio_data
+
+
+class FakeSynthesizer:
+    """Answers like the service: duration grows with the text and shrinks with the prosody rate"""
+
+    def speak_ssml_async(self, ssml: str):
+        rate, text = re.search(r'rate="([^"]*)">\s*(.*?)\s*</prosody>', ssml, re.S).groups()
+        duration_ms = (250 + 55 * len(text)) / (1 + float(rate.rstrip('%')) / 100)
+        return type("Future", (), {"get": lambda future: FakeResult(wav_of(duration_ms))})()
+
+
+@pytest.fixture
+def synthesis(tmp_path, monkeypatch):
+    """Translation file and output path, synthesized against the fake service"""
+    monkeypatch.setattr(step4, "AZURE_SPEECH_KEY", "test-key")
+    monkeypatch.setattr(step4, "TTS_CACHE_DIR", str(tmp_path / 'cache'))
+    # Every synthesizer created is kept, to read its azure_calls after the run
+    runs = []
+
+    def create_synthesizer(self, voice: str):
+        if self not in runs:
+            runs.append(self)
+        return FakeSynthesizer()
+    monkeypatch.setattr(step4.AzureTTSSynthesizer, "create_synthesizer", create_synthesizer)
+
+    segments = []
+    start = 0
+    for i in range(30):
+        text = f"part {i}: " + " ".join(["quarterly results"] * (1 + i % 6))
+        duration = 300 + 45 * len(text)
+        segments.append({"segment_id": i, "start_ms": start, "end_ms": start + duration,
+                         "translation": text, "gender": "male" if i % 3 else "female"})
+        start += duration + (150, 400, 1200)[i % 3]
+    translation = tmp_path / 'talk_translated_fixed.json'
+    translation.write_text(json.dumps({"segments": segments}), encoding='utf-8')
+    return translation, tmp_path / 'talk_audio_en.wav', runs
+
+
+def test_rerun_reuses_plan_and_cache(synthesis):
+    translation, output, runs = synthesis
+    assert step4.synthesize_translation_audio(str(translation), str(output))
+    assert runs[-1].azure_calls == 30
+    first = output.read_bytes()
+
+    # The duration model has learned from the first run; the saved plan keeps the rates anyway
+    runs.clear()
+    assert step4.synthesize_translation_audio(str(translation), str(output))
+    assert not runs  # no synthesizer was even needed
+    assert output.read_bytes() == first
+
+
+def test_output_is_one_16khz_mono_wav(synthesis):
+    translation, output, _ = synthesis
+    assert step4.synthesize_translation_audio(str(translation), str(output))
+    with wave.open(str(output), 'rb') as wav:
+        assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, 16000)
+        assert wav.getnframes() > 0
+    assert not list(output.parent.glob('*.part*'))
+    assert not output.with_name('talk_audio_en_parts').exists()
+
+
+def test_azure_calls_are_counted_across_threads(synthesis):
+    tts = step4.AzureTTSSynthesizer("test-key", "westeurope")
+    texts = [f"sentence number {i}" for i in range(400)]
+    with step4.ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(tts.synthesize, texts))
+    assert all(results)
+    assert tts.azure_calls == len(texts)
+
+
+def test_timeline_header_matches_the_streamed_audio(tmp_path):
+    output = tmp_path / 'dub.wav'
+    timeline = step4.DubbingTimeline(output)
+    timeline.sync({"start_ms": 1500})
+    timeline.add({"start_ms": 1500, "end_ms": 2000}, wav_of(500))
+    # Converted to the track's format on the way in
+    timeline.add({"start_ms": 2000, "end_ms": 3000}, wav_of(1000, rate=24000, channels=2))
+    timeline.sync({"start_ms": 2500})  # the track is already past it: no silence
+    assert timeline.finish() == 3000
+
+    data = output.read_bytes()
+    riff, riff_size, wave_id = struct.unpack('<4sI4s', data[:12])
+    assert (riff, wave_id, riff_size) == (b'RIFF', b'WAVE', len(data) - 8)
+    channels, rate, byte_rate, block_align, bits = struct.unpack('<HIIHH', data[22:36])
+    assert (channels, rate, byte_rate, block_align, bits) == (1, 16000, 32000, 2, 16)
+    data_id, data_size = struct.unpack('<4sI', data[36:44])
+    assert (data_id, data_size) == (b'data', 3 * 32000)
+    # The leading silence is exact, the segments follow it directly
+    assert data[44:44 + 48000] == bytes(48000)
+    assert data[44 + 48000:44 + 48002] == b'\x01\x00'
+    assert not output.with_name('dub.wav.part.wav').exists()
+
+
+def test_aborted_timeline_leaves_nothing(tmp_path):
+    output = tmp_path / 'dub.wav'
+    timeline = step4.DubbingTimeline(output)
+    timeline.add({"end_ms": 500}, wav_of(500))
+    timeline.abort()
+    assert not list(tmp_path.iterdir())
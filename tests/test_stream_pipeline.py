@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("azure.cognitiveservices.speech")
+
+import step4_synthesize_audio as step4
+import stream_pipeline
+from test_step4_synthesize import FakeSynthesizer
+
+
+class SlowSynthesizer(FakeSynthesizer):
+    """Takes a while per call and records how many calls overlap"""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def speak_ssml_async(self, ssml: str):
+        cls = SlowSynthesizer
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.active -= 1
+        return super().speak_ssml_async(ssml)
+
+
+def transcript(count: int) -> list:
+    segments = []
+    start = 0
+    for i in range(count):
+        text = f"часть {i}: " + "квартальные результаты " * (1 + i % 4)
+        duration = 400 + 45 * len(text)
+        segments.append({"segment_id": i, "start_ms": start, "end_ms": start + duration,
+                         "start_time": f"{start}", "speaker": "Guest-1", "text": text, "gender": "female"})
+        start += duration + 300
+    return segments
+
+
+def fake_steps(segments: list, translate_errors=()):
+    """step2, step3 and step3.5 as the streaming run uses them, without the Azure services"""
+    async def stream_transcription(audio_file, glossary):
+        for segment in segments:
+            await asyncio.sleep(0)
+            yield dict(segment)
+
+    async def translate_segment_stream(source, cache, matcher):
+        async for segment in source:
+            error = segment['segment_id'] in translate_errors
+            translation = "[Translation error: timeout]" if error else f"part {segment['text']}"
+            yield dict(segment, original=segment['text'], translation=translation)
+
+    step2 = SimpleNamespace(
+        stream_transcription=stream_transcription,
+        assign_gender=lambda speakers, result: None,
+        transcription_output=lambda audio_file, results, speakers, glossary: {"segments": results},
+    )
+    step3 = SimpleNamespace(
+        load_glossary=dict,
+        GlossaryMatcher=lambda glossary: None,
+        TranslationCache=lambda **kwargs: SimpleNamespace(close=lambda: None),
+        TRANSLATION_CACHE_SIZE=16,
+        TRANSLATION_CACHE_DB=None,
+        translate_segment_stream=translate_segment_stream,
+        translation_output=lambda transcription, segments, glossary: {"segments": segments},
+    )
+    step35 = SimpleNamespace(
+        AzureOpenAI=lambda **kwargs: None,
+        AZURE_OPENAI_KEY="", AZURE_OPENAI_API_VERSION="", AZURE_OPENAI_ENDPOINT="",
+        REVIEW_BATCH_SIZE=10,
+        analyze_and_fix_translations=lambda client, batch, batch_num: [{"id": s['segment_id']} for s in batch],
+        apply_fixes=lambda batch, fixes: None,
+    )
+    return {"step2_transcribe.py": step2, "step3_translate.py": step3,
+            "step3.5_review.py": step35, "step4_synthesize_audio.py": step4}
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    monkeypatch.setattr(step4, "AZURE_SPEECH_KEY", "test-key")
+    monkeypatch.setattr(step4, "TTS_CACHE_DIR", str(tmp_path / 'cache'))
+    monkeypatch.setattr(step4, "TTS_WORKERS", 4)
+    created = []
+    monkeypatch.setattr(step4.AzureTTSSynthesizer, "create_synthesizer",
+                        lambda self, voice: created.append(voice) or SlowSynthesizer())
+    SlowSynthesizer.peak = 0
+
+    paths = {name: tmp_path / f"talk{suffix}" for name, suffix in (
+        ("audio", "_audio.wav"), ("transcription", "_transcription.json"), ("translated", "_translated.json"),
+        ("reviewed", "_translated_fixed.json"), ("audio_en", "_audio_en.wav"))}
+
+    def run(segments, **errors):
+        steps = fake_steps(segments, **errors)
+        monkeypatch.setattr(stream_pipeline, "load_step", steps.__getitem__)
+        return asyncio.run(stream_pipeline.stream_pipeline(paths))
+    return run, paths, created
+
+
+def test_segments_are_synthesized_concurrently_and_placed_in_order(run):
+    run, paths, _ = run
+    segments = transcript(24)
+    assert run(segments) == list(stream_pipeline.STREAMED)
+    assert SlowSynthesizer.peak > 1
+
+    with wave.open(str(paths['audio_en']), 'rb') as wav:
+        duration_ms = wav.getnframes() * 1000 / wav.getframerate()
+    # Placed in order: the track ends around the last segment, not earlier
+    assert duration_ms >= segments[-1]['start_ms']
+
+
+def test_translation_errors_leave_later_outputs_partial(run):
+    run, paths, _ = run
+    assert run(transcript(12), translate_errors={3}) == ["transcription"]
+    assert paths['audio_en'].exists()
+
+
+def test_stream_is_planned_like_step4(run, capsys):
+    run, paths, created = run
+    assert run(transcript(24)) == list(stream_pipeline.STREAMED)
+    assert "Drift vs original ends" in capsys.readouterr().out
+
+    # step4 on the streamed translations finds the stream's plan: same rates, all from the cache
+    created.clear()
+    dub = paths['audio_en'].with_name('talk_step4_audio_en.wav')
+    assert step4.synthesize_translation_audio(str(paths['reviewed']), str(dub))
+    assert not created
+    assert dub.read_bytes() == paths['audio_en'].read_bytes()
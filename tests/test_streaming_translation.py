@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.realtime_translator.streaming_translation import SentenceSplitter, iter_completion_text
+
+TEXT = ("Revenue grew by 3.5 percent this quarter. Costs, e.g. salaries and rent, stayed flat! "
+        "Yes. We expect version 1.2 to ship in May… Questions?")
+
+SENTENCES = [
+    "Revenue grew by 3.5 percent this quarter.",
+    "Costs, e.g. salaries and rent, stayed flat!",
+    "Yes. We expect version 1.2 to ship in May…",
+    "Questions?",
+]
+
+
+def test_split_skips_decimals_abbreviations_and_short_sentences():
+    assert SentenceSplitter.split(TEXT) == SENTENCES
+
+
+def test_feed_in_any_chunking_gives_the_same_sentences():
+    for size in (1, 2, 7, 40):
+        splitter = SentenceSplitter()
+        sentences = []
+        for i in range(0, len(TEXT), size):
+            sentences += splitter.feed(TEXT[i:i + size])
+        sentences.append(splitter.flush())
+        assert sentences == SENTENCES, size
+
+
+def test_sentence_is_emitted_once_the_next_delta_starts():
+    splitter = SentenceSplitter(min_chars=0)
+    assert splitter.feed("Done.") == []
+    assert splitter.feed(" Next") == ["Done."]
+    assert splitter.flush() == "Next"
+    assert splitter.flush() == ""
+
+
+def test_iter_completion_text_skips_chunks_without_content():
+    def chunk(*contents):
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=c)) for c in contents])
+
+    async def stream():
+        for c in (SimpleNamespace(choices=[]), chunk("Hello"), chunk(None), chunk(", world")):
+            yield c
+
+    async def collect():
+        return [delta async for delta in iter_completion_text(stream())]
+
+    assert asyncio.run(collect()) == ["Hello", ", world"]
@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app import translation_engine
+from app.translation_engine import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock that asyncio.sleep advances instantly"""
+    now = [0.0]
+
+    async def sleep(seconds):
+        # A real sleep always lets some time pass
+        now[0] += max(seconds, 1e-6)
+
+    monkeypatch.setattr(translation_engine, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(translation_engine.asyncio, "sleep", sleep)
+    return now
+
+
+def test_burst_is_a_second_of_quota_not_a_window(clock):
+    limiter = RateLimiter(rpm=300, tpm=60000)
+    assert limiter.requests.capacity == 5
+    assert limiter.tokens.capacity == 1000
+
+    async def send(count):
+        for _ in range(count):
+            await limiter.acquire(0)
+    # 50 requests fit one 10-second window of a 300 RPM quota: the burst
+    # doesn't let them all out at once
+    asyncio.run(send(50))
+    assert clock[0] == pytest.approx(9.0)
+
+
+def test_request_larger_than_the_bucket_leaves_it_in_debt(clock):
+    bucket = TokenBucket(600, capacity=100)
+    assert asyncio.run(bucket.acquire(250)) == 0
+    # The next one waits for the 150 owed plus its own 100 tokens
+    assert asyncio.run(bucket.acquire(100)) == pytest.approx(25.0)
+
+
+def test_throttle_keeps_the_debt(clock):
+    limiter = RateLimiter(tpm=600)
+    asyncio.run(limiter.acquire(30))
+    limiter.throttle(1.0)
+    assert limiter.tokens.available == -20
+    assert limiter.tokens.scale == pytest.approx(0.7)
@@ -0,0 +1,80 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from app import tts_cache
+from app.tts_cache import TTSCache
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """Every call is one second later, so last-use order never ties"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(tts_cache, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def key(name: str) -> str:
+    return TTSCache.key("en-US-JennyNeural", name, "+0%", "Riff16Khz16BitMonoPcm")
+
+
+def test_key_covers_voice_content_rate_and_format():
+    keys = {
+        TTSCache.key("a", "text", "+0%", "fmt"),
+        TTSCache.key("b", "text", "+0%", "fmt"),
+        TTSCache.key("a", "other", "+0%", "fmt"),
+        TTSCache.key("a", "text", "+10%", "fmt"),
+        TTSCache.key("a", "text", "+0%", "other"),
+    }
+    assert len(keys) == 5
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=300)
+    for name in "abc":
+        cache.put(key(name), name.encode() * 100)
+    assert cache.get(key("a")) == b"a" * 100  # "b" is now the least recently used
+
+    cache.put(key("d"), b"d" * 100)
+    assert cache.evictions == 1
+    assert cache.get(key("b")) is None
+    assert not cache.path(key("b")).exists()
+    assert [cache.get(key(name)) is not None for name in "acd"] == [True, True, True]
+    assert cache.get_metrics()["bytes"] == 300
+
+
+def test_oversized_entries_evict_until_under_the_limit(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=250)
+    cache.put(key("a"), b"a" * 100)
+    cache.put(key("b"), b"b" * 100)
+    cache.put(key("c"), b"c" * 200)
+    assert cache.evictions == 2
+    assert cache.get_metrics()["entries"] == 1
+
+
+def test_index_is_shared_between_instances(tmp_path):
+    writer = TTSCache(tmp_path)
+    reader = TTSCache(tmp_path)
+    writer.put(key("a"), b"audio")
+    # Added after reader loaded its index
+    assert reader.get(key("a")) == b"audio"
+
+    # Evicted by another process: the file is gone, the lookup is a miss
+    writer.path(key("a")).unlink()
+    assert reader.get(key("a")) is None
+    assert reader.get_metrics()["entries"] == 0
+    writer.close()
+    reader.close()
+
+
+def test_last_use_survives_a_restart(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=200)
+    cache.put(key("a"), b"a" * 100)
+    cache.put(key("b"), b"b" * 100)
+    cache.get(key("a"))
+    cache.close()
+
+    reopened = TTSCache(tmp_path, max_bytes=200)
+    reopened.put(key("c"), b"c" * 100)
+    assert reopened.get(key("b")) is None
+    assert reopened.get(key("a")) == b"a" * 100
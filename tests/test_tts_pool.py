@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.tts_pool import SynthesizerPool
+
+
+class Synthesizer:
+    def __init__(self, voice: str):
+        self.voice = voice
+
+
+def test_busy_voice_does_not_hold_up_a_voice_added_later():
+    release = threading.Event()
+    pool = SynthesizerPool(Synthesizer, per_voice=1)
+
+    async def main():
+        # Every thread of the first voice is stuck in a call
+        busy = asyncio.ensure_future(pool.run_async("en-US-GuyNeural", lambda synthesizer: release.wait(5)))
+        await asyncio.sleep(0.05)
+        voice = await asyncio.wait_for(
+            pool.run_async("en-US-JennyNeural", lambda synthesizer: synthesizer.voice), timeout=1
+        )
+        release.set()
+        await busy
+        return voice
+
+    try:
+        assert asyncio.run(main()) == "en-US-JennyNeural"
+    finally:
+        release.set()
+        pool.close()
+
+
+def test_failed_warm_up_leaves_the_rest_to_first_use():
+    attempts = []
+
+    def create(voice):
+        attempts.append(voice)
+        if len(attempts) == 2:
+            raise ConnectionError("handshake timed out")
+        return Synthesizer(voice)
+
+    pool = SynthesizerPool(create, voices=["en-US-GuyNeural"], per_voice=2)
+    with pytest.raises(ConnectionError):
+        pool.warm()
+
+    # Both slots are still there: one connected, one created when needed
+    assert pool.run("en-US-GuyNeural", lambda synthesizer: synthesizer.voice) == "en-US-GuyNeural"
+    with pool.lease("en-US-GuyNeural") as first, pool.lease("en-US-GuyNeural") as second:
+        assert first is not second
+    assert len(attempts) == 3
+    pool.close()
+
+
+def test_synthesizer_dropped_after_a_failure_is_disposed():
+    disposed = []
+    pool = SynthesizerPool(Synthesizer, voices=["en-US-GuyNeural"], per_voice=1, dispose=disposed.append)
+    pool.warm()
+    with pool.lease("en-US-GuyNeural") as broken:
+        pass
+
+    def fail(synthesizer):
+        raise RuntimeError("connection reset")
+    with pytest.raises(RuntimeError):
+        pool.run("en-US-GuyNeural", fail)
+    assert disposed == [broken]
+
+    with pool.lease("en-US-GuyNeural") as replacement:
+        assert replacement is not broken
+    assert pool.get_metrics()["failures"] == 1
+    pool.close()
@@ -0,0 +1,108 @@
+import pytest
+
+from app.tts_timing import (
+    DEFAULT_MS_PER_CHAR, DEFAULT_OFFSET_MS, MIN_OBSERVATIONS,
+    DriftStats, DurationModel, TimingPlanner, format_rate, parse_rate
+)
+
+VOICE = "en-US-GuyNeural"
+
+
+def text(chars: int) -> str:
+    return "x" * chars
+
+
+def prior_ms(chars: int, rate: float = 0.0) -> float:
+    return (DEFAULT_OFFSET_MS + DEFAULT_MS_PER_CHAR * chars) / (1 + rate / 100)
+
+
+def item(start_ms, end_ms, chars):
+    return {"start_ms": start_ms, "end_ms": end_ms, "text": text(chars), "voice": VOICE}
+
+
+def test_rates():
+    assert parse_rate("-10%") == -10.0
+    assert parse_rate("") == parse_rate("default") == parse_rate(None) == 0.0
+    assert parse_rate(7) == 7.0
+    assert format_rate(13.6) == "+14%" and format_rate(-10) == "-10%"
+
+
+def test_model_learns_a_voice_and_keeps_it_on_disk(tmp_path):
+    path = tmp_path / 'durations.sqlite'
+    model = DurationModel(path)
+    assert model.predict_ms(VOICE, text(10)) == prior_ms(10)
+
+    for i in range(MIN_OBSERVATIONS):
+        chars, rate = 10 + 7 * i, (-10, 0, 20)[i % 3]
+        model.observe(VOICE, f"{i}" + text(chars - len(str(i))), f"{rate:+d}%", (200 + 50 * chars) / (1 + rate / 100))
+    model.close()
+
+    reopened = DurationModel(path)
+    offset, ms_per_char, count = reopened.fit(VOICE)
+    assert count == MIN_OBSERVATIONS
+    assert offset == pytest.approx(200) and ms_per_char == pytest.approx(50)
+    assert reopened.predict_ms(VOICE, text(100), "+25%") == pytest.approx(5200 / 1.25)
+    # Another voice falls back to the pooled fit
+    assert reopened.predict_ms("en-US-JennyNeural", text(100)) == pytest.approx(5200)
+
+
+def test_segment_that_fits_keeps_its_start_and_the_preferred_rate():
+    planner = TimingPlanner(DurationModel(), rate="-10%")
+    plan, = planner.plan([item(1000, 3000, 10)])
+    assert plan == {"start_ms": 1000, "rate": "-10%", "predicted_ms": round(prior_ms(10, -10)),
+                    "drift_ms": round(1000 + prior_ms(10, -10) - 3000)}
+
+
+def test_long_segment_is_sped_up_just_enough():
+    planner = TimingPlanner(DurationModel(), rate="-10%", fastest="+25%")
+    plan, = planner.plan([item(0, 3000, 50)])
+    # 3400 ms at rate 0 needs +13.3%, rounded up to a whole percent
+    assert plan["rate"] == "+14%"
+    assert plan["predicted_ms"] <= 3000
+
+
+def test_overflow_borrows_the_pauses_around_it():
+    planner = TimingPlanner(DurationModel(), fastest="+25%", min_gap_ms=150, max_lead_ms=500)
+    first, second = planner.plan([item(1000, 4000, 100), item(6000, 8000, 10)])
+    # 6500 ms at the fastest rate is 5200 ms: it runs on until min_gap_ms before
+    # the next segment and starts only as early as the rest needs
+    assert first["rate"] == "+25%"
+    assert first["predicted_ms"] == 5200
+    assert first["start_ms"] == 6000 - 150 - 5200
+    assert first["drift_ms"] == 5850 - 4000
+    # The next segment still starts on time
+    assert second["start_ms"] == 6000
+
+
+def test_late_segment_pushes_the_next_one_which_catches_up():
+    planner = TimingPlanner(DurationModel(), rate="-10%", fastest="+25%", min_gap_ms=150, max_lead_ms=0)
+    plans = planner.plan([item(0, 3000, 100), item(3200, 6000, 30), item(9000, 11000, 10)])
+    pushed = plans[0]["start_ms"] + plans[0]["predicted_ms"] + 150
+    assert plans[1]["start_ms"] == pushed
+    # Its slot shrank, so it speeds up instead of keeping the preferred rate
+    assert parse_rate(plans[1]["rate"]) > -10
+    # The pause absorbed the drift
+    assert plans[2]["start_ms"] == 9000 and plans[2]["rate"] == "-10%"
+
+
+def test_drift_stats():
+    stats = DriftStats()
+    assert stats.summary() == {"segments": 0}
+    for end, actual in [(1000, 1100), (2000, 1900), (3000, 4500)]:
+        stats.record(end, actual)
+    summary = stats.summary()
+    assert summary["segments"] == 3
+    assert summary["median_abs_ms"] == 100
+    assert summary["max_late_ms"] == 1500 == summary["final_ms"]
+    assert summary["over_1s"] == 1
+
+
+def test_placing_one_segment_at_a_time_matches_the_whole_plan():
+    items = [item(0, 3000, 100), item(3200, 6000, 30), item(6100, 7000, 40), item(9000, 11000, 10)]
+    planner = TimingPlanner(DurationModel(), max_lead_ms=300)
+    whole = planner.plan(items)
+
+    streamed = TimingPlanner(DurationModel(), max_lead_ms=300)
+    placed = [streamed.place(current, following['start_ms']) for current, following in zip(items, items[1:])]
+    placed.append(streamed.place(items[-1]))
+    assert placed == whole
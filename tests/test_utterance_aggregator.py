@@ -0,0 +1,75 @@
+import asyncio
+
+from app.realtime_translator.pipeline import Utterance
+from app.realtime_translator.utterance_aggregator import AggregationPolicy, UtteranceAggregator, is_continuation
+
+
+def run(fragments, **policy):
+    """Feed (delay_s, speaker, text) fragments the way Azure delivers finals; returns the emitted texts"""
+    emitted = []
+
+    async def main():
+        aggregator = UtteranceAggregator(lambda utterance: emitted.append(utterance.text), AggregationPolicy(**policy))
+        for delay, speaker, text in fragments:
+            await asyncio.sleep(delay)
+            aggregator.add(Utterance(text, speaker, "male"))
+        await asyncio.sleep(0.15)
+        return aggregator.get_metrics()
+    return emitted, asyncio.run(main())
+
+
+def test_punctuated_fragments_of_one_sentence_are_merged():
+    # Azure closes every final result with a period, even mid-sentence
+    emitted, metrics = run([
+        (0, "Guest-1", "Мы запустили продукт."),
+        (0.01, "Guest-1", "И уже в первый месяц."),
+        (0.01, "Guest-1", "получили тысячу пользователей."),
+    ], pause_ms=50)
+    assert emitted == ["Мы запустили продукт. И уже в первый месяц. получили тысячу пользователей."]
+    assert metrics["requests_saved"] == 2
+
+
+def test_sentence_ending_before_a_new_sentence_flushes():
+    emitted, _ = run([
+        (0, "Guest-1", "We shipped the product."),
+        (0.01, "Guest-1", "Next question, please."),
+    ], pause_ms=50)
+    assert emitted == ["We shipped the product.", "Next question, please."]
+
+
+def test_unfinished_fragment_waits_for_the_next_one():
+    emitted, _ = run([
+        (0, "Guest-1", "Revenue in the third"),
+        (0.01, "Guest-1", "Quarter grew."),
+    ], pause_ms=50)
+    assert emitted == ["Revenue in the third Quarter grew."]
+
+
+def test_pause_max_wait_and_max_chars_flush():
+    # A pause longer than pause_ms ends the utterance even mid-sentence
+    emitted, _ = run([(0, "Guest-1", "and then"), (0.1, "Guest-1", "and more")], pause_ms=50)
+    assert emitted == ["and then", "and more"]
+
+    # Continuous speech is cut after max_wait_ms
+    emitted, _ = run([(0.02 * (i > 0), "Guest-1", f"part {i}") for i in range(6)], pause_ms=50, max_wait_ms=70)
+    assert len(emitted) == 2 and " ".join(emitted) == " ".join(f"part {i}" for i in range(6))
+
+    emitted, _ = run([(0, "Guest-1", "x" * 20), (0, "Guest-1", "y" * 20)], pause_ms=50, max_chars=30)
+    assert emitted == ["x" * 20 + " " + "y" * 20]
+
+
+def test_speakers_are_merged_separately():
+    emitted, _ = run([
+        (0, "Guest-1", "Мы обсуждаем."),
+        (0, "Guest-2", "Да."),
+        (0.01, "Guest-1", "бюджет на год."),
+    ], pause_ms=50)
+    assert sorted(emitted) == ["Да.", "Мы обсуждаем. бюджет на год."]
+
+
+def test_continuation():
+    assert is_continuation("и в Европе")
+    assert is_continuation("«которые» мы ждали")
+    assert is_continuation("But not yet.")
+    assert not is_continuation("Следующий вопрос.")
+    assert not is_continuation("")
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from app.realtime_translator.settings import parse_bool
+from app.realtime_translator.vad import (
+    SAMPLE_RATE, SessionVoiceGate, VADSettings, VoiceActivityGate, classify_windows
+)
+
+FRAME_MS = 100
+
+
+def silence(ms: int = FRAME_MS) -> bytes:
+    return np.zeros(SAMPLE_RATE * ms // 1000, dtype='<i2').tobytes()
+
+
+def tone(ms: int = FRAME_MS, hz: float = 220.0, level: float = 0.1) -> bytes:
+    t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * hz * t) * level * 32767).astype('<i2').tobytes()
+
+
+def noise(ms: int = FRAME_MS, level: float = 0.01) -> bytes:
+    rng = np.random.default_rng(0)
+    return (rng.uniform(-1, 1, SAMPLE_RATE * ms // 1000) * level * 32767).astype('<i2').tobytes()
+
+
+def test_classify_windows():
+    settings = VADSettings()
+    samples = np.frombuffer(silence() + tone(), dtype='<i2')
+    windows = classify_windows(samples, settings)
+    assert len(windows) == 2 * FRAME_MS // settings.window_ms
+    assert not windows[:5].any()
+    assert windows[5:].all()
+
+
+def test_quiet_noise_is_not_speech():
+    # Above the energy threshold, but with the zero-crossing rate of noise
+    settings = VADSettings()
+    assert not classify_windows(np.frombuffer(noise(level=0.05), dtype='<i2'), settings).any()
+
+
+def test_gate_releases_preroll_and_holds_hangover():
+    settings = VADSettings(preroll_ms=200, hangover_ms=300)
+    gate = VoiceActivityGate(settings)
+
+    for _ in range(5):
+        assert gate.process(silence()) == []
+    # On speech onset the last preroll_ms of silence comes first
+    out = gate.process(tone())
+    assert out == [silence(), silence(), tone()]
+
+    # Silence keeps flowing for hangover_ms, then stops
+    forwarded = [gate.process(silence()) for _ in range(5)]
+    assert [len(f) for f in forwarded] == [1, 1, 1, 0, 0]
+    assert not gate.in_speech
+
+    assert gate.total_ms == 1100
+    assert gate.forwarded_ms == 600
+    # Two silent frames wait in the preroll and are not counted as suppressed yet
+    assert gate.suppressed_ms == 300
+
+
+def test_session_gate_is_per_participant():
+    forwarded = []
+    session = SessionVoiceGate(lambda participant, frame: forwarded.append(participant),
+                               VADSettings(preroll_ms=0, hangover_ms=0))
+    session.write_audio("a", tone())
+    session.write_audio("b", silence())
+    assert forwarded == ["a"]
+    assert session.gates["a"].in_speech and not session.gates["b"].in_speech
+
+    metrics = session.get_metrics()
+    assert metrics["audio_s"] == 0.2
+    assert metrics["participants"]["b"]["suppressed_percent"] == 100.0
+
+    # A participant who left is forgotten but still counts in the meeting totals
+    session.remove("b")
+    assert set(session.gates) == {"a"}
+    metrics = session.get_metrics()
+    assert metrics["audio_s"] == 0.2 and metrics["suppressed_s"] == 0.1
+
+
+def test_disabled_session_gate_forwards_everything():
+    forwarded = []
+    session = SessionVoiceGate(lambda participant, frame: forwarded.append(frame), enabled=False)
+    session.write_audio("a", silence())
+    assert forwarded == [silence()]
+
+
+def test_settings_update():
+    settings = VADSettings()
+    settings.update(energy_threshold_db="-50", use_spectral_flatness="true", hangover_ms=500.0)
+    assert settings.energy_threshold_db == -50.0
+    assert settings.use_spectral_flatness is True
+    assert settings.hangover_ms == 500 and isinstance(settings.hangover_ms, int)
+    with pytest.raises(ValueError):
+        settings.update(threshold=1)
+
+
+def test_invalid_update_changes_nothing():
+    settings = VADSettings()
+    before = settings.to_dict()
+    for values in ({"energy_threshold_db": -60, "hangover_ms": "long"},
+                   {"preroll_ms": 100, "use_spectral_flatness": "maybe"},
+                   {"window_ms": 30, "threshold": 1}):
+        with pytest.raises(ValueError):
+            settings.update(**values)
+        assert settings.to_dict() == before
+
+
+def test_flags_are_parsed_strictly():
+    assert parse_bool("false") is False and parse_bool("False") is False and parse_bool("0") is False
+    assert parse_bool("true") is True and parse_bool(1) is True and parse_bool(True) is True
+    for value in ("", "disabled", 2, None, [], {}):
+        with pytest.raises(ValueError):
+            parse_bool(value)